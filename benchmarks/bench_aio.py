@@ -0,0 +1,89 @@
+'''Benchmark how long the event loop stalls while a fleet is written.
+
+"blocking" calls ``writeAll()`` from a coroutine, "aio" awaits ``launchdman.aio.writeAll()``.
+A ticker coroutine sleeps 1 ms at a time next to them and records the longest gap between its ticks.
+Files go to /dev/shm when there is one, so the numbers are about launchdman and not the disk.
+
+Run from the repository root::
+
+    python benchmarks/bench_aio.py
+'''
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import launchdman  # noqa: E402
+from launchdman import Job, writeAll  # noqa: E402
+
+
+def makeJobs(directory, count):
+    return [
+        Job.fromDict(
+            os.path.join(directory, 'com.bench.{}.plist'.format(i)), {
+                'Label': 'com.bench.{}'.format(i),
+                'Program': '/usr/bin/true',
+                'StartCalendarInterval': [{
+                    'Hour': h,
+                    'Minute': i % 60
+                } for h in range(24)]
+            }) for i in range(count)
+    ]
+
+
+async def ticker(stop):
+    worst = 0.0
+    ticks = 0
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = time.perf_counter()
+        worst = max(worst, now - last)
+        last = now
+        ticks += 1
+    return ticks, worst
+
+
+async def measure(write):
+    stop = asyncio.Event()
+    tick = asyncio.ensure_future(ticker(stop))
+    # let the ticker start before the batch
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    await write()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    ticks, worst = await tick
+    return elapsed, ticks, worst
+
+
+async def blocking(jobs):
+    writeAll(jobs, workers=8, sync=False)
+
+
+def main():
+    shm = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+    print('{:>6} {:>10} {:>10} {:>8} {:>14}'.format('jobs', 'mode', 'total s',
+                                                  'ticks', 'worst stall ms'))
+    for count in (500, 2000):
+        directory = tempfile.mkdtemp(prefix='launchdman-bench-', dir=shm)
+        try:
+            jobs = makeJobs(directory, count)
+            for mode, write in (('blocking', lambda: blocking(jobs)),
+                                ('aio', lambda: launchdman.aio.writeAll(
+                                    jobs, concurrency=8, sync=False))):
+                for path in os.listdir(directory):
+                    os.remove(os.path.join(directory, path))
+                elapsed, ticks, worst = asyncio.run(measure(write))
+                print('{:>6} {:>10} {:>10.3f} {:>8} {:>14.1f}'.format(
+                    count, mode, elapsed, ticks, worst * 1e3))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
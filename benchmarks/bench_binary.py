@@ -0,0 +1,73 @@
+'''Benchmark Job.toBinary() against the XML path.
+
+Compares size and encode time of the XML plist (``printMe()``, cold render
+cache) and the binary plist (``toBinary()``), for a small job and jobs with
+thousands of StartCalendarInterval entries. ``plistlib.dumps()`` of the same
+values is there for reference, and every binary plist is checked by reading
+it back with ``plistlib``.
+
+Run from the repository root::
+
+    python benchmarks/bench_binary.py
+'''
+import io
+import os
+import plistlib
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (Job, Label, Program, ProgramArguments,  # noqa: E402
+                        RunAtLoad, StartCalendarInterval, loadPlist)
+
+
+def makeJob(entries):
+    job = Job('/tmp/bench.plist')
+    job.add(
+        Label('com.bench.binary'), Program('/usr/bin/true'),
+        ProgramArguments(['--verbose', '--config', '/etc/bench.conf']),
+        RunAtLoad())
+    if entries:
+        schedule = StartCalendarInterval()
+        schedule.add([{
+            'Hour': (i // 60) % 24,
+            'Minute': i % 60,
+            'Day': i % 28 + 1
+        } for i in range(entries)])
+        job.add(schedule)
+    return job
+
+
+def best(func, job, repeat=5):
+    times = []
+    for _ in range(repeat):
+        job.invalidate(deep=True)
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    print('{:>8} {:>10} {:>10} {:>10} {:>10} {:>10} {:>10}'.format(
+        'entries', 'xml B', 'binary B', 'xml ms', 'binary ms', 'plistlib',
+        'ratio'))
+    for entries in (0, 1000, 4000, 16000):
+        job = makeJob(entries)
+        xml = job.parse().encode('utf-8')
+        binary = job.toBinary()
+        values = loadPlist(io.BytesIO(xml))
+        assert plistlib.loads(binary) == values, 'binary plist differs'
+        xmlTime = best(job.parse, job)
+        binaryTime = best(job.toBinary, job)
+        plistlibTime = best(
+            lambda: plistlib.dumps(values, fmt=plistlib.FMT_BINARY), job)
+        print('{:>8} {:>10} {:>10} {:>10.2f} {:>10.2f} {:>10.2f} {:>10.1f}'.
+              format(entries, len(xml), len(binary), xmlTime * 1e3,
+                     binaryTime * 1e3, plistlibTime * 1e3,
+                     len(xml) / len(binary)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+'''Benchmark re-rendering a job after changing one key.
+
+The first render fills the render cache, later renders after
+``Label.changeTo`` should only rebuild the label. Prints the render cache
+hit and miss counters for each step.
+
+Run from the repository root::
+
+    python benchmarks/bench_cache.py
+'''
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (Job, Label, Program, StartCalendarInterval,  # noqa: E402
+                        clearRenderCacheInfo, renderCacheInfo)
+
+
+def timed(func):
+    clearRenderCacheInfo()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start, renderCacheInfo()
+
+
+def main():
+    job = Job('/tmp/bench.plist')
+    label = Label('bench')
+    schedule = StartCalendarInterval()
+    schedule.add([{'Hour': i % 24, 'Minute': i % 60} for i in range(5000)])
+    job.add(label, Program('/usr/bin/true'), schedule)
+
+    def render():
+        job.writeTo(io.StringIO())
+
+    print('cold render:        {:.4f}s {}'.format(*timed(render)))
+    print('unchanged render:   {:.4f}s {}'.format(*timed(render)))
+    label.changeTo('bench-2')
+    print('after changeTo:     {:.4f}s {}'.format(*timed(render)))
+    schedule.add({'Day': 1})
+    print('after calendar add: {:.4f}s {}'.format(*timed(render)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+'''Benchmark crossCombine() on products of about 100k combinations.
+
+"before" is the old recursive crossCombine, which rebuilds the product of the
+tail for every element of the first list. "after" is the lazy
+``iterCrossCombine()`` and the list-returning ``crossCombine()`` on top of it.
+Peak memory is measured with tracemalloc. The last rows time
+``StartCalendarInterval.add()`` with a list and with a generator.
+
+Run from the repository root::
+
+    python benchmarks/bench_combine.py
+'''
+import contextlib
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (StartCalendarInterval, combinteDict,  # noqa: E402
+                        crossCombine, iterCrossCombine)
+
+
+def legacyCrossCombine(l):
+    '''The recursive crossCombine, kept here for comparison.'''
+    resultList = []
+    firstList = l[0]
+    rest = l[1:]
+    if len(rest) == 0:
+        return firstList
+    for e in firstList:
+        for e1 in legacyCrossCombine(rest):
+            resultList.append(combinteDict(e, e1))
+    return resultList
+
+
+def consume(iterable):
+    count = 0
+    for _ in iterable:
+        count += 1
+    return count
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def grandList(**fields):
+    return [[{k: v} for v in values] for k, values in fields.items()]
+
+
+def main():
+    cases = [
+        ('month*day*hour*minute/6',
+         grandList(Month=range(1, 13), Day=range(1, 29), Hour=range(0, 24),
+                   Minute=range(0, 60, 6))),
+        ('day*hour*minute',
+         grandList(Day=range(1, 29), Hour=range(0, 24), Minute=range(0, 60))),
+    ]
+    print('{:<26} {:>8} {:>10} {:>10} {:>10}'.format(
+        'case', 'combos', 'impl', 's', 'peak MB'))
+    for name, l in cases:
+        for impl, func in (
+                ('before', lambda: len(legacyCrossCombine(l))),
+                ('list', lambda: len(crossCombine(l))),
+                ('lazy', lambda: consume(iterCrossCombine(l))),
+        ):
+            count, elapsed, peak = measure(func)
+            print('{:<26} {:>8} {:>10} {:>10.3f} {:>10.2f}'.format(
+                name, count, impl, elapsed, peak / 1e6))
+
+    for impl, lazy in (('add list', False), ('add lazy', True)):
+
+        def run():
+            schedule = StartCalendarInterval()
+            # genInterval() prints what it builds, keep it quiet
+            with contextlib.redirect_stdout(io.StringIO()):
+                entries = schedule.genInterval(
+                    day=(1, 29), hour=(0, 24), minute=(0, 60), lazy=lazy)
+            schedule.add(entries)
+            return len(schedule.l)
+
+        count, elapsed, peak = measure(run)
+        print('{:<26} {:>8} {:>10} {:>10.3f} {:>10.2f}'.format(
+            'genInterval day*hour*min', count, impl, elapsed, peak / 1e6))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+'''Benchmark Job.diff() against comparing the rendered plists.
+
+Builds two jobs with 5k StartCalendarInterval entries that differ in one key,
+then times a diff with cold fingerprints, a diff with cached fingerprints and
+a comparison of the two rendered strings (with a cold render cache, as after
+building the jobs).
+
+Run from the repository root::
+
+    python benchmarks/bench_diff.py
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import Job, Label, Program, StartCalendarInterval  # noqa: E402
+
+
+def makeJob(entries, program):
+    job = Job('/tmp/bench.plist')
+    schedule = StartCalendarInterval()
+    schedule.add([{
+        'Hour': (i // 60) % 24,
+        'Minute': i % 60,
+        'Day': i % 28 + 1
+    } for i in range(entries)])
+    job.add(Label('bench'), Program(program), schedule)
+    return job
+
+
+def best(func, setup=None, repeat=5):
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(entries=5000):
+    old = makeJob(entries, '/usr/bin/true')
+    new = makeJob(entries, '/usr/bin/false')
+
+    def cold():
+        old.invalidate(deep=True)
+        new.invalidate(deep=True)
+
+    assert old.diff(new).keys() == {'Program'}
+    print('entries: {}'.format(entries))
+    print('diff, cold fingerprints: {:10.1f} us'.format(
+        best(lambda: old.diff(new), cold) * 1e6))
+    print('diff, warm fingerprints: {:10.1f} us'.format(
+        best(lambda: old.diff(new)) * 1e6))
+    print('rendered strings:        {:10.1f} us'.format(
+        best(lambda: old.parse() == new.parse(), cold) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
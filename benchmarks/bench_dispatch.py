@@ -0,0 +1,105 @@
+'''Micro-benchmark the per-node render cost of the cached dispatch.
+
+"before" is the old renderer: ``singleOrPair()`` rebuilding the MRO list
+through ``ancestor()``/``ancestorJr()`` for every element, and ``indent()``
+re-indenting every subtree. "after" is ``printMe()`` and ``writeTo()`` on
+top of ``dispatch()``. The tree has about 10k nodes.
+
+Run from the repository root::
+
+    python benchmarks/bench_dispatch.py
+'''
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (Job, Label, Pair, Program, ProgramArguments,  # noqa: E402
+                        Single, StartCalendarInterval, WatchPaths, indent)
+
+
+def legacySingleOrPair(obj):
+    if len(list(obj.__class__.__mro__)) <= 2:
+        return 'Neither'
+    if list(obj.__class__.__mro__)[-3] is Pair:
+        return 'Pair'
+    elif list(obj.__class__.__mro__)[-2] is Single:
+        return 'Single'
+    return 'Neither'
+
+
+def legacyRender(node, tag, value, job=False):
+    '''The render path before dispatch(), kept here for comparison.'''
+    if len(value) == 0:
+        return ''
+    if isinstance(node, Pair):
+        text = '<key>{}</key>\n'.format(tag)
+        for element in value:
+            kind = legacySingleOrPair(element)
+            if kind == 'Single':
+                text += legacyRender(element, element.tag, element.value)
+            elif legacySingleOrPair(element) == 'Pair':
+                text += legacyRender(element, element.key, element.value)
+        return text
+    if not job and len(value) == 1 and list(
+            value[0].__class__.__mro__)[-2] is not Single:
+        return '<{tag}>{value}</{tag}>\n'.format(tag=tag, value=value[0])
+    valueText = ''
+    for element in value:
+        if legacySingleOrPair(element) == 'Single':
+            valueText += legacyRender(element, element.tag, element.value)
+        elif legacySingleOrPair(element) == 'Pair':
+            valueText += legacyRender(element, element.key, element.value)
+        else:
+            valueText += str(element) + '\n'
+    return '<{tag}>\n'.format(tag=tag) + indent(
+        valueText, 4) + '</{tag}>\n'.format(tag=tag)
+
+
+def countNodes(node):
+    return 1 + sum(
+        countNodes(element) for element in node.value
+        if isinstance(element, Single))
+
+
+def makeJob():
+    job = Job('/tmp/bench.plist')
+    schedule = StartCalendarInterval()
+    schedule.add([{'Hour': i % 24, 'Minute': i % 60} for i in range(2000)])
+    job.add(
+        Label('bench'), Program('/usr/bin/true'),
+        ProgramArguments(['-v'] * 200), WatchPaths(
+            ['/tmp/{}'.format(i) for i in range(200)]), schedule)
+    return job
+
+
+def best(func, job, repeat=5):
+    times = []
+    for _ in range(repeat):
+        # measure cold renders, not the render cache
+        job.invalidate(deep=True)
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    job = makeJob()
+    nodes = countNodes(job)
+    before = best(lambda: legacyRender(job, job.tag, job.value, job=True), job)
+    after = best(lambda: job.printMe(job.tag, job.value), job)
+    stream = best(lambda: job.writeTo(io.StringIO()), job)
+    print('nodes: {}'.format(nodes))
+    print('before  (singleOrPair + indent): {:8.3f} us/node'.format(
+        before / nodes * 1e6))
+    print('after   (dispatch, printMe):     {:8.3f} us/node'.format(
+        after / nodes * 1e6))
+    print('after   (dispatch, writeTo):     {:8.3f} us/node'.format(
+        stream / nodes * 1e6))
+
+
+if __name__ == '__main__':
+    main()
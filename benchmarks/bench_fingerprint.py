@@ -0,0 +1,56 @@
+'''Benchmark comparing and deduping config objects by fingerprint.
+
+Dedupes a few thousand StartCalendarInterval configs with a set (first
+pass computes fingerprints, second pass reuses them) and compares with the
+old set-of-leaves equality, which had to walk both trees every time.
+
+Run from the repository root::
+
+    python benchmarks/bench_fingerprint.py
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import StartCalendarInterval  # noqa: E402
+
+
+def legacyEqual(a, b):
+    return set(a.findAll(a.value)) == set(b.findAll(b.value))
+
+
+def makeConfigs(count, entries):
+    configs = []
+    for i in range(count):
+        schedule = StartCalendarInterval()
+        # only 100 distinct schedules
+        schedule.add([{'Hour': (i % 100 + h) % 24, 'Minute': h}
+                      for h in range(entries)])
+        configs.append(schedule)
+    return configs
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    configs = makeConfigs(3000, 20)
+    first, unique = timed(lambda: set(configs))
+    second, _ = timed(lambda: set(configs))
+    print('configs: {}, unique: {}'.format(len(configs), len(unique)))
+    print('dedupe, computing fingerprints: {:.4f}s'.format(first))
+    print('dedupe, cached fingerprints:    {:.4f}s'.format(second))
+    pairs = list(zip(configs, configs[1:]))
+    eqTime, _ = timed(lambda: [a == b for a, b in pairs])
+    legacyTime, _ = timed(lambda: [legacyEqual(a, b) for a, b in pairs])
+    print('{} comparisons, fingerprint: {:.4f}s, set of leaves: {:.4f}s'.format(
+        len(pairs), eqTime, legacyTime))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+'''Benchmark analyzeFleet() on 10k jobs over a year.
+
+Jobs run daily, weekly or monthly at random times, every few minutes or every
+few hours, which is what a fleet of agents mostly looks like. The job list
+is built before timing. Building it is not part of the analysis.
+
+Run from the repository root::
+
+    python benchmarks/bench_fleet.py
+'''
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (Job, Label, StartCalendarInterval,  # noqa: E402
+                        StartInterval, analyzeFleet)
+
+
+def makeJobs(count, seed=0):
+    rand = random.Random(seed)
+    jobs = []
+    for i in range(count):
+        job = Job('/tmp/bench/{}.plist'.format(i))
+        job.add(Label('com.bench.{}'.format(i)))
+        kind = rand.random()
+        if kind < 0.8:
+            entry = {'Hour': rand.randrange(24), 'Minute': rand.randrange(60)}
+            if kind < 0.2:
+                entry['Weekday'] = rand.randrange(7)
+            elif kind < 0.3:
+                entry['Day'] = rand.randrange(1, 29)
+            job.add(StartCalendarInterval(entry))
+        else:
+            job.add(StartInterval().every(rand.choice((300, 900, 3600,
+                                                       14400))).second)
+        jobs.append(job)
+    return jobs
+
+
+def main():
+    jobs = makeJobs(10000)
+    for horizon in ('day', 'week', 'year'):
+        start = time.perf_counter()
+        load = analyzeFleet(jobs, datetime.date(2024, 1, 1), horizon)
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        worst = load.worst(5)
+        labels = load.labelsAt(worst[0][0])
+        lookup = time.perf_counter() - start
+        print('{:>5}: {:8.1f} ms, {} slots, peak {} at {} ({} labels), '
+              'worst(5) + labelsAt {:.1f} ms'.format(
+                  horizon, elapsed * 1e3, len(load.counts), load.peak(),
+                  worst[0][0], len(labels), lookup * 1e3))
+
+
+if __name__ == '__main__':
+    main()
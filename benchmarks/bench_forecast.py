@@ -0,0 +1,85 @@
+'''Benchmark nextFireTimes() on StartCalendarInterval schedules with thousands of entries.
+
+"scan" walks minute by minute and checks every entry, which is what you
+would write without the compiled tables. "compile" is building the
+``CalendarSchedule`` and "table" is ``CalendarSchedule.nextFireTimes()`` on it.
+
+Run from the repository root::
+
+    python benchmarks/bench_forecast.py
+'''
+import datetime
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import StartCalendarInterval  # noqa: E402
+
+
+def makeSchedule(entries, seed=0):
+    rand = random.Random(seed)
+    schedule = StartCalendarInterval()
+    schedule.add([{
+        'Weekday': rand.randrange(7),
+        'Hour': rand.randrange(24),
+        'Minute': rand.randrange(60)
+    } if rand.random() < 0.5 else {
+        'Month': rand.randrange(1, 13),
+        'Day': rand.randrange(1, 29),
+        'Hour': rand.randrange(24)
+    } for _ in range(entries)])
+    return schedule
+
+
+def matches(entry, moment):
+    weekday = (moment.weekday() + 1) % 7
+    for key, value in (('Month', moment.month), ('Day', moment.day),
+                       ('Weekday', weekday), ('Hour', moment.hour),
+                       ('Minute', moment.minute)):
+        if key in entry and entry[key] != value:
+            return False
+    return True
+
+
+def scan(entries, after, n):
+    '''The minute by minute scan, ignores DST and the Day/Weekday rule.'''
+    result = []
+    moment = after.replace(second=0, microsecond=0)
+    while len(result) < n:
+        moment += datetime.timedelta(minutes=1)
+        if any(matches(entry, moment) for entry in entries):
+            result.append(moment)
+    return result
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    after = datetime.datetime(2024, 1, 1, 0, 0)
+    print('{:>8} {:>6} {:>12} {:>12} {:>12}'.format('entries', 'n',
+                                                     'scan ms', 'compile ms',
+                                                     'table ms'))
+    for entries, n in ((1000, 50), (4000, 50), (4000, 5000)):
+        schedule = makeSchedule(entries)
+        plain = schedule.entries()
+        table, compileTime = timed(schedule.compile)
+        fires, tableTime = timed(lambda: table.nextFireTimes(after, n))
+        if n <= 50:
+            expected, scanTime = timed(lambda: scan(plain, after, n))
+            assert fires == expected, 'forecast differs from the scan'
+            scanText = '{:12.1f}'.format(scanTime * 1e3)
+        else:
+            scanText = '{:>12}'.format('-')
+        print('{:>8} {:>6} {} {:12.1f} {:12.1f}'.format(
+            entries, n, scanText, compileTime * 1e3, tableTime * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+'''Benchmark Job.fromDict() against building jobs with job.add(...).
+
+Every job has the same ten keys, with a different Label and schedule, as
+job definitions loaded from JSON usually look. Prints jobs per second for
+hand-written ``add()`` calls, for ``configFromValue()`` key by key (the
+path ``Job.read()`` took before) and for ``Job.fromDict()``, and checks that
+all three build the same jobs.
+
+Run from the repository root::
+
+    python benchmarks/bench_fromdict.py
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (Job, KeepAlive, Label, Nice,  # noqa: E402
+                        ProgramArguments, RunAtLoad, StandardErrorPath,
+                        StandardOutPath, StartCalendarInterval, UserName,
+                        WorkingDirectory, configFromValue)
+
+
+def definition(i):
+    return {
+        'Label': 'com.bench.{}'.format(i),
+        'ProgramArguments': ['/usr/local/bin/agent', '--shard', str(i % 16)],
+        'StandardOutPath': '/var/log/agent.log',
+        'StandardErrorPath': '/var/log/agent.err',
+        'WorkingDirectory': '/',
+        'UserName': '_agent',
+        'RunAtLoad': True,
+        'KeepAlive': True,
+        'Nice': 10,
+        'StartCalendarInterval': [{'Hour': 3, 'Minute': i % 60},
+                                  {'Hour': 15, 'Minute': i % 60}],
+    }
+
+
+def byHand(i):
+    job = Job('/tmp/bench/{}.plist'.format(i))
+    job.add(
+        Label('com.bench.{}'.format(i)),
+        ProgramArguments(['/usr/local/bin/agent', '--shard', str(i % 16)]),
+        StandardOutPath('/var/log/agent.log'),
+        StandardErrorPath('/var/log/agent.err'), WorkingDirectory('/'),
+        UserName('_agent'), RunAtLoad(), KeepAlive('always'), Nice(10),
+        StartCalendarInterval({'Hour': 3, 'Minute': i % 60},
+                              {'Hour': 15, 'Minute': i % 60}))
+    return job
+
+
+def byKey(i, mapping):
+    job = Job('/tmp/bench/{}.plist'.format(i))
+    job.add([configFromValue(k, v) for k, v in mapping.items()])
+    return job
+
+
+def rate(build, count, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        build(count)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best
+
+
+def main(count=20000):
+    mappings = [definition(i) for i in range(count)]
+    for i in (0, 1, count - 1):
+        fast = Job.fromDict('/tmp/bench/{}.plist'.format(i), mappings[i])
+        assert fast == byHand(i) == byKey(i, mappings[i])
+
+    handRate = rate(lambda n: [byHand(i) for i in range(n)], count)
+    keyRate = rate(
+        lambda n: [byKey(i, mappings[i]) for i in range(n)], count)
+    dictRate = rate(
+        lambda n: [
+            Job.fromDict('/tmp/bench/{}.plist'.format(i), mappings[i])
+            for i in range(n)
+        ], count)
+    print('job.add(...):         {:10.0f} jobs/s'.format(handRate))
+    print('configFromValue():    {:10.0f} jobs/s'.format(keyRate))
+    print('Job.fromDict():       {:10.0f} jobs/s'.format(dictRate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+'''Measure the cost of the instrumentation hooks.
+
+Times building, rendering(cold) and removing on 2000 jobs three ways: with
+no sink registered, with a sink that does nothing, and with EventStats.
+Without a sink the hooks are one comparison each, so the first column is
+the cost of the library itself.
+
+Run from the repository root::
+
+    python benchmarks/bench_instrument.py
+'''
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import EventStats, Job, addSink, removeSink  # noqa: E402
+
+
+def definition(i):
+    return {
+        'Label': 'com.bench.{}'.format(i),
+        'ProgramArguments': ['/usr/local/bin/agent', '--shard', str(i % 16)],
+        'StandardOutPath': '/var/log/agent.log',
+        'RunAtLoad': True,
+        'Nice': 10,
+        'StartCalendarInterval': [{'Hour': h, 'Minute': i % 60}
+                                  for h in range(24)],
+    }
+
+
+def best(func, setup, repeat=5):
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+        gc.enable()
+    return min(times)
+
+
+def measure(count):
+    mappings = [definition(i) for i in range(count)]
+
+    def build(arg=None):
+        return [Job.fromDict('/tmp/{}.plist'.format(i), m)
+                for i, m in enumerate(mappings)]
+
+    def cold():
+        jobs = build()
+        for job in jobs:
+            job.invalidate(deep=True)
+        return jobs
+
+    def remove(jobs):
+        for job in jobs:
+            job.value[-1].remove({'Hour': 3, 'Minute': 0})
+
+    return (best(build, lambda: None),
+            best(lambda jobs: [job.parse() for job in jobs], cold),
+            best(remove, build))
+
+
+def main(count=2000):
+    rows = [('no sink', measure(count))]
+    sink = addSink(lambda event, fields: None)
+    rows.append(('no-op sink', measure(count)))
+    removeSink(sink)
+    stats = addSink(EventStats())
+    rows.append(('EventStats', measure(count)))
+    removeSink(stats)
+    print('{:<12} {:>12} {:>12} {:>12}'.format('', 'build us/job',
+                                               'render us/job',
+                                               'remove us/job'))
+    for name, times in rows:
+        print('{:<12} {:>12.2f} {:>12.2f} {:>12.2f}'.format(
+            name, *(t / count * 1e6 for t in times)))
+
+
+if __name__ == '__main__':
+    main()
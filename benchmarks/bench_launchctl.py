@@ -0,0 +1,95 @@
+'''Benchmark deploying a fleet with one launchctl per job against LaunchctlRunner.
+
+launchctl is benchmarks/fake-launchctl, which records its calls, keeps which services are loaded
+and sleeps a little like launchd answering, so this runs on machines without launchd.
+Half of the jobs are loaded before every deploy, so bootout fails for the other half like it does on a real update.
+"per job" is what a deploy script does without the runner: bootout, bootstrap and kickstart for every job, one after another.
+
+Run from the repository root::
+
+    python benchmarks/bench_launchctl.py
+'''
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import Job  # noqa: E402
+from launchdman.launchctl import LaunchctlRunner, SubprocessBackend  # noqa: E402
+
+fake = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                    'fake-launchctl')
+
+
+def makeJobs(directory, count):
+    jobs = [
+        Job.fromDict(
+            os.path.join(directory, 'com.bench.{}.plist'.format(i)), {
+                'Label': 'com.bench.{}'.format(i),
+                'Program': '/usr/bin/true'
+            }) for i in range(count)
+    ]
+    for job in jobs:
+        job.write()
+    return jobs
+
+
+def loadHalf(jobs, state):
+    with open(state, 'w') as f:
+        json.dump(['gui/501/' + job.toDict()['Label'] for job in jobs[::2]],
+                  f)
+
+
+def perJob(jobs, backend):
+    for job in jobs:
+        label = job.toDict()['Label']
+        backend(['bootout', 'gui/501/' + label])
+        backend(['bootstrap', 'gui/501', str(job.me)])
+        backend(['kickstart', 'gui/501/' + label])
+
+
+def batched(jobs, backend):
+    runner = LaunchctlRunner(backend, domain='gui/501', workers=8)
+    runner.bootout(jobs).bootstrap(jobs).kickstart(jobs)
+    report = runner.run()
+    assert not report.failed, report.failed
+    assert report.counts()['succeeded'] == 3 * len(jobs)
+
+
+def calls(log):
+    with open(log) as f:
+        return [json.loads(line) for line in f]
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix='launchdman-bench-')
+    log = os.path.join(directory, 'calls.jsonl')
+    state = os.path.join(directory, 'loaded.json')
+    os.environ['FAKE_LAUNCHCTL_LOG'] = log
+    os.environ['FAKE_LAUNCHCTL_STATE'] = state
+    os.environ['FAKE_LAUNCHCTL_DELAY'] = '0.005'
+    backend = SubprocessBackend(fake)
+    print('{:>6} {:>10} {:>12} {:>10}'.format('jobs', 'mode', 'invocations',
+                                             'total s'))
+    try:
+        for count in (20, 100):
+            jobs = makeJobs(directory, count)
+            for mode, run in (('per job', perJob), ('batched', batched)):
+                if os.path.exists(log):
+                    os.remove(log)
+                loadHalf(jobs, state)
+                start = time.perf_counter()
+                run(jobs, backend)
+                elapsed = time.perf_counter() - start
+                print('{:>6} {:>10} {:>12} {:>10.3f}'.format(
+                    count, mode, len(calls(log)), elapsed))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+'''Benchmark a deploy run of an unchanged fleet with and without a RenderManifest.
+
+Every run builds its jobs again with Job.fromDict(), like a new deploy process does, then calls writeAll().
+Without a manifest every job is rendered and its file read to see that nothing changed;
+with one, unchanged jobs only cost their fingerprint and a stat. Files go to /dev/shm when there is one.
+
+Run from the repository root::
+
+    python benchmarks/bench_manifest.py
+'''
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import Job, RenderManifest, writeAll  # noqa: E402
+
+
+def makeJobs(directory, count):
+    return [
+        Job.fromDict(
+            os.path.join(directory, 'com.bench.{}.plist'.format(i)), {
+                'Label': 'com.bench.{}'.format(i),
+                'ProgramArguments': ['/usr/bin/true', '--id', str(i)],
+                'StartCalendarInterval': [{
+                    'Hour': h,
+                    'Minute': i % 60
+                } for h in range(24)],
+                'EnvironmentVariables': {'PATH': '/usr/bin:/bin'}
+            }) for i in range(count)
+    ]
+
+
+def deploy(directory, count, manifest):
+    jobs = makeJobs(directory, count)
+    # only writeAll() counts, building the jobs costs the same either way
+    start = time.perf_counter()
+    report = writeAll(jobs, workers=4, sync=False, manifest=manifest)
+    return time.perf_counter() - start, report
+
+
+def main():
+    shm = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+    print('{:>7} {:>14} {:>14} {:>10}'.format('jobs', 'no manifest s',
+                                            'manifest s', 'hit rate'))
+    for count in (1000, 5000):
+        directory = tempfile.mkdtemp(prefix='launchdman-bench-', dir=shm)
+        database = directory + '.sqlite'
+        try:
+            deploy(directory, count, None)
+            plain, report = deploy(directory, count, None)
+            assert len(report.skipped) == count
+            with RenderManifest(database) as manifest:
+                deploy(directory, count, manifest)
+            with RenderManifest(database) as manifest:
+                cached, report = deploy(directory, count, manifest)
+                assert len(report.skipped) == count
+                hitRate = manifest.stats()['hitRate']
+            print('{:>7} {:>14.3f} {:>14.3f} {:>10.2f}'.format(
+                count, plain, cached, hitRate))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(database + suffix):
+                    os.remove(database + suffix)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+'''Measure the memory of jobs with tracemalloc.
+
+Builds a typical 15-key job, many times over, and a job with a
+10k-entry StartCalendarInterval, and prints the bytes traced per job,
+next to what ``Single.sizeof()`` reports for the same job.
+
+Run from the repository root::
+
+    python benchmarks/bench_memory.py
+'''
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (AbandonProcessGroup, EnvironmentVariables,  # noqa: E402
+                        ExitTimeOut, Job, KeepAlive, Label, Nice, Program,
+                        ProgramArguments, RunAtLoad, StandardErrorPath,
+                        StandardOutPath, StartCalendarInterval, StartInterval,
+                        ThrottleInverval, UserName, WatchPaths,
+                        WorkingDirectory)
+
+
+def typicalJob(i):
+    job = Job('/tmp/bench/{}.plist'.format(i))
+    job.add(
+        Label('com.bench.{}'.format(i)), Program('/usr/local/bin/agent'),
+        ProgramArguments(['--id', str(i), '--verbose']),
+        EnvironmentVariables({'PATH': '/usr/bin:/bin', 'LANG': 'C'}),
+        StandardOutPath('/tmp/agent.out'), StandardErrorPath('/tmp/agent.err'),
+        WorkingDirectory('/tmp'), RunAtLoad(), StartInterval().every(5).minute,
+        WatchPaths('/etc/agent.conf'), KeepAlive('always'), UserName('nobody'),
+        Nice(5), ExitTimeOut(30), ThrottleInverval(10))
+    job.add(AbandonProcessGroup())
+    return job
+
+
+def bigJob(entries):
+    job = Job('/tmp/bench/big.plist')
+    schedule = StartCalendarInterval()
+    schedule.add([{
+        'Day': i % 28 + 1,
+        'Hour': (i // 60) % 24,
+        'Minute': i % 60
+    } for i in range(entries)])
+    job.add(Label('com.bench.big'), schedule)
+    return job
+
+
+def traced(build, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return built, (after - before) / count
+
+
+def main():
+    jobs, perJob = traced(typicalJob, 2000)
+    print('15-key job:        {:10.0f} B/job traced, {:10} B sizeof()'.format(
+        perJob, jobs[0].sizeof()))
+    jobs[0].parse()
+    print('  after rendering: {:>10} B sizeof(), {:} B without caches'.format(
+        jobs[0].sizeof(), jobs[0].sizeof(caches=False)))
+    jobs, perJob = traced(lambda i: bigJob(10000), 1)
+    print('10k-entry job:     {:10.0f} B/job traced, {:10} B sizeof()'.format(
+        perJob, jobs[0].sizeof()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+'''Benchmark Job.read throughput over a directory of generated plists.
+
+Writes 10k plists with writeAll(), then reads them all back with
+Job.read and, for reference, with plistlib.load.
+
+Run from the repository root::
+
+    python benchmarks/bench_read.py [count]
+'''
+import os
+import plistlib
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (Job, KeepAliveDepends, Label, ProgramArguments,  # noqa: E402
+                        RunAtLoad, StandardOutPath, StartCalendarInterval,
+                        SuccessfulExit, writeAll)
+
+
+def makeJob(directory, i):
+    job = Job(os.path.join(directory, 'com.bench.{}.plist'.format(i)))
+    schedule = StartCalendarInterval()
+    schedule.add([{'Hour': h, 'Minute': i % 60} for h in range(0, 24, 6)])
+    keepAlive = KeepAliveDepends()
+    keepAlive.addKey(SuccessfulExit)
+    job.add(
+        Label('com.bench.{}'.format(i)),
+        ProgramArguments('/usr/bin/env', 'bench', str(i)), RunAtLoad(),
+        StandardOutPath('/tmp/bench.{}.log'.format(i)), schedule, keepAlive)
+    return job
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    directory = tempfile.mkdtemp()
+    try:
+        writeAll(
+            (makeJob(directory, i) for i in range(count)), sync=False)
+        paths = [os.path.join(directory, name) for name in os.listdir(directory)]
+
+        start = time.perf_counter()
+        jobs = [Job.read(path) for path in paths]
+        readTime = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for path in paths:
+            with open(path, 'rb') as f:
+                plistlib.load(f)
+        plistlibTime = time.perf_counter() - start
+
+        assert jobs[0].parse() == open(paths[0]).read()
+        print('files: {}'.format(len(paths)))
+        print('Job.read:       {:10.0f} files/s'.format(len(paths) / readTime))
+        print('plistlib.load:  {:10.0f} files/s (values only, no Job)'.format(
+            len(paths) / plistlibTime))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+'''Benchmark reading a directory of binary plists.
+
+Writes a few thousand binary job plists to a temporary directory, then reads
+them all with ``plistlib.load()``, with ``loadPlist()``, and into Jobs with
+``Job.read()``. The last row reads one big binary plist, which is mapped
+instead of read.
+
+Run from the repository root::
+
+    python benchmarks/bench_read_binary.py
+'''
+import os
+import plistlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (Job, KeepAlive, Label, Program,  # noqa: E402
+                        ProgramArguments, RunAtLoad, StartCalendarInterval,
+                        loadPlist)
+
+
+def makeJob(path, i):
+    job = Job(path)
+    schedule = StartCalendarInterval()
+    schedule.add([{'Hour': h, 'Minute': i % 60} for h in range(0, 24, 6)])
+    job.add(
+        Label('com.bench.{}'.format(i)), Program('/usr/bin/true'),
+        ProgramArguments(['--id', str(i), '--verbose']), RunAtLoad(),
+        KeepAlive('depends', 'SuccessfulExit'), schedule)
+    return job
+
+
+def timed(func, paths):
+    start = time.perf_counter()
+    for path in paths:
+        func(path)
+    return time.perf_counter() - start
+
+
+def loadWith(load):
+    def run(path):
+        with open(path, 'rb') as f:
+            return load(f)
+
+    return run
+
+
+def main(count=3000):
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(count):
+            path = os.path.join(directory, 'com.bench.{}.plist'.format(i))
+            makeJob(path, i).write(format='binary')
+            paths.append(path)
+        for path in paths[:20]:
+            with open(path, 'rb') as f:
+                expected = plistlib.load(f)
+            with open(path, 'rb') as f:
+                assert loadPlist(f) == expected, 'decoded values differ'
+
+        print('{} files'.format(count))
+        for name, func in (('plistlib.load', loadWith(plistlib.load)),
+                           ('loadPlist', loadWith(loadPlist)),
+                           ('Job.read', Job.read)):
+            elapsed = timed(func, paths)
+            print('{:<16} {:8.1f} ms {:8.1f} us/file'.format(
+                name, elapsed * 1e3, elapsed / count * 1e6))
+
+        big = os.path.join(directory, 'big.plist')
+        job = Job(big)
+        schedule = StartCalendarInterval()
+        schedule.add([{'Day': d, 'Hour': h, 'Minute': m}
+                      for d in range(1, 29) for h in range(24)
+                      for m in range(0, 60, 5)])
+        job.add(Label('com.bench.big'), schedule)
+        job.write(format='binary')
+        print('one file of {} KB'.format(os.path.getsize(big) // 1024))
+        for name, func in (('plistlib.load', loadWith(plistlib.load)),
+                           ('loadPlist', loadWith(loadPlist))):
+            elapsed = timed(func, [big] * 5) / 5
+            print('{:<16} {:8.1f} ms'.format(name, elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+'''Benchmark reconcile() on directories of growing size.
+
+For every size the directory is written once, then reconcile() is timed when nothing changed,
+when 10 jobs changed, and with a fresh ReconcileState(every file read and hashed once, like a new process
+without a saved state). Only the stat pass should grow with the directory.
+Files go to /dev/shm when there is one.
+
+Run from the repository root::
+
+    python benchmarks/bench_reconcile.py
+'''
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import Job, Program, ReconcileState, reconcile  # noqa: E402
+
+
+def makeJobs(count):
+    return [
+        Job.fromDict('/tmp/com.bench.{}.plist'.format(i), {
+            'Label': 'com.bench.{}'.format(i),
+            'Program': '/usr/bin/true',
+            'StartCalendarInterval': [{
+                'Hour': h,
+                'Minute': i % 60
+            } for h in range(0, 24, 6)]
+        }) for i in range(count)
+    ]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    shm = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+    print('{:>7} {:>12} {:>12} {:>12} {:>12}'.format(
+        'plists', 'first s', 'no change s', '10 changed s', 'no state s'))
+    for count in (1000, 10000, 40000):
+        directory = tempfile.mkdtemp(prefix='launchdman-bench-', dir=shm)
+        try:
+            jobs = makeJobs(count)
+            first, plan = timed(lambda: reconcile(directory, jobs, sync=False))
+            plan.apply()
+            still, plan = timed(lambda: reconcile(directory, jobs, sync=False))
+            assert not plan
+            for job in jobs[:10]:
+                for config in job.value:
+                    if isinstance(config, Program):
+                        config.changeTo('/usr/bin/false')
+            changed, plan = timed(
+                lambda: reconcile(directory, jobs, sync=False))
+            assert plan.counts()['updated'] == 10
+            plan.apply()
+            fresh, plan = timed(lambda: reconcile(
+                directory, jobs, state=ReconcileState(), sync=False))
+            assert not plan
+            print('{:>7} {:>12.3f} {:>12.3f} {:>12.3f} {:>12.3f}'.format(
+                count, first, still, changed, fresh))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+'''Benchmark removing entries from large arrays.
+
+Removes a few hundred entries from a StartCalendarInterval and a
+WatchPaths with thousands of entries, with remove() (one pass through the
+membership index) and, for reference, with the old approach of calling
+list.remove until it fails for every entry, on the WatchPaths strings.
+
+Run from the repository root::
+
+    python benchmarks/bench_remove.py
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import StartCalendarInterval, StringSingle, WatchPaths  # noqa: E402
+
+
+def legacyRemove(removeList, l):
+    for removeValue in removeList:
+        while True:
+            try:
+                l.remove(removeValue)
+            except ValueError:
+                break
+
+
+def calendar(entries):
+    schedule = StartCalendarInterval()
+    schedule.add([{'Day': i % 28 + 1, 'Hour': i // 28 % 24, 'Minute': i % 60}
+                  for i in range(entries)])
+    return schedule
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    for entries in (2000, 8000):
+        removeDicts = [{'Day': i % 28 + 1, 'Hour': i // 28 % 24, 'Minute': i % 60}
+                       for i in range(0, entries, entries // 300)]
+        schedule = calendar(entries)
+        print('StartCalendarInterval {:>5} entries, remove {}: {:.4f}s'.format(
+            entries, len(removeDicts), timed(lambda: schedule.remove(removeDicts))))
+
+        paths = ['/tmp/watch/{}'.format(i) for i in range(entries)]
+        removePaths = paths[::entries // 300]
+        watch = WatchPaths(paths)
+        print('WatchPaths            {:>5} entries, remove {}: {:.4f}s'.format(
+            entries, len(removePaths), timed(lambda: watch.remove(removePaths))))
+        plain = [StringSingle(path) for path in paths]
+        removeSingles = [StringSingle(path) for path in removePaths]
+        print('list.remove loop      {:>5} entries, remove {}: {:.4f}s'.format(
+            entries, len(removePaths), timed(lambda: legacyRemove(removeSingles, plain))))
+
+
+if __name__ == '__main__':
+    main()
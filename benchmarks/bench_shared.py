@@ -0,0 +1,70 @@
+'''Measure a large homogeneous fleet: memory per job and render time per job.
+
+Builds 10k jobs that differ only in their Label and one argument, the way
+fleets of agents usually look, and measures the bytes traced per job with
+tracemalloc, then the time to render all of them the first time, and again
+after changing every Label. Strings, integers and bools that are the same in
+every job are shared leaves (see ``internLeaf()``).
+
+Run from the repository root::
+
+    python benchmarks/bench_shared.py
+'''
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import (Job, KeepAlive, Label, Nice, Program,  # noqa: E402
+                        ProgramArguments, RunAtLoad, StandardErrorPath,
+                        StandardOutPath, StartCalendarInterval, UserName,
+                        WorkingDirectory)
+
+
+def makeJob(i):
+    job = Job('/tmp/bench/{}.plist'.format(i))
+    job.add(
+        Label('com.bench.{}'.format(i)), Program('/usr/local/bin/agent'),
+        ProgramArguments(['--config', '/etc/agent.conf', '--shard',
+                          str(i % 16)]), StandardOutPath('/var/log/agent.log'),
+        StandardErrorPath('/var/log/agent.err'), WorkingDirectory('/'),
+        UserName('_agent'), RunAtLoad(), KeepAlive('always'), Nice(10),
+        StartCalendarInterval({'Hour': 3, 'Minute': i % 60}))
+    return job
+
+
+def timeRender(jobs):
+    # like timeit, keep the collector out of the numbers
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for job in jobs:
+            job.parse()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def main(count=10000):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    jobs = [makeJob(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('memory:       {:8.0f} B/job'.format((after - before) / count))
+
+    cold = timeRender(jobs)
+    for job in jobs:
+        job.value[0].changeTo(job.value[0].value[0].value[0] + '.x')
+    relabeled = timeRender(jobs)
+    print('first render: {:8.2f} us/job'.format(cold / count * 1e6))
+    print('relabeled:    {:8.2f} us/job'.format(relabeled / count * 1e6))
+
+
+if __name__ == '__main__':
+    main()
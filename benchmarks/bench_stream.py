@@ -0,0 +1,62 @@
+'''Benchmark Job.printMe against the streaming Job.writeTo.
+
+Builds jobs with thousands of StartCalendarInterval entries and prints the
+time per entry for both serializers. The streaming one should stay flat
+(linear time) as the job grows.
+
+Run from the repository root::
+
+    python benchmarks/bench_stream.py
+'''
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import Job, Label, Program, StartCalendarInterval  # noqa: E402
+
+
+def makeJob(entries):
+    job = Job('/tmp/bench.plist')
+    schedule = StartCalendarInterval()
+    schedule.add([{
+        'Hour': (i // 60) % 24,
+        'Minute': i % 60,
+        'Day': i % 28 + 1
+    } for i in range(entries)])
+    job.add(Label('bench'), Program('/usr/bin/true'), schedule)
+    return job
+
+
+def best(func, job, repeat=3):
+    times = []
+    for _ in range(repeat):
+        # measure cold renders, not the render cache
+        job.invalidate(deep=True)
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    print('{:>8} {:>12} {:>12} {:>12} {:>12}'.format(
+        'entries', 'printMe s', 'writeTo s', 'printMe us/e', 'writeTo us/e'))
+    for entries in (1000, 2000, 4000, 8000, 16000):
+        job = makeJob(entries)
+        expected = job.printMe(job.tag, job.value)
+        stream = io.StringIO()
+        job.writeTo(stream)
+        assert stream.getvalue() == expected, 'streamed output differs'
+
+        printTime = best(lambda: job.printMe(job.tag, job.value), job)
+        streamTime = best(lambda: job.writeTo(io.StringIO()), job)
+        print('{:>8} {:>12.4f} {:>12.4f} {:>12.2f} {:>12.2f}'.format(
+            entries, printTime, streamTime, printTime / entries * 1e6,
+            streamTime / entries * 1e6))
+
+
+if __name__ == '__main__':
+    main()
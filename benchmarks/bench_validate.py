@@ -0,0 +1,65 @@
+'''Benchmark validateMany() against writing the same jobs, to see whether validating before every write is affordable.
+
+Jobs have a StartCalendarInterval of up to 10000 entries, every value of it is checked.
+
+Run from the repository root::
+
+    python benchmarks/bench_validate.py
+'''
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from launchdman import Job, validateMany, writeAll  # noqa: E402
+
+
+def makeJobs(directory, count, entries):
+    return [
+        Job.fromDict(
+            os.path.join(directory, 'com.bench.{}.plist'.format(i)), {
+                'Label': 'com.bench.{}'.format(i),
+                'Program': '/usr/bin/true',
+                'Nice': 5,
+                'SoftResourceLimit': {'NumberOfFiles': 1024},
+                'StartCalendarInterval': [{
+                    'Day': n % 28 + 1,
+                    'Hour': (n // 60) % 24,
+                    'Minute': n % 60
+                } for n in range(entries)]
+            }) for i in range(count)
+    ]
+
+
+def best(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    shm = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+    print('{:>6} {:>8} {:>14} {:>12} {:>8}'.format('jobs', 'entries',
+                                                  'validateMany s',
+                                                  'writeAll s', 'ratio'))
+    for count, entries in ((1000, 10), (200, 1000), (20, 10000)):
+        directory = tempfile.mkdtemp(prefix='launchdman-bench-', dir=shm)
+        try:
+            jobs = makeJobs(directory, count, entries)
+            assert not validateMany(jobs)
+            schema = best(lambda: validateMany(jobs))
+            write = best(lambda: writeAll(jobs, workers=1, sync=False), 1)
+            print('{:>6} {:>8} {:>14.4f} {:>12.4f} {:>7.1f}%'.format(
+                count, entries, schema, write, schema / write * 100))
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+'''asyncio versions of writing jobs, so a service on an event loop can write a fleet without blocking it.
+
+Rendering and file I/O run in an executor(the loop's default thread pool unless you give one),
+the event loop only waits for them::
+
+    report = await launchdman.aio.writeAll(jobs, concurrency=16)
+
+    async for progress in launchdman.aio.iterWrite(jobs, concurrency=16):
+        print(progress.done, progress.total, progress.status, progress.path)
+'''
+import asyncio
+import functools
+import time
+from pathlib import Path
+
+from .files import _renderJob, _storeJob, syncDirectory, WriteReport
+
+
+class WriteProgress():
+    '''One job finished by ``iterWrite()``.
+
+    Properties:
+        done (int): jobs finished so far, this one included
+        total (int): jobs in the batch
+        status (str): 'written', 'skipped' or 'failed'
+        path (str): the plist of the job
+        error (Exception): why the job failed, None if it didn't
+        renderTime (float): seconds spent rendering the job
+        writeTime (float): seconds spent comparing and writing its file
+    '''
+    __slots__ = ('done', 'total', 'status', 'path', 'error', 'renderTime',
+                 'writeTime')
+
+    def __init__(self, done, total, status, path, error, renderTime,
+                 writeTime):
+        self.done = done
+        self.total = total
+        self.status = status
+        self.path = path
+        self.error = error
+        self.renderTime = renderTime
+        self.writeTime = writeTime
+
+    def __repr__(self):
+        return '<WriteProgress {}/{} {} {}>'.format(self.done, self.total,
+                                                    self.status, self.path)
+
+
+async def _inExecutor(executor, func, *args):
+    '''Run func(*args) in executor and return how long it took too.'''
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    result = await loop.run_in_executor(executor, functools.partial(
+        func, *args))
+    return result, time.perf_counter() - start
+
+
+async def _writeOne(job, sync, executor):
+    '''Render job in executor, then write it there.
+
+    Returns:
+        tuple: (status, path, renderTime, writeTime, error), like ``files._writeJob()``
+    '''
+    path = job.me
+    renderTime = writeTime = 0.0
+    try:
+        data, renderTime = await _inExecutor(executor, _renderJob, job)
+        written, writeTime = await _inExecutor(executor, _storeJob, path,
+                                               data, sync)
+        return ('written' if written else 'skipped', path, renderTime,
+                writeTime, None)
+    except Exception as error:
+        return 'failed', path, renderTime, writeTime, error
+
+
+async def iterWrite(jobs, concurrency=8, executor=None, sync=True):
+    '''Write a lot of jobs, giving a ``WriteProgress`` for every job as it finishes.
+
+    Files are written like ``launchdman.writeAll()`` does: atomically, skipped if they already have the same bytes,
+    and every directory is synced once after the last job.
+    At most concurrency jobs are rendered or written at a time, so thousands of jobs don't hold thousands of rendered plists,
+    and a job that fails doesn't stop the others.
+    If you stop iterating early, the jobs that haven't started yet are cancelled.
+
+    Example::
+
+        async for progress in iterWrite(jobs, concurrency=16):
+            if progress.status == 'failed':
+                log.warning('%s: %s', progress.path, progress.error)
+
+    Args:
+        jobs (list): the jobs to write
+        concurrency (int): how many jobs are in flight at most
+        executor (concurrent.futures.Executor): where rendering and file I/O run, default to the loop's default executor
+        sync (bool): whether to fsync the files and their directories
+
+    Yields:
+        WriteProgress: a finished job, in the order they finish
+    '''
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1, not {}'.format(
+            concurrency))
+    jobs = list(jobs)
+    total = len(jobs)
+    # a job takes a slot before it's rendered and gives it back after its file is written,
+    # which bounds both the rendered plists in memory and the files open at once
+    slots = asyncio.Semaphore(concurrency)
+    finished = asyncio.Queue()
+    tasks = set()
+
+    async def run(job):
+        try:
+            result = await _writeOne(job, sync, executor)
+        finally:
+            slots.release()
+        finished.put_nowait(result)
+
+    async def feed():
+        for job in jobs:
+            await slots.acquire()
+            task = asyncio.ensure_future(run(job))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    feeder = asyncio.ensure_future(feed())
+    directories = set()
+    try:
+        for done in range(1, total + 1):
+            status, path, renderTime, writeTime, error = await finished.get()
+            if status == 'written':
+                directories.add(Path(path).parent)
+            yield WriteProgress(done, total, status, path, error, renderTime,
+                                writeTime)
+        if sync:
+            for directory in directories:
+                await _inExecutor(executor, syncDirectory, directory)
+    finally:
+        feeder.cancel()
+        for task in list(tasks):
+            task.cancel()
+
+
+async def writeAll(jobs, concurrency=8, executor=None, sync=True):
+    '''Write a lot of jobs to their plists, the asyncio version of ``launchdman.writeAll()``.
+
+    Example::
+
+        report = await writeAll(jobs, concurrency=16)
+        print(report.counts(), report.totalTime)
+
+    Args:
+        jobs (list): the jobs to write
+        concurrency (int): how many jobs are in flight at most
+        executor (concurrent.futures.Executor): where rendering and file I/O run, default to the loop's default executor
+        sync (bool): whether to fsync the files and their directories
+
+    Returns:
+        WriteReport: counts and timings of the batch, syncTime is part of totalTime and not counted on its own
+    '''
+    report = WriteReport()
+    start = time.perf_counter()
+    async for progress in iterWrite(jobs, concurrency, executor, sync):
+        report.renderTime += progress.renderTime
+        report.writeTime += progress.writeTime
+        if progress.status == 'written':
+            report.written.append(progress.path)
+        elif progress.status == 'skipped':
+            report.skipped.append(progress.path)
+        else:
+            report.failed.append((progress.path, progress.error))
+    report.totalTime = time.perf_counter() - start
+    return report
+
+
+async def awrite(job, format='xml', executor=None):
+    '''Write a job to its plist without blocking the event loop, see ``Job.awrite()``.
+
+    Args:
+        job (Job): the job
+        format (str): 'xml' or 'binary', like ``Job.write()``
+        executor (concurrent.futures.Executor): where the job is rendered and written, default to the loop's default executor
+    '''
+    await _inExecutor(executor, job.write, format)
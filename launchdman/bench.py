@@ -0,0 +1,436 @@
+'''Benchmarks of launchdman: importing it, building, rendering, comparing, removing and writing jobs.
+
+Every operation is timed over scaling sweeps: the number of jobs, keys per job, StartCalendarInterval entries
+and how deep a nested dict goes. One parameter moves at a time, the others stay at the base point.
+Startup is measured with ``python -X importtime`` in a fresh interpreter, ``--startup`` runs only that.
+Results are printed(or saved) as JSON, and can be compared with a saved baseline::
+
+    python -m launchdman.bench -o baseline.json
+    # ... change something ...
+    python -m launchdman.bench --compare baseline.json
+
+``--compare`` exits with status 1 if any case got slower than the baseline by more than ``--threshold``
+(``--startup-threshold`` for the startup cases).
+'''
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from launchdman import Job, StartCalendarInterval, crossCombine, writeAll
+
+# every case runs at the base point, and once for every other value of each parameter
+basePoint = {'jobs': 50, 'keys': 10, 'entries': 100, 'depth': 2}
+sweeps = {
+    'jobs': (10, 50, 250),
+    'keys': (5, 10, 20),
+    'entries': (10, 100, 1000),
+    'depth': (1, 2, 8)
+}
+quickPoint = {'jobs': 10, 'keys': 5, 'entries': 10, 'depth': 1}
+quickSweeps = {
+    'jobs': (10, 40),
+    'keys': (5, 10),
+    'entries': (10, 100),
+    'depth': (1, 4)
+}
+# sizes of the product made by crossCombine()
+combineSizes = (1440, 10080, 44640)
+quickCombineSizes = (1440, )
+# what a short-lived script imports
+startupStatements = (
+    'import launchdman',
+    'from launchdman import Label',
+    'from launchdman import Job',
+    'from launchdman import *',
+)
+
+# keys with real config classes, a job with more keys gets generic ones
+_configValues = [
+    ('Program', '/usr/local/bin/agent'),
+    ('ProgramArguments', ['/usr/local/bin/agent', '--verbose']),
+    ('StandardOutPath', '/var/log/agent.log'),
+    ('StandardErrorPath', '/var/log/agent.err'),
+    ('WorkingDirectory', '/'),
+    ('UserName', '_agent'),
+    ('RunAtLoad', True),
+    ('Nice', 10),
+    ('WatchPaths', ['/etc/agent.conf', '/etc/agent.d']),
+    ('SoftResourceLimit', {'NumberOfFiles': 1024}),
+    ('EnvironmentVariables', {'PATH': '/usr/bin:/bin'}),
+    ('ThrottleInterval', 30),
+]
+
+
+def nested(depth):
+    '''A dict nested depth levels deep, with an array and a few scalars on every level.'''
+    value = {'Leaf': 'value', 'Count': depth}
+    for level in range(depth - 1):
+        value = {'Level': level, 'Items': ['a', 'b', level], 'Inner': value}
+    return value
+
+
+def definition(i, keys, entries, depth):
+    '''The dict of job number i, see ``Job.fromDict()``.
+
+    It has a Label, a StartCalendarInterval with `entries` entries, a `Nested` dict `depth` levels deep
+    and `keys` other keys.
+    '''
+    mapping = {'Label': 'com.bench.{}'.format(i)}
+    for n in range(keys):
+        if n < len(_configValues):
+            key, value = _configValues[n]
+        else:
+            key, value = 'Extra{}'.format(n), 'extra-{}'.format(n)
+        mapping[key] = value
+    mapping['StartCalendarInterval'] = [{
+        'Hour': (n // 60) % 24,
+        'Minute': (n + i) % 60,
+        'Day': n % 28 + 1
+    } for n in range(entries)]
+    mapping['Nested'] = nested(depth)
+    return mapping
+
+
+def _timed(func, setup, repeat):
+    '''Best time of func() over repeat runs, setup() runs before each and is not timed.'''
+    best = None
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        # like timeit, keep the collector out of the numbers
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func(arg)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _coldJobs(jobs):
+    for job in jobs:
+        job.invalidate(deep=True)
+    return jobs
+
+
+def _tmpfs():
+    '''A directory in memory if there is one, so write measures launchdman and not the disk.'''
+    shm = '/dev/shm'
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+def runPoint(point, repeat, directory):
+    '''Time every operation at one point of the sweep.
+
+    Args:
+        point (dict): jobs, keys, entries and depth
+        repeat (int): how many times every operation runs, the best time counts
+        directory (str): where the write case writes its plists
+
+    Returns:
+        dict: operation -> seconds
+    '''
+    count = point['jobs']
+    mappings = [
+        definition(i, point['keys'], point['entries'], point['depth'])
+        for i in range(count)
+    ]
+    paths = [
+        os.path.join(directory, 'com.bench.{}.plist'.format(i))
+        for i in range(count)
+    ]
+
+    def build(arg=None):
+        return [Job.fromDict(path, m) for path, m in zip(paths, mappings)]
+
+    jobs = build()
+    others = build()
+    schedules = [job.value[-2] for job in jobs]
+    assert all(isinstance(s, StartCalendarInterval) for s in schedules)
+    results = {}
+    results['build'] = _timed(build, None, repeat)
+    # cold renders, not the render cache
+    results['render'] = _timed(
+        lambda jobs: [job.parse() for job in jobs],
+        lambda: _coldJobs(jobs), repeat)
+    results['render.cached'] = _timed(
+        lambda jobs: [job.parse() for job in jobs], lambda: jobs, repeat)
+    results['equality'] = _timed(
+        lambda pairs: [a == b for a, b in pairs],
+        lambda: list(zip(_coldJobs(jobs), _coldJobs(others))), repeat)
+
+    def removeHalf(jobs):
+        for job, m in zip(jobs, mappings):
+            job.value[-2].remove(m['StartCalendarInterval'][::2])
+
+    results['remove'] = _timed(removeHalf, build, repeat)
+
+    def fresh():
+        # new files every time, writeAll() skips files that didn't change
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        return _coldJobs(jobs)
+
+    results['write'] = _timed(lambda jobs: [job.write() for job in jobs],
+                              fresh, repeat)
+    results['writeAll'] = _timed(
+        lambda jobs: writeAll(jobs, workers=1, sync=False), fresh, repeat)
+    results['writeAll.unchanged'] = _timed(
+        lambda jobs: writeAll(jobs, workers=1, sync=False), lambda: jobs,
+        repeat)
+    return results
+
+
+def runCombine(size, repeat):
+    '''Time genMix() and crossCombine() for a schedule of about `size` entries.'''
+    schedule = StartCalendarInterval()
+    minutes = tuple(range(60))
+    hours = tuple(range(24))
+    days = tuple(range(1, 1 + max(1, size // 1440)))
+    results = {}
+    results['genMix'] = _timed(
+        lambda arg: schedule.genMix(day=days, hour=hours, minute=minutes),
+        None, repeat)
+    grandList = [[{'Day': d} for d in days], [{'Hour': h} for h in hours],
+                 [{'Minute': m} for m in minutes]]
+    results['crossCombine'] = _timed(lambda arg: crossCombine(grandList),
+                                     None, repeat)
+    return results
+
+
+def _importTimes(statement):
+    '''Microseconds spent importing each top level module while running statement in a new interpreter.
+
+    Returns:
+        dict: module -> cumulative microseconds, from ``python -X importtime``
+    '''
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, cwd=root,
+        universal_newlines=True, check=True).stderr
+    times = {}
+    for line in output.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        # nested imports are indented by two spaces per level, they are in the cumulative time already
+        if name[:2] == '  ':
+            continue
+        times[name.strip()] = int(fields[1])
+    return times
+
+
+def runStartup(repeat):
+    '''Time the import of launchdman for every statement in startupStatements.
+
+    Modules the bare interpreter imports anyway don't count. The median of repeat runs counts,
+    since a fresh process is noisier than a loop.
+
+    Returns:
+        dict: statement -> seconds
+    '''
+    results = {}
+    runs = max(repeat, 5)
+    for statement in startupStatements:
+        samples = []
+        for _ in range(runs):
+            baseline = _importTimes('pass')
+            times = _importTimes(statement)
+            samples.append(sum(us for name, us in times.items()
+                               if name not in baseline))
+        results[statement] = statistics.median(samples) / 1e6
+    return results
+
+
+def points(base, sweep):
+    '''The points of a sweep: base, then base with one parameter changed, without repeats.'''
+    result = [dict(base)]
+    for name, values in sweep.items():
+        for value in values:
+            point = dict(base, **{name: value})
+            if point not in result:
+                result.append(point)
+    return result
+
+
+def caseName(operation, point):
+    return '{}/{}'.format(operation, ','.join(
+        '{}={}'.format(k, point[k]) for k in ('jobs', 'keys', 'entries',
+                                              'depth') if k in point))
+
+
+def run(quick=False, repeat=3, log=None, startupOnly=False):
+    '''Run the whole suite.
+
+    Args:
+        quick (bool): smaller sweeps, to check that the suite runs
+        repeat (int): how many times every operation runs, the best time counts
+        log (callable): called with a line of progress for every case
+        startupOnly (bool): only run the startup cases
+
+    Returns:
+        dict: the report, see ``main()``
+    '''
+    cases = {}
+    for statement, seconds in runStartup(repeat).items():
+        name = 'startup/{}'.format(statement)
+        cases[name] = {'seconds': seconds, 'startup': True}
+        if log is not None:
+            log('{:<60} {:12.6f} s'.format(name, seconds))
+    if startupOnly:
+        return _report(quick, repeat, cases)
+    base, sweep = (quickPoint, quickSweeps) if quick else (basePoint, sweeps)
+    sizes = quickCombineSizes if quick else combineSizes
+    directory = tempfile.mkdtemp(prefix='launchdman-bench-', dir=_tmpfs())
+    try:
+        for point in points(base, sweep):
+            for operation, seconds in runPoint(point, repeat,
+                                               directory).items():
+                name = caseName(operation, point)
+                cases[name] = {
+                    'seconds': seconds,
+                    'perJob': seconds / point['jobs'],
+                    'params': dict(point)
+                }
+                if log is not None:
+                    log('{:<60} {:12.6f} s'.format(name, seconds))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    for size in sizes:
+        for operation, seconds in runCombine(size, repeat).items():
+            name = '{}/size={}'.format(operation, size)
+            cases[name] = {'seconds': seconds, 'params': {'size': size}}
+            if log is not None:
+                log('{:<60} {:12.6f} s'.format(name, seconds))
+    return _report(quick, repeat, cases)
+
+
+def _report(quick, repeat, cases):
+    return {
+        'version': 1,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'quick': quick,
+        'repeat': repeat,
+        'cases': cases
+    }
+
+
+def compare(report, baseline, threshold=0.25, floor=50e-6,
+            startupThreshold=0.5, startupFloor=2e-3):
+    '''Compare a report with a baseline report.
+
+    A case regressed if it is slower than in the baseline by more than threshold(a fraction),
+    and by more than floor seconds, so that the noise of tiny cases doesn't count.
+    Startup cases run in a new process every time, so they get their own, looser, limits.
+    Cases that are only in one of them are skipped.
+
+    Args:
+        report (dict): the new report, from ``run()``
+        baseline (dict): the old report
+        threshold (float): allowed slowdown, 0.25 is 25%
+        floor (float): allowed slowdown in seconds
+        startupThreshold (float): allowed slowdown of the startup cases
+        startupFloor (float): allowed slowdown of the startup cases in seconds
+
+    Returns:
+        list: (name, baseline seconds, seconds, ratio) of every common case, worst first
+        list: the names of the regressed cases
+    '''
+    rows = []
+    regressions = []
+    old = baseline.get('cases', {})
+    for name, case in report['cases'].items():
+        if name not in old:
+            continue
+        before = old[name]['seconds']
+        after = case['seconds']
+        ratio = after / before if before > 0 else float('inf')
+        rows.append((name, before, after, ratio))
+        if case.get('startup'):
+            limit, slack = startupThreshold, startupFloor
+        else:
+            limit, slack = threshold, floor
+        if ratio > 1 + limit and after - before > slack:
+            regressions.append(name)
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m launchdman.bench',
+        description='Benchmark importing launchdman, building, rendering, comparing, removing and writing jobs.')
+    parser.add_argument(
+        '-o', '--output', help='save the JSON report to this file instead of printing it')
+    parser.add_argument(
+        '--compare', metavar='BASELINE', help='compare with a saved report, exit with 1 on regressions')
+    parser.add_argument(
+        '--threshold', type=float, default=0.25, help='allowed slowdown for --compare, default 0.25(25%%)')
+    parser.add_argument(
+        '--startup-threshold', type=float, default=0.5, help='allowed slowdown of the startup cases, default 0.5(50%%)')
+    parser.add_argument(
+        '--startup', action='store_true', help='only measure how long importing launchdman takes')
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='runs of every case, the best counts. Default 3')
+    parser.add_argument(
+        '--quick', action='store_true', help='small sweeps, to see that everything runs')
+    parser.add_argument(
+        '-q', '--quiet', action='store_true', help="don't print progress or the --compare table to stderr")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    def log(line):
+        print(line, file=sys.stderr)
+
+    if args.quiet:
+        log = None
+    report = run(quick=args.quick, repeat=args.repeat, log=log,
+                 startupOnly=args.startup)
+    status = 0
+    if baseline is not None:
+        rows, regressions = compare(report, baseline, args.threshold,
+                                    startupThreshold=args.startup_threshold)
+        report['baseline'] = args.compare
+        report['regressions'] = regressions
+        # with --quiet the regressions are only in the report and the exit status
+        if log is not None:
+            log('{:<60} {:>12} {:>12} {:>7}'.format('case', 'baseline s',
+                                                    'now s', 'ratio'))
+            for name, before, after, ratio in rows:
+                log('{:<60} {:12.6f} {:12.6f} {:6.2f}x{}'.format(
+                    name, before, after, ratio,
+                    '  REGRESSION' if name in regressions else ''))
+            log('{} of {} cases regressed'.format(len(regressions), len(rows)))
+        status = 1 if regressions else 0
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,833 @@
+'''StartInterval, StartCalendarInterval and the calendar tools behind them: combining, compacting and forecasting.'''
+import datetime
+
+from . import core
+from .core import (ArraySingle, checkKey, DictSingle, flatten, IntegerSingle,
+                   internLeaf, nullSink, Pair, structuralKey)
+
+
+def iterCrossCombine(l):
+    '''The lazy version of ``crossCombine()``, yields the combined dicts one by one.
+
+    Every sublist is read once. The combination of the first n picks is kept and only
+    recomputed when one of those picks changes, so each dict costs one merge
+    instead of one merge per sublist.
+
+    Args:
+        l (list[list]): the list of lists you want to crossCombine with, the sublists can be any iterable
+
+    Returns:
+        A iterable of combined dicts, in the same order as ``crossCombine()``
+    '''
+    pools = [list(pool) for pool in l]
+    if not pools or not all(pools):
+        return
+    if len(pools) == 1:
+        yield from pools[0]
+        return
+    last = len(pools) - 1
+    picks = [0] * last
+    # prefixes[i] is the combination of the picks from pools[0] to pools[i]
+    prefixes = [pools[0][0]]
+    for i in range(1, last):
+        prefixes.append(combinteDict(prefixes[i - 1], pools[i][0]))
+    while True:
+        prefix = prefixes[-1]
+        for pick in pools[last]:
+            yield {**prefix, **pick}
+        # move the other picks to the next one like an odometer
+        i = last - 1
+        while picks[i] == len(pools[i]) - 1:
+            picks[i] = 0
+            i -= 1
+            if i < 0:
+                return
+        picks[i] += 1
+        for j in range(i, last):
+            pick = pools[j][picks[j]]
+            prefixes[j] = pick if j == 0 else combinteDict(
+                prefixes[j - 1], pick)
+
+
+def _generated(grandList):
+    '''fields of the generate event of genMix() and genInterval(), see addSink()'''
+    entries = 1 if grandList else 0
+    for l in grandList:
+        entries *= len(l)
+    return {'entries': entries, 'lists': grandList}
+
+
+def crossCombine(l):
+    ''' Taken a list of lists, returns a big list of lists contain all the possibilities of elements of sublist combining together.
+
+    It is basically a Combinatorics of list. For example:
+
+        >>> crossCombine([[a,a1,a2,...], [b,b1,b2,...]])
+        >>> [[a,b], [a,b1], [a,b2], [a1,b], [a1,b1], [a1, b2], [a2,b], [a2,b1], [a2,b2], ...]
+
+    For using in StartCalendarInterval, the syntax of ``l`` is like below:
+        ``l: [[dic of month], [dict of day]]``
+
+    such as:
+        ``l: [[{'month': 1}, {'month': 2}], [{'day': 2}, {'day': 3}, {'day': 4}]]``
+
+    If you don't need the whole list at once, use ``iterCrossCombine()``.
+
+    Args:
+        l (list[list]): the list of lists you want to crossCombine with.
+
+    Returns:
+        list: crossCombined list
+
+    '''
+    return list(iterCrossCombine(l))
+
+
+def combine(a1, a2):
+    ''' Combine to argument into a single flat list
+
+    It is used when you are not sure whether arguments are lists but want to combine them into one flat list
+
+    Args:
+        a1: list or other thing
+        a2: list or other thing
+
+    Returns:
+        list: a flat list contain a1 and a2
+    '''
+    if not isinstance(a1, list):
+        a1 = [a1]
+    if not isinstance(a2, list):
+        a2 = [a2]
+    return a1 + a2
+
+
+def combinteDict(d, d1):
+    '''Combine two dict into one
+
+    Example:
+
+    >>> combinteDict({'1': 1}, {'2': 2})
+    >>> {'1': 1, '2': 2}
+
+    Args:
+        d (dict): A dict to combine with
+        d1 (dict): A dict to combine with
+
+    Returns:
+        dict: the combined dict
+    '''
+    return {**d, **d1}
+
+
+class StartInterval(Pair):
+    '''StartInterval config
+
+    Example:
+
+        config = StartInterval().every(1).second
+        config = StartInterval().every(10).day
+
+    Avaliable time intervals are: second, minute. hour, day, week.
+
+    '''
+    __slots__ = ('baseNumber', 'magnification')
+
+    def __init__(self):
+        super().__init__()
+        self.baseNumber = 1
+        self.magnification = 1
+
+    def every(self, baseNumber):
+        '''set base number
+
+        Args:
+            baseNumber (str): number of day/minute/second/etc
+        '''
+        self.baseNumber = baseNumber
+        return self
+
+    def _update(self, baseNumber, magnification):
+        '''update self.value with basenumber and time interval
+
+        Args:
+            baseNumber (str): self.baseNumber
+            magnification (str): self.magnification
+        '''
+        interval = int(baseNumber * magnification)
+        self.value = [internLeaf(IntegerSingle, interval)]
+        self.invalidate()
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from an int(seconds) read from a plist. See ``Pair.fromValue()``.'''
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError('{} expects an integer'.format(cls.__name__))
+        pair = cls().every(value).second
+        if key:
+            pair.key = key
+        return pair
+
+    def nextFireTimes(self, after, n=1, start=None):
+        '''Forecast when the job runs. launchd runs it every interval after it is loaded.
+
+        The interval is elapsed time, so the clock changing for DST doesn't move it.
+
+        Args:
+            after (datetime.datetime): the time to start from
+            n (int): how many fire times
+            start (datetime.datetime): when the job was loaded, defaults to `after`
+
+        Returns:
+            list: `n` datetimes, naive or aware like `after`
+        '''
+        if not self.value:
+            raise ValueError('StartInterval has no interval, use every()')
+        interval = self.value[0].value[0]
+        afterStamp = after.timestamp()
+        startStamp = afterStamp if start is None else start.timestamp()
+        first = max(int((afterStamp - startStamp) // interval) + 1, 1)
+        return [
+            datetime.datetime.fromtimestamp(
+                startStamp + interval * k, after.tzinfo)
+            for k in range(first, first + n)
+        ]
+
+    @property
+    def second(self):
+        '''set unit to second'''
+        self.magnification = 1
+        self._update(self.baseNumber, self.magnification)
+        return self
+
+    @property
+    def minute(self):
+        '''set unit to minute'''
+        self.magnification = 60
+        self._update(self.baseNumber, self.magnification)
+        return self
+
+    @property
+    def hour(self):
+        '''set unit to hour'''
+        self.magnification = 3600
+        self._update(self.baseNumber, self.magnification)
+        return self
+
+    @property
+    def day(self):
+        '''set unit to day'''
+        self.magnification = 86400
+        self._update(self.baseNumber, self.magnification)
+        return self
+
+    @property
+    def week(self):
+        '''set unit to week'''
+        self.magnification = 345600
+        self._update(self.baseNumber, self.magnification)
+        return self
+
+
+# the full range of every calendar field, 0 and 7 are both Sunday
+calendarRanges = {
+    'Minute': frozenset(range(0, 60)),
+    'Hour': frozenset(range(0, 24)),
+    'Weekday': frozenset(range(0, 7)),
+    'Day': frozenset(range(1, 32)),
+    'Month': frozenset(range(1, 13))
+}
+
+# every (key, value) launchd takes in a calendar entry, Weekday 7 included.
+# One lookup checks the key and the range, and a set of them is checked in one go, see launchdman.schema
+_calendarPairs = frozenset([(field, value)
+                            for field, values in calendarRanges.items()
+                            for value in values] + [('Weekday', 7)])
+
+
+def checkCalendarEntry(entry):
+    '''Check a calendar dict before it goes into a StartCalendarInterval.
+
+    Args:
+        entry (dict): e.g. {'Day': 12, 'Hour': 3}
+
+    Raises:
+        AttributeError: for a key that is not Month, Day, Weekday, Hour or Minute, like ``checkKey()``
+        TypeError: for a value that is not an integer
+        ValueError: for a value out of range, e.g. Hour 24
+    '''
+    for key, value in entry.items():
+        if value.__class__ is int and (key, value) in _calendarPairs:
+            continue
+        checkKey(key, calendarRanges)
+        if value.__class__ is not int:
+            raise TypeError('{} must be an integer, not {!r}'.format(
+                key, value))
+        values = calendarRanges[key] | ({7} if key == 'Weekday' else set())
+        raise ValueError('{} {} is out of range, it goes from {} to {}'.format(
+            key, value, min(values), max(values)))
+
+
+def _dedupeCalendar(entries):
+    '''drop repeated entries, keep the first one'''
+    seen = set()
+    result = []
+    for entry in entries:
+        key = frozenset(entry.items())
+        if key not in seen:
+            seen.add(key)
+            result.append(entry)
+    return result
+
+
+def _subsumes(general, entry):
+    '''Check whether every time `entry` fires, `general` fires too.
+
+    `general` has to be a subset of `entry`. Like cron, launchd fires when Day *or* Weekday matches
+    if both are set, so {'Day': 1} does not cover {'Day': 1, 'Weekday': 2}.
+    '''
+    days = ('Day' in general) + ('Weekday' in general)
+    return days == 0 or days == 2 or not ('Day' in entry
+                                          and 'Weekday' in entry)
+
+
+def compactCalendar(entries):
+    '''Find a smaller set of calendar dicts that fires at exactly the same times.
+
+    A field that is missing is a wildcard, so entries that only differ in one field and cover
+    the full range of that field are merged into one entry without that field,
+    e.g. 60 dicts with Minute 0 to 59 and Hour 3 become {'Hour': 3}. This is repeated until nothing
+    merges anymore, then duplicates and entries covered by a more general one are dropped.
+
+    Day and Weekday are only merged away when the other one is not set, because launchd fires
+    when either of them matches. An entry is never reduced to an empty dict, which would print as nothing.
+    Weekday 7 becomes 0. Keys that are not in ``calendarRanges`` are kept as they are.
+
+    Args:
+        entries (list): dicts with format {'Day': 12, 'Hour': 34}
+
+    Returns:
+        list: the compacted dicts, in the order they first appear
+    '''
+    result = []
+    for entry in entries:
+        entry = dict(entry)
+        if entry.get('Weekday') == 7:
+            entry['Weekday'] = 0
+        result.append(entry)
+    result = _dedupeCalendar(result)
+
+    changed = True
+    while changed:
+        changed = False
+        for field, full in calendarRanges.items():
+            other = {'Day': 'Weekday', 'Weekday': 'Day'}.get(field)
+            groups = {}
+            for i, entry in enumerate(result):
+                if field not in entry or len(entry) == 1 or other in entry:
+                    continue
+                rest = frozenset(
+                    item for item in entry.items() if item[0] != field)
+                groups.setdefault(rest, []).append(i)
+            merged = {}
+            dropped = set()
+            for indexes in groups.values():
+                if full <= {result[i][field] for i in indexes}:
+                    first = indexes[0]
+                    merged[first] = {
+                        k: v
+                        for k, v in result[first].items() if k != field
+                    }
+                    dropped.update(indexes[1:])
+            if merged:
+                changed = True
+                result = _dedupeCalendar([
+                    merged.get(i, entry) for i, entry in enumerate(result)
+                    if i not in dropped
+                ])
+
+    # drop entries covered by a more general one, try every subset of an entry's fields
+    present = {frozenset(entry.items()) for entry in result}
+    kept = []
+    for entry in result:
+        items = list(entry.items())
+        covered = False
+        for mask in range(1, 1 << len(items)):
+            general = dict(item for bit, item in enumerate(items)
+                           if not mask & (1 << bit))
+            if frozenset(general.items()) in present and _subsumes(
+                    general, entry):
+                covered = True
+                break
+        if not covered:
+            kept.append(entry)
+    return kept
+
+
+_allMinutes = (1 << 1440) - 1
+# minute 0 of every hour
+_minuteColumn = sum(1 << (60 * hour) for hour in range(24))
+
+
+def _minuteBits(hour, minute):
+    '''The minutes of the day a calendar entry fires at, as a 1440-bit int.'''
+    if hour is not None and not 0 <= hour < 24:
+        return 0
+    if minute is not None and not 0 <= minute < 60:
+        return 0
+    if hour is None and minute is None:
+        return _allMinutes
+    if hour is None:
+        return _minuteColumn << minute
+    if minute is None:
+        return ((1 << 60) - 1) << (60 * hour)
+    return 1 << (60 * hour + minute)
+
+
+class CalendarSchedule():
+    '''StartCalendarInterval entries compiled into lookup tables, see ``StartCalendarInterval.compile()``.
+
+    Entries are grouped by their date fields (Month, Day, Weekday) and every group keeps the minutes of
+    the day it fires at as a 1440-bit int. Finding out when a date fires is a few dict lookups,
+    and going through the day is going through the set bits.
+    Like in cron, an entry with both Day and Weekday fires when either of them matches.
+
+    Args:
+        entries (list): dicts with format {'Day': 12, 'Hour': 34}, keys other than Month, Day, Weekday, Hour and Minute are ignored
+    '''
+
+    # give up when nothing fires for this many days, Feb 29 can be 8 years apart
+    horizon = 8 * 366 + 1
+
+    def __init__(self, entries):
+        self.plain = {}  # (month, day, weekday) -> minutes, with day or weekday unset
+        self.byDay = {}  # (month, day) -> minutes of entries with both day and weekday
+        self.byWeekday = {}  # (month, weekday) -> minutes of entries with both day and weekday
+        self._dates = {}  # (month, day, weekday) -> minutes, filled as dates come up
+        for entry in entries:
+            bits = _minuteBits(entry.get('Hour'), entry.get('Minute'))
+            if not bits:
+                continue
+            month, day, weekday = entry.get('Month'), entry.get(
+                'Day'), entry.get('Weekday')
+            if weekday == 7:
+                weekday = 0
+            if day is not None and weekday is not None:
+                self.byDay[month, day] = self.byDay.get((month, day), 0) | bits
+                self.byWeekday[month, weekday] = self.byWeekday.get(
+                    (month, weekday), 0) | bits
+            else:
+                key = (month, day, weekday)
+                self.plain[key] = self.plain.get(key, 0) | bits
+
+    def dateFields(self):
+        '''Returns:
+            tuple: the date fields(Month, Day, Weekday) the schedule looks at, the others are wildcards
+        '''
+        fields = set()
+        for month, day, weekday in self.plain:
+            fields.update(f for f, v in (('Month', month), ('Day', day),
+                                         ('Weekday', weekday))
+                          if v is not None)
+        for month, _ in self.byDay:
+            fields.update(('Day', 'Weekday'))
+            if month is not None:
+                fields.add('Month')
+        return tuple(f for f in ('Month', 'Day', 'Weekday') if f in fields)
+
+    def minutesOf(self, date):
+        '''Returns:
+            int: the minutes of the day `date` fires at, bit 0 is 00:00
+        '''
+        # launchd counts weekdays from Sunday
+        key = (date.month, date.day, (date.weekday() + 1) % 7)
+        bits = self._dates.get(key)
+        if bits is None:
+            bits = 0
+            month, day, weekday = key
+            for m in (None, month):
+                bits |= self.plain.get((m, None, None), 0) | self.plain.get(
+                    (m, day, None), 0) | self.plain.get(
+                        (m, None, weekday), 0) | self.byDay.get(
+                            (m, day), 0) | self.byWeekday.get((m, weekday), 0)
+            self._dates[key] = bits
+        return bits
+
+    def nextFireTimes(self, after, n=1):
+        '''Compute the next `n` times the schedule fires, strictly after `after`.
+
+        Calendar times are local (wall clock) times. A naive `after` is read as the local time of
+        the machine and naive datetimes are returned, an aware one gives aware datetimes in its timezone.
+        DST is handled like launchd does it with mktime(): a time skipped by the clock going
+        forward fires that much later (2:30 fires at 3:30), and a time that happens twice
+        fires only the first time.
+
+        Args:
+            after (datetime.datetime): the time to start from
+            n (int): how many fire times
+
+        Returns:
+            list: up to `n` datetimes, fewer if the schedule stops firing
+        '''
+        tz = after.tzinfo
+        afterStamp = after.timestamp()
+        date = after.date()
+        # minutes of the first day up to `after` already passed
+        firstMinute = after.hour * 60 + after.minute + 1
+        result = []
+        idle = 0
+        while len(result) < n and idle <= self.horizon:
+            bits = self.minutesOf(date)
+            if date == after.date():
+                bits &= ~((1 << firstMinute) - 1)
+            nextDate = date + datetime.timedelta(days=1)
+            if not bits:
+                idle += 1
+                date = nextDate
+                continue
+            midnight = datetime.datetime(
+                date.year, date.month, date.day, tzinfo=tz).timestamp()
+            nextMidnight = datetime.datetime(
+                nextDate.year, nextDate.month, nextDate.day,
+                tzinfo=tz).timestamp()
+            if nextMidnight - midnight == 86400:
+                stamps = self._stamps(bits, midnight, n - len(result))
+            else:
+                if date == after.date():
+                    # with the clock going back, earlier minutes can still be ahead
+                    bits = self.minutesOf(date)
+                stamps = self._dstStamps(bits, date, tz)
+            found = [s for s in stamps if s > afterStamp]
+            if found:
+                idle = 0
+                result.extend(
+                    datetime.datetime.fromtimestamp(s, tz)
+                    for s in found[:n - len(result)])
+            else:
+                idle += 1
+            date = nextDate
+        return result
+
+    @staticmethod
+    def _stamps(bits, midnight, n):
+        '''timestamps of the first `n` set minutes of a day without DST changes'''
+        stamps = []
+        while bits and len(stamps) < n:
+            low = bits & -bits
+            stamps.append(midnight + (low.bit_length() - 1) * 60)
+            bits ^= low
+        return stamps
+
+    @staticmethod
+    def _dstStamps(bits, date, tz):
+        '''timestamps of all set minutes of a day the clock changes, sorted and without repeats'''
+        stamps = set()
+        while bits:
+            low = bits & -bits
+            minute = low.bit_length() - 1
+            bits ^= low
+            # fold=0 is the first of two repeated times, and moves a skipped time forward
+            stamps.add(
+                datetime.datetime(date.year, date.month, date.day,
+                                  minute // 60, minute % 60,
+                                  tzinfo=tz).timestamp())
+        return sorted(stamps)
+
+
+class StartCalendarInterval(Pair):
+    '''Set StartCalendarInterval config
+
+    Usage:
+        pass a dictionary as setting into StartCalendarInterval, possible key words are Month, Day, Weekday, Hour, Minute. *Note the uppercase.*
+
+    For example::
+
+        # for simple config
+        schedule = StartCalendarInterval({'Day': 1, 'Month': 3}) # every March 1st
+
+        # for more straight forward syntax, use gen()
+        schedule.add(schedule.gen(day=1, month=3)) # every March 1st
+
+        # for a interval schedule, use genInterval()
+        schedule.add(schedule.genInterval(day=(1,15))) # from 1st to 15th every month
+
+        # for more complicated(corn-like) schedule, use genMix()
+        schedule.add(schedule.genMix(day=(1, 3, 5), month=(2,4)))
+
+        schedule.add(schedule.genMix(day=tuple(range(1, 10, 2))))
+        # 1st, 3rd, 5th, 7th, 9th every month
+
+        # big schedules don't need to be built as a list first
+        schedule.add(schedule.genInterval(hour=(0, 24), minute=(0, 60), lazy=True))
+
+        # like other add() method, StartCalendarInterval.add() can take multiple arguments or lists
+        schedule.add(schedule.gen(day=1), schedule.gen(day=15), [schedule.gen(month=12), schedule.gen(weekday=3)])
+
+
+
+    '''
+    __slots__ = ('l', )
+    keyWord = ['Month', 'Day', 'Weekday', 'Hour', 'Minute']
+
+    def __init__(self, *dic):
+        '''init
+
+        Args:
+            *dic (dict): dictionary with format {'Day': 12, 'Hour': 34} Avaliable keys are Month, Day, Weekday, Hour, Minute. *Note the uppercase.* You can use gen(), genMix() to generate complex config dictionary.
+        '''
+        super().__init__()
+        self.value = [ArraySingle()]
+        self.l = self.value[0].value
+        if dic:
+            self.add(*dic)
+
+    def add(self, *dic, compact=False):
+        '''add a config to StartCalendarInterval.
+
+        Every dict is checked with ``checkCalendarEntry()`` first, nothing is added if one of them is wrong.
+
+        Args:
+            *dic (dict): dictionary with format {'Day': 12, 'Hour': 34} Avaliable keys are Month, Day, Weekday, Hour, Minute. *Note the uppercase.* You can use gen(), genMix() to generate complex config dictionary.
+            compact (bool): run compact() after adding
+
+        Returns:
+            dict: the report of compact() if compact is True
+        '''
+        entries = []
+        for d in flatten(dic):
+            checkCalendarEntry(d)
+            entries.append(self._dictSingle(d))
+        self._add(entries, self.l)
+        if compact:
+            return self.compact()
+
+    def entries(self):
+        '''Returns:
+            list: the calendar configs as dicts, e.g. [{'Day': 12, 'Hour': 34}]
+        '''
+        return [{pair.key: pair.value[0].value[0]
+                 for pair in dictSingle.value} for dictSingle in self.l]
+
+    def compact(self):
+        '''Replace the calendar configs with the smallest equivalent set of configs, see ``compactCalendar()``.
+
+        For example::
+
+            schedule.add(schedule.genInterval(hour=(0, 24), minute=(0, 30)))
+            schedule.compact()
+            # 720 entries became 30, {'Minute': 0} to {'Minute': 29}
+
+        Returns:
+            dict: entry count and plist size in bytes before and after, e.g. {'entries': (720, 30), 'bytes': (95270, 2410)}
+        '''
+        before = self.entries()
+        beforeSize = len(self.printMe(self.key, self.value).encode())
+        after = compactCalendar(before)
+        if len(after) < len(before):
+            self.l[:] = [self._dictSingle(d) for d in after]
+            self.value[0].invalidate()
+            self.invalidate()
+        afterSize = len(self.printMe(self.key, self.value).encode())
+        return {
+            'entries': (len(before), len(self.l)),
+            'bytes': (beforeSize, afterSize)
+        }
+
+    def _dictSingle(self, d):
+        '''make a dict single (list of pairs) from a config dict'''
+        return DictSingle([Pair(k, internLeaf(IntegerSingle, d[k])) for k in d])
+
+    def remove(self, *dic):
+        '''remove a calendar config.
+
+        Args:
+            *dic (dict): dictionary with format {'Day': 12, 'Hour': 34} Avaliable keys are Month, Day, Weekday, Hour, Minute. *Note the uppercase.* You can use gen(), genMix() to generate complex config dictionary.
+
+        Returns:
+            int: the number of removed entries
+        '''
+        return self._remove([self._dictSingle(d) for d in flatten(dic)],
+                            self.l)
+
+    def contains(self, dic):
+        '''Check whether a calendar config is in the array. The order of keys doesn't matter.
+
+        Args:
+            dic (dict): dictionary with format {'Day': 12, 'Hour': 34}
+        '''
+        return structuralKey(self._dictSingle(dic)) in self.value[0]._membership()
+
+    def compile(self):
+        '''Compile the calendar configs for forecasting. Keep the result around if you ask a lot of questions,
+        it doesn't change when this config changes.
+
+        Returns:
+            CalendarSchedule: the compiled schedule
+        '''
+        return CalendarSchedule(self.entries())
+
+    def nextFireTimes(self, after, n=1):
+        '''Forecast when the job runs. See ``CalendarSchedule.nextFireTimes()``.
+
+        For example::
+
+            schedule = StartCalendarInterval({'Hour': 3, 'Minute': 30})
+            schedule.nextFireTimes(datetime.datetime(2024, 3, 9, 12, 0), 2)
+            # [datetime(2024, 3, 10, 3, 30), datetime(2024, 3, 11, 3, 30)]
+
+        Args:
+            after (datetime.datetime): the time to start from
+            n (int): how many fire times
+
+        Returns:
+            list: up to `n` datetimes
+        '''
+        return self.compile().nextFireTimes(after, n)
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from a dict or a list of dicts read from a plist. See ``Pair.fromValue()``.
+
+        A single dict is read as an array of one dict, which means the same to launchd.
+        '''
+        if isinstance(value, dict):
+            value = [value]
+        if not isinstance(value, list) or not all(
+                isinstance(d, dict) and all(
+                    isinstance(v, int) and not isinstance(v, bool)
+                    for v in d.values()) for d in value):
+            raise TypeError('{} expects dicts of integers'.format(
+                cls.__name__))
+        pair = cls()
+        pair.add(value)
+        if key:
+            pair.key = key
+        return pair
+
+    def gen(self, month=0, week=0, day=0, weekday=0, hour=0, minute=0):
+        '''generate config dictionary to pass to add() or remove()
+
+        Args:
+            month (int): month in a year, from 1 to 12
+            week (int): same as weekday, launchd has no week of the month. Kept for old code
+            day (int): day in a month, from 1 to 31
+            weekday (int): weekday in a week, from 0 to 7. 0 and 7 both represent Sunday
+            hour (int): hour in a day, from 0 to 24
+            minute (int): minute in an hour, from 0 to 59
+
+        Returns:
+            dict: a dictionary with form {'Day': 1, etc}
+        '''
+        # launchd has no week of the month, week is taken as weekday
+        dic = {
+            'Month': month,
+            'Day': day,
+            'Weekday': weekday or week,
+            'Hour': hour,
+            'Minute': minute
+        }
+        dic = {k: v for k, v in dic.items() if v != 0}
+        return dic
+
+    def genMix(self,
+               month=(),
+               day=(),
+               week=(),
+               weekday=(),
+               hour=(),
+               minute=(),
+               lazy=False):
+        '''Generate a list of config dictionarie(s), in form of [{'Day':12, 'Month':3}, {}, etc]
+        For example::
+
+            genMix(month=(1, 4, 6, 8), day=tuple(range(1, 30, 2)))
+            # Keep in mind that range(1, n) gives you (1, 2, ... , n-1)
+
+        Args:
+            month (tuple): month in a year, from 1 to 12
+            week (tuple): same as weekday, launchd has no week of the month. Kept for old code
+            day (tuple): day in a month, from 1 to 31
+            weekday (tuple): weekday in a week, from 0 to 7. 0 and 7 both represent Sunday
+            hour (tuple): hour in a day, from 0 to 24
+            minute (tuple): minute in an hour, from 0 to 59
+            lazy (bool): return a generator instead of a list, add() takes both
+
+        Returns:
+            list: a list of dictionarie(s) with form [{'Day':12, 'Month':3}, {}, etc]
+        '''
+        # launchd has no week of the month, week is taken as weekday
+        dic = {
+            'Month': month,
+            'Day': day,
+            'Weekday': weekday or week,
+            'Hour': hour,
+            'Minute': minute
+        }
+        dic = {k: v for k, v in dic.items() if v != ()}
+        grandList = []
+        for k in dic:
+            # e.g. 'Month'
+            l = []
+            for num in dic[k]:  # e.g. (q, 4, 6, 8)
+                l.append({k: num})  # e.g. {'Month': 4}
+            grandList.append(l)
+        if core._sink is not nullSink:
+            core._sink('generate', _generated(grandList))
+        if lazy:
+            return iterCrossCombine(grandList)
+        return crossCombine(grandList)
+
+    def genInterval(self,
+                    month=(),
+                    day=(),
+                    week=(),
+                    weekday=(),
+                    hour=(),
+                    minute=(),
+                    lazy=False):
+        '''Generate list of config dictionarie(s) that represent a interval of time. Used to be passed into add() or remove().
+        For example::
+
+            genInterval(month=(1,4), weekday=(1,6))
+            # generate list contains from Monday to Friday in from January to March
+
+        Args:
+            month (tuple): (start, end) month in a year, from 1 to 12
+            week (tuple): same as weekday, launchd has no week of the month. Kept for old code
+            day (tuple): (start, end) day in a month, from 1 to 31
+            weekday (tuple): (start, end) weekday in a week, from 0 to 7. 0 and 7 both represent Sunday
+            hour (tuple): (start, end) hour in a day, from 0 to 24
+            minute (tuple): (start, end) minute in an hour, from 0 to 59
+            lazy (bool): return a generator instead of a list, add() takes both
+
+        Returns:
+            list: a list of dictionarie(s) with form [{'Day':12, 'Month':3}, {}, etc]
+        '''
+        # launchd has no week of the month, week is taken as weekday
+        dic = {
+            'Month': month,
+            'Day': day,
+            'Weekday': weekday or week,
+            'Hour': hour,
+            'Minute': minute
+        }
+        dic = {k: v for k, v in dic.items() if v != ()}
+        # e.g. dic: {'month': (1,5), 'day': (2,4)}
+        grandList = []
+        for k in dic:
+            # e.g. k: 'month', dic[k]: (1,5)
+            l = []
+            # rangeTuple = (dic[k][0], dic[k][1] + 1)  # e.g. (1,6)
+            rangeTuple = dic[k]
+            for num in range(rangeTuple[0],
+                             rangeTuple[1]):  # e.g. 1, 2, 3, 4, 5
+                l.append({k: num})  # e.g. [{'month': 1}, {'month': 2}]
+            grandList.append(l)  # e.g. [[list of month], [list of day]]
+        if core._sink is not nullSink:
+            core._sink('generate', _generated(grandList))
+        # grandList: [[list of month], [list of day]]
+        # l: [[a,a1,a2,...], [b,b1,b2,...]]
+        # combineDict return: [{a,b}, {a,b1}, {a,b2}, {a1,b}, {a1,b1}, {a1, b2}, {a2,b}, {a2,b1}, {a2,b2}]
+        if lazy:
+            return iterCrossCombine(grandList)
+        return crossCombine(grandList)
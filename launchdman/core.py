@@ -0,0 +1,1578 @@
+'''The nodes of launchdman: Single, Pair and their families, and how they are rendered, compared and shared.'''
+import _thread
+import binascii
+import sys
+import weakref
+try:
+    # hashlib loads OpenSSL, which takes longer than everything else here
+    from _blake2 import blake2b
+except ImportError:
+    from hashlib import blake2b
+
+
+def checkKey(key, keyList):
+    if key not in keyList:
+        raise AttributeError('"{}" is not a valid key'.format(key))
+
+
+# config class -> its keyWord as a frozenset, made once, see allowedKeys()
+_keySets = {}
+
+
+def allowedKeys(cls):
+    '''The keys a config class allows(its ``keyWord``) as a frozenset, made the first time it's asked for.
+
+    Args:
+        cls (type): the config class
+
+    Returns:
+        frozenset: the allowed keys, or None if the class allows any key
+    '''
+    try:
+        return _keySets[cls]
+    except KeyError:
+        keyWord = getattr(cls, 'keyWord', None)
+        keys = _keySets[cls] = frozenset(
+            keyWord) if keyWord is not None else None
+        return keys
+
+
+def escapeText(text):
+    '''Escape &, < and > in text for XML, like ``xml.sax.saxutils.escape()``, which is slow to import.
+
+    Args:
+        text: the text of a tag or a key. Anything that is not a str(e.g. int) is returned as is
+
+    Returns:
+        the escaped text
+    '''
+    if text.__class__ is not str:
+        return text
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def indent(text, amount, ch=' '):
+    '''take test and indent every line by amount characters
+
+    Args:
+        text (str): The test to be indented
+        amount (int): The amount of indentation
+        ch (str): Default to be a space(' '). This is what to use when indenting the text.
+
+    Example:
+
+    >>> indent('Mary had a little lamb', 4, '$')
+    >>> '$$$$Mary had a little lamb'
+
+
+    Returns:
+        str: The indented text
+
+
+    '''
+    return indentLines(text, amount * ch)
+
+
+def indentLines(text, pad):
+    '''Prefix every non-blank line of text with pad.
+
+    Same as ``textwrap.indent(text, pad)``, but skips the work for the common case of an empty pad or a one-line text.
+    Used by the streaming serializer, which indents every chunk by its depth instead of re-indenting whole subtrees.
+
+    Args:
+        text (str): The text to be indented
+        pad (str): The prefix, usually ``depth * 4`` spaces
+
+    Returns:
+        str: The indented text
+    '''
+    if not pad:
+        return text
+    lines = text.splitlines(True)
+    if len(lines) == 1:
+        return pad + text if text.strip() else text
+    return ''.join(pad + line if line.strip() else line for line in lines)
+
+
+def flatten(l):
+    '''Flatten a multi-deminision list and return a iterable
+
+    Note that dict and str will not be expanded, instead, they will be kept as a single element.
+    It walks the list with a stack instead of recursion, so it doesn't care how deep the list is,
+    and it is lazy, so generators are only consumed as far as you go.
+
+    Args:
+        l (list): The list needs to be flattened
+
+    Returns:
+        A iterable of flattened list. To have a list instead use ``list(flatten(l))``
+    '''
+    stack = [iter(l)]
+    while stack:
+        for el in stack[-1]:
+            # I don;t want dict to be flattened
+            # iterable is checked like collections.abc.Iterable does, without importing collections
+            if getattr(el.__class__, '__iter__', None) is not None and not isinstance(
+                    el, (str, bytes)) and not isinstance(el, dict):
+                stack.append(iter(el))
+                break
+            yield el
+        else:
+            stack.pop()
+
+
+def ancestor(obj):
+    '''Trace the parent tree of the object and return the second last one.(under object)
+
+    Args:
+        obj (object): Literally anything.
+
+    Returns:
+        class: a class object
+    '''
+    return list(obj.__class__.__mro__)[-2]
+
+
+def ancestorJr(obj):
+    '''Trace the parent tree of the object and return the third last one.(under object and anothr parent)
+
+    Args:
+        obj (object): Literally anything.
+
+    Returns:
+        class: a class object
+    '''
+    return list(obj.__class__.__mro__)[-3]
+
+
+def singleOrPair(obj):
+    '''Chech an object is single or pair or neither.
+
+    Of course,, all pairs are single, so what the function is really detecting is whether an object is only single or at the same time a pair.
+    The answer only depends on the class of the object, so it is looked up once per class by ``dispatch()``.
+
+    Args:
+        obj (object): Literally anything.
+
+    Returns:
+        str: 'Single', or 'Pair', or 'Neither'
+    '''
+    return dispatch(obj.__class__)[0]
+
+
+# class -> emitter, filled by registerEmitter()
+_emitters = {}
+# class -> (kind, emitter), filled by dispatch()
+_dispatch = {}
+
+
+def registerEmitter(cls):
+    '''Register a function as the emitter of a class. Used as a decorator.
+
+    An emitter is what the serializer calls to write a node.
+    It is called as ``emitter(node, selfTag, selfValue, write, pad)``,
+    where ``selfTag`` is the key for pairs, and must pass the text of the node, indented by ``pad``, to ``write``.
+    The emitter is used for the class and all its subclasses that don't register their own.
+
+    Example::
+
+        @registerEmitter(CommentSingle)
+        def emitComment(node, selfTag, selfValue, write, pad):
+            write(indentLines('<!-- {} -->\n'.format(selfValue[0]), pad))
+
+    Args:
+        cls (class): Single or a subclass of it.
+    '''
+
+    def decorator(emitter):
+        _emitters[cls] = emitter
+        _dispatch.clear()
+        return emitter
+
+    return decorator
+
+
+def dispatch(cls):
+    '''Work out the kind and the emitter of a class, and cache them.
+
+    The kind is what ``singleOrPair()`` returns for instances of the class.
+    The emitter is the one registered for the closest class in the MRO.
+    If a class overrides ``printMe()`` closer than that, its ``printMe()`` is used instead, so that its output doesn't change.
+
+    Args:
+        cls (class): Literally any class.
+
+    Returns:
+        tuple: (kind, emitter). emitter is None if the class is not a Single.
+    '''
+    try:
+        return _dispatch[cls]
+    except KeyError:
+        pass
+    mro = cls.__mro__
+    if len(mro) <= 2:
+        kind = 'Neither'
+    # Pair check comes first for Pair is a subclass of Single
+    elif mro[-3] is Pair:
+        kind = 'Pair'
+    elif mro[-2] is Single:
+        kind = 'Single'
+    else:
+        kind = 'Neither'
+    emitter = None
+    if issubclass(cls, Single):
+        for klass in mro:
+            if klass in _emitters:
+                emitter = _emitters[klass]
+                break
+            if 'printMe' in klass.__dict__:
+                emitter = emitPrintMe
+                break
+    _dispatch[cls] = (kind, emitter)
+    return kind, emitter
+
+
+def emitPrintMe(node, selfTag, selfValue, write, pad):
+    '''Emitter for classes that override ``printMe()`` but don't register an emitter.'''
+    write(indentLines(node.printMe(selfTag, selfValue), pad))
+
+
+# the parents of a shared leaf, see internLeaf(). Shared leaves don't remember who uses them
+_noParents = ()
+
+# (class, tag or key) -> the first bytes hashed by Single.fingerprint(), the same few keys come up in every job
+_fingerprintHeaders = {}
+# (class, tag or key, fingerprint of a shared leaf) -> fingerprint of a single around just that leaf
+_sharedFingerprints = {}
+# keys and values of user dicts can be anything, so these stop growing at some point
+_fingerprintHeadersMax = 4096
+_sharedFingerprintsMax = 16384
+
+# [hits, misses] of the render cache, see renderCacheInfo()
+_renderCacheCounts = [0, 0]
+
+
+def renderCacheInfo():
+    '''How often the rendered text of a node was reused(hits) or had to be built(misses).
+
+    Every node keeps the text it rendered to last time until it, or something in it, changes.
+    Use this to check that re-rendering a job after a small change only rebuilds what changed.
+
+    Returns:
+        dict: {'hits': int, 'misses': int}
+    '''
+    return {'hits': _renderCacheCounts[0], 'misses': _renderCacheCounts[1]}
+
+
+def clearRenderCacheInfo():
+    '''Reset the counters of ``renderCacheInfo()`` to zero.'''
+    _renderCacheCounts[0] = _renderCacheCounts[1] = 0
+
+
+# Instrumentation
+
+
+def nullSink(event, fields):
+    '''The default sink, it does nothing. While it is the sink, the library doesn't time or count anything. See ``addSink()``.'''
+
+
+# where every event goes: nullSink, the only registered sink or a fan-out to all of them
+_sink = nullSink
+_sinks = []
+
+
+def _fanOut(event, fields):
+    for sink in _sinks:
+        sink(event, fields)
+
+
+def _pickSink():
+    global _sink
+    if not _sinks:
+        _sink = nullSink
+    elif len(_sinks) == 1:
+        _sink = _sinks[0]
+    else:
+        _sink = _fanOut
+
+
+def addSink(sink):
+    '''Register a function that gets the events of the library: phase timings and counters.
+
+    ``sink(event, fields)`` is called with the name of the event and a dict:
+
+    - ``'build'``: ``Job.fromDict()`` built a job. ns, keys
+    - ``'render'``: a job was rendered to text by ``printMe()``(so ``parse()``) or ``writeTo()``. ns, chars,
+      rendered and reused: the nodes that were rendered or came from the render cache, see ``renderCacheInfo()``.
+      Those two are counted for the whole process, so renders on other threads at the same time are in them too.
+    - ``'write'``: ``Job.write()`` or ``writeAll()`` wrote a job. ns, bytes, and skipped for ``writeAll()``: 1 if the file was the same
+    - ``'generate'``: ``genMix()`` or ``genInterval()`` made calendar entries. entries, and lists: the lists it combines
+    - ``'remove'``: ``remove()`` went through a list. compared, removed
+    - ``'launchctl'``: ``LaunchctlRunner`` called launchctl. verb, ns, attempt(0 for the first try), failed
+
+    Every event also has the job(its path) when there is one. Times are nanoseconds of ``time.perf_counter_ns()``.
+    The sink is called on the thread that does the work, e.g. the workers of ``writeAll()``.
+
+    Example::
+
+        stats = addSink(EventStats())
+        writeAll(jobs)
+        print(stats.totals['render'])
+        removeSink(stats)
+
+    Args:
+        sink (callable): called with (event, fields)
+
+    Returns:
+        the sink
+    '''
+    _sinks.append(sink)
+    _pickSink()
+    return sink
+
+
+def removeSink(sink):
+    '''Unregister a sink registered by ``addSink()``. When there is none left, ``nullSink`` is the sink again.'''
+    _sinks.remove(sink)
+    _pickSink()
+
+
+class EventStats():
+    '''A sink that adds up events: how many of each, and the sum of every number in their fields. See ``addSink()``.
+
+    Properties:
+        totals (dict): event -> {'count': int, field: sum, ...}, e.g. {'render': {'count': 2, 'ns': 81000, 'chars': 5120, ...}}
+    '''
+
+    def __init__(self):
+        self.totals = {}
+        # events come from the workers of writeAll() too
+        self._lock = _thread.allocate_lock()
+
+    def __call__(self, event, fields):
+        with self._lock:
+            total = self.totals.get(event)
+            if total is None:
+                total = self.totals[event] = {'count': 0}
+            total['count'] += 1
+            for name, value in fields.items():
+                if isinstance(value, (int, float)) and not isinstance(
+                        value, bool):
+                    total[name] = total.get(name, 0) + value
+
+    def __repr__(self):
+        return '<EventStats {}>'.format(self.totals)
+
+
+def linkParent(element, parent):
+    '''Remember(weakly) that element is inside parent, so that changing element drops the caches of parent.
+
+    Args:
+        element (Single): the child
+        parent (Single): the single that contains it
+    '''
+    parents = element._parents
+    if parents is _noParents:
+        return
+    if parents is None:
+        # one parent is the usual case, it is kept without a list around it
+        element._parents = weakref.ref(parent)
+    elif isinstance(parents, weakref.ref):
+        if parents() is not parent:
+            element._parents = [parents, weakref.ref(parent)]
+    elif not any(ref() is parent for ref in parents):
+        parents.append(weakref.ref(parent))
+
+
+def emitElements(selfValue, write, pad, others=True, parent=None):
+    '''Emit every element of a value list with the emitter of its class.
+
+    The text of every single is cached on it together with ``pad``,
+    and reused until ``Single.invalidate()`` is called on it or on anything inside it.
+    Shared leaves(see ``internLeaf()``) also keep their text without indentation, for jobs that indent them differently.
+    ``parent`` is remembered by every element so that invalidating an element also invalidates the parent.
+
+    Args:
+        selfValue (list): a list of value elements(single, subclasses, str, int)
+        write (callable): called with every chunk of text
+        pad (str): the indentation of the elements
+        others (bool): whether to print elements that are neither single nor pair with ``str()``
+        parent (Single): the single that contains the elements
+    '''
+    counts = _renderCacheCounts
+    for element in selfValue:
+        cls = element.__class__
+        try:
+            kind, emitter = _dispatch[cls]
+        except KeyError:
+            kind, emitter = dispatch(cls)
+        if kind == 'Neither':
+            if others:
+                write(indentLines(str(element) + '\n', pad))
+            continue
+        if parent is not None:
+            linkParent(element, parent)
+        fragment = element._fragment
+        if fragment is not None and fragment[0] == pad:
+            counts[0] += 1
+            write(fragment[1])
+            continue
+        shared = element._parents is _noParents
+        if shared and fragment is not None:
+            # (pad, text, text without indentation), the last pad is kept for the next job
+            counts[0] += 1
+            text = indentLines(fragment[2], pad)
+            element._fragment = (pad, text, fragment[2])
+            write(text)
+            continue
+        counts[1] += 1
+        buffer = []
+        if shared:
+            emitter(element, element.tag, element.value, buffer.append, '')
+            base = ''.join(buffer)
+            text = indentLines(base, pad)
+            element._fragment = (pad, text, base)
+            write(text)
+            continue
+        if kind == 'Single':
+            emitter(element, element.tag, element.value, buffer.append, pad)
+        else:
+            emitter(element, element.key, element.value, buffer.append, pad)
+        text = ''.join(buffer)
+        # a printMe() override may depend on anything, don't cache it
+        if emitter is not emitPrintMe:
+            element._fragment = (pad, text)
+        write(text)
+
+
+def removeEverything(toBeRemoved, l):
+    '''Remove every instance that matches the input from a list
+
+    Match with ==, operation, which can be defined in __eq__.
+    The list is filtered in one pass.
+
+    Args:
+        tobeRemoved (object): the same object you want to remove from the list.
+        l (list): the llist you want to remove stuff from.
+    '''
+
+    def matches(element):
+        try:
+            return element is toBeRemoved or element == toBeRemoved
+        except Exception:
+            return False
+
+    l[:] = [element for element in l if not matches(element)]
+
+
+def structuralKey(value):
+    '''Return a hashable key of a value element, equal for elements with the same structure.
+
+    For a single the key is its fingerprint, see ``Single.fingerprint()``.
+    Other values(str, int) are keyed by their type and themselves.
+
+    Args:
+        value: single, str, int. Any thing that can be in single.value
+
+    Returns:
+        the key
+    '''
+    if isinstance(value, Single):
+        return value.fingerprint()
+    try:
+        hash(value)
+    except TypeError:
+        return (value.__class__, repr(value))
+    return (value.__class__, value)
+
+
+# class -> names of the slots to copy and pickle, filled by _slotNames()
+_slots = {}
+
+
+def _slotNames(cls, cached=False):
+    '''Names in __slots__ of a class and its bases.
+
+    Args:
+        cached (bool): the names of the cache slots instead of the others
+    '''
+    names = _slots.get(cls)
+    if names is None:
+        names = [
+            name for klass in cls.__mro__
+            for name in klass.__dict__.get('__slots__', ())
+            if name != '__weakref__'
+        ]
+        names = _slots[cls] = ([n for n in names if n not in _cacheSlots],
+                               [n for n in names if n in _cacheSlots])
+    return names[1] if cached else names[0]
+
+
+# slots that are not copied or pickled
+_cacheSlots = ('_fragment', '_parents', '_index', '_fingerprint')
+
+
+class Single():
+    '''
+    A type of structure that only have a tag and it's values.
+    It is parsed sush as ::
+
+        <tag>value</tag> # for on value element and
+
+        <tag>
+            value1
+            value2
+        </tag> # for multiple value element
+
+    Overwrite ``printMe(tag, value)`` if subclass parse differently from Single.
+
+    Properties:
+        tag (string): the tag
+        value (list): A list of values. element can be Single and any subclass of it, string, integer. Other data type might be possible, but not used in launchd files.
+    '''
+    # every single has its own storage, see __new__()
+    __slots__ = (
+        'tag',
+        'value',
+        # (pad, text) rendered last time, see emitElements()
+        '_fragment',
+        # weak reference(s) to the singles this single was rendered in, see linkParent()
+        '_parents',
+        # [value list, structural key -> count, length], see _membership()
+        '_index',
+        # digest of the structure, see fingerprint()
+        '_fingerprint',
+        '__weakref__')
+
+    def __new__(cls, *args, **kwargs):
+        # defaults are set here instead of on the class, so no two singles share a value list,
+        # even if __init__ of a subclass doesn't set one
+        self = object.__new__(cls)
+        self.tag = ''
+        self.value = []
+        self._fragment = None
+        self._parents = None
+        self._index = None
+        self._fingerprint = None
+        return self
+
+    def __eq__(self, other):
+        if not isinstance(other, Single):
+            return NotImplemented
+        return self is other or self.fingerprint() == other.fingerprint()
+
+    def __hash__(self):
+        # don't change a single while it is a key of a dict or in a set
+        return hash(self.fingerprint())
+
+    def fingerprint(self):
+        '''Return a digest of the structure of this single: its class, tag(or key for pairs) and values as printed, recursively.
+
+        Two singles with the same fingerprint print the same, except that the order of the pairs in a DictSingle doesn't matter, as in a plist dict.
+        The digest is the same in every process, so it can be stored.
+        It is computed once and cached until this single, or anything inside it, changes.
+        ``==`` and ``hash()`` are based on it.
+
+        Returns:
+            bytes: a 16 bytes digest
+        '''
+        fingerprint = self._fingerprint
+        if fingerprint is not None:
+            return fingerprint
+        name = self.key if isinstance(self, Pair) else self.tag
+        header = _fingerprintHeaders.get((self.__class__, name))
+        if header is None:
+            header = '{}\0{}'.format(self.__class__.__qualname__,
+                                     name).encode('utf-8', 'surrogatepass')
+            if len(_fingerprintHeaders) < _fingerprintHeadersMax:
+                _fingerprintHeaders[(self.__class__, name)] = header
+        value = self.value
+        if len(value) == 1 and isinstance(
+                value[0], Single) and value[0]._parents is _noParents:
+            # a pair around a shared leaf, e.g. <key>Hour</key><integer>3</integer>, is in thousands of jobs
+            memoKey = (self.__class__, name, value[0].fingerprint())
+            fingerprint = _sharedFingerprints.get(memoKey)
+            if fingerprint is not None:
+                self._fingerprint = fingerprint
+                return fingerprint
+        else:
+            memoKey = None
+        parts = [header]
+        children = []
+        for element in value:
+            if isinstance(element, Single):
+                if element._parents is not _noParents:
+                    linkParent(element, self)
+                children.append(element.fingerprint())
+            else:
+                # a raw value counts as it is printed, so StringSingle(2) == StringSingle('2')
+                children.append(
+                    escapeText(str(element)).encode('utf-8', 'surrogatepass'))
+        if isinstance(self, DictSingle):
+            children.sort()
+        for child in children:
+            # length prefixed, so that different values can't join into the same bytes
+            parts.append(len(child).to_bytes(4, 'little'))
+            parts.append(child)
+        fingerprint = self._fingerprint = blake2b(
+            b''.join(parts), digest_size=16).digest()
+        if memoKey is not None and len(
+                _sharedFingerprints) < _sharedFingerprintsMax:
+            _sharedFingerprints[memoKey] = fingerprint
+        return fingerprint
+
+    def __init__(self, tag, *value):
+        '''init
+
+        Args:
+            tag (str): The tag1
+            *value: the elements you want to put into single's value(list), can be one element or several seperate by comma, or put into a list or combination of those. *value will be flattend to a single one deminision list. In subclasses' init, raw data should be converted to single if needed according to specific subclass.'''
+        self.tag = tag
+        # copy() gives a list of the exact size, a list built from a generator has room to grow
+        self.value = list(flatten(value)).copy()
+
+    def __getstate__(self):
+        # the render cache is not copied or pickled, weak references can't be
+        state = {
+            name: getattr(self, name)
+            for name in _slotNames(self.__class__) if hasattr(self, name)
+        }
+        # subclasses without __slots__ have a __dict__
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def sizeof(self, caches=True, detail=False):
+        '''Measure the memory of this single and everything inside it, like ``sys.getsizeof()`` but deep.
+
+        Singles, value lists and values are counted, objects that show up more than once are counted once.
+
+        Args:
+            caches (bool): count the render cache, fingerprints and membership indexes too
+            detail (bool): return the bytes per class instead of the total
+
+        Returns:
+            int: bytes, or with `detail`, a dict of class name -> [count, bytes]. Caches are under 'caches'.
+        '''
+        seen = set()
+        report = {}
+
+        def count(obj, name):
+            if id(obj) in seen:
+                return
+            seen.add(id(obj))
+            entry = report.setdefault(name, [0, 0])
+            entry[0] += 1
+            entry[1] += sys.getsizeof(obj)
+
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            count(node, node.__class__.__name__)
+            attributes = [
+                getattr(node, name, None)
+                for name in _slotNames(node.__class__) if name != 'value'
+            ]
+            if hasattr(node, '__dict__'):
+                count(node.__dict__, 'attributes')
+                attributes.extend(node.__dict__.values())
+            for value in attributes:
+                # classes(e.g. OuterOFInnerPair.Inner) are not part of the single
+                if not isinstance(value, type):
+                    count(value, 'attributes')
+            count(node.value, 'list')
+            for element in node.value:
+                if isinstance(element, Single):
+                    stack.append(element)
+                else:
+                    count(element, element.__class__.__name__)
+            if caches:
+                for cache in (node._fragment, node._parents, node._index,
+                              node._fingerprint):
+                    if cache is None:
+                        continue
+                    count(cache, 'caches')
+                    parts = cache if isinstance(cache,
+                                                (tuple, list)) else ()
+                    for part in parts:
+                        count(part, 'caches')
+                        if isinstance(part, dict):
+                            for item in part.items():
+                                for obj in item:
+                                    count(obj, 'caches')
+        # None, True and small ints are shared by everybody
+        report.pop('NoneType', None)
+        if detail:
+            return report
+        return sum(size for _, size in report.values())
+
+    def invalidate(self, deep=False):
+        '''Drop the cached text of this single and of every single that contains it.
+
+        Methods that change a single(``add()``, ``remove()``, ``changeTo()``...) call this already.
+        Call it yourself after changing ``value`` directly, it also drops the fingerprint and the membership index of this single.
+
+        Args:
+            deep (bool): also drop the cached text, fingerprint and index of everything inside this single
+        '''
+        self._index = None
+        if deep:
+            for element in self.findAllSingle(self.value):
+                element._fragment = None
+                element._fingerprint = None
+                element._index = None
+        self._dropCaches()
+
+    def _dropCaches(self):
+        '''Drop the cached text and fingerprint of self and its ancestors.
+
+        The ancestors also drop their membership index, which is keyed by the fingerprints of their values.
+        '''
+        self._fragment = None
+        self._fingerprint = None
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            parents = node._parents
+            if parents is not None:
+                if isinstance(parents, weakref.ref):
+                    parents = (parents, )
+                for ref in parents:
+                    parent = ref()
+                    if parent is not None:
+                        parent._fragment = None
+                        parent._fingerprint = None
+                        parent._index = None
+                        stack.append(parent)
+
+    def _owner(self, selfValue):
+        '''Return the single whose value is selfValue: self, a direct child(e.g. the ArraySingle of a pair) or None.'''
+        if selfValue is self.value:
+            return self
+        for element in self.value:
+            if isinstance(element, Single) and element.value is selfValue:
+                return element
+        return None
+
+    def _touch(self, selfValue):
+        '''Drop the caches of self, and of the child that owns selfValue if it is not self.value.'''
+        owner = self._owner(selfValue)
+        if owner is not None and owner is not self:
+            owner._dropCaches()
+        self._dropCaches()
+
+    def _membership(self):
+        '''Return the membership index of self.value: structural key -> count.
+
+        The index is built on first use and kept up to date by ``_add()`` and ``_remove()``.
+        It is rebuilt if value was replaced or changed length behind their back.
+        '''
+        index = self._index
+        if index is None or index[0] is not self.value or index[2] != len(
+                self.value):
+            counts = {}
+            for element in self.value:
+                if isinstance(element, Single):
+                    linkParent(element, self)
+                key = structuralKey(element)
+                counts[key] = counts.get(key, 0) + 1
+            index = self._index = [self.value, counts, len(self.value)]
+        return index[1]
+
+    def contains(self, value):
+        '''Check whether an element with the same structure as value is in self.value. See ``structuralKey()``.
+
+        Subclasses that convert raw values in ``add()`` convert them here the same way,
+        e.g. ``ProgramArguments('-r').contains('-r')``.
+        Lookups go through a hash index, so they don't scan the list.
+
+        Args:
+            value: the element to look for
+
+        Returns:
+            bool: True if found
+        '''
+        return structuralKey(value) in self._membership()
+
+    def __contains__(self, value):
+        return self.contains(value)
+
+    def parse(self):
+        '''A wrap of PrintMe, which parse the single and its value and returns a str. In most cases, this is the method you need to use.'''
+        return self.printMe(self.tag, self.value)
+
+    def printMe(self, selfTag, selfValue):
+        '''Parse the single and its value and return the parsed str.
+
+        Args:
+           selfTag (str): The tag. Normally just ``self.tag``
+           selfValue (list): a list of value elements(single, subclasses, str, int). Normally just ``self.value``
+
+        Returns:
+            str: A parsed text
+        '''
+        buffer = []
+        emitSingle(self, selfTag, selfValue, buffer.append, '')
+        return ''.join(buffer)
+
+    def streamMe(self, selfTag, selfValue, write, pad=''):
+        '''Parse the single and its value and pass the text to ``write`` chunk by chunk.
+
+        The output is the same as ``printMe()``, but the tree is walked only once:
+        instead of indenting the text of every subtree again at each level,
+        the current indentation is passed down as ``pad``.
+        The work is done by the emitter registered for the class, see ``registerEmitter()``.
+
+        Args:
+           selfTag (str): The tag. Normally just ``self.tag``, or ``self.key`` for pairs
+           selfValue (list): a list of value elements(single, subclasses, str, int). Normally just ``self.value``
+           write (callable): called with every chunk of text, e.g. ``stream.write`` or ``list.append``
+           pad (str): the indentation of this single
+        '''
+        dispatch(self.__class__)[1](self, selfTag, selfValue, write, pad)
+
+    def findAll(self, selfValue):
+        '''Looks for all the non single values(str, int) *recursively* and returns a list of them
+
+        Args:
+            selfValue: A list of single, str, int. Normally just ``self.value``
+
+        Returns:
+            list: A list contains only non singles(str, int).
+        '''
+        resultList = []
+        for element in selfValue:
+            if isinstance(element, Single):
+                resultList += element.findAll(element.value)
+            else:
+                resultList.append(element)
+        return resultList
+
+    def findAllSingle(self, selfValue):
+        '''Looks for all the single values and subclasses *recursively* and returns a list of them
+
+        Args:
+            selfValue: A list of single, str, int. Normally just ``self.value``
+
+        Returns:
+            list: A list contains only singles and subclasses.
+        '''
+        resultList = []
+        for element in selfValue:
+            if isinstance(element, Single):
+                resultList.append(element)
+                resultList += element.findAllSingle(element.value)
+        return resultList
+
+    def _add(self, value, selfValue):
+        '''Add a element to a list. Used inside add() method.
+
+        Subclass are responsible of creating whatever single instance it need
+        from its add(*value) and call _add() with it.
+
+        Args:
+            value: single, str, int. Any thing that can be in single.value
+            self.Value (list): the list to add into.
+
+        Raises:
+            TypeError: if self is a shared leaf, see ``internLeaf()``
+        '''
+        self._checkMutable()
+        selfValue += value
+        owner = self._owner(selfValue)
+        if owner is not None and owner._index is not None and owner._index[
+                0] is selfValue:
+            counts = owner._index[1]
+            for element in value:
+                if isinstance(element, Single):
+                    # the index is keyed by the fingerprint of element, changing element has to drop it
+                    linkParent(element, owner)
+                key = structuralKey(element)
+                counts[key] = counts.get(key, 0) + 1
+            owner._index[2] = len(selfValue)
+        self._touch(selfValue)
+        return (value)
+
+    def add(self, *value):
+        '''convert value and add to self.value
+
+        Subclass must overwrite this method.
+        Subclass are responsible of creating whatever single instance it need from its ``add(*value)`` and call ``_add()`` to add them to ``self.value``
+
+        Args:
+            *value: the value to be added
+        '''
+        flattenedValueList = list(flatten(value))
+        return self._add(flattenedValueList, self.value)
+
+    def _remove(self, removeList, selfValue):
+        '''Remove elements from a list by matching the elements in the other list.
+
+        This method only looks inside current instance's value, not recursive.
+        There is no need for a recursive one anyway.
+        Match by structure, see ``structuralKey()``. Every element matching any element of removeList is removed,
+        in one pass over selfValue. If selfValue belongs to self or a direct child,
+        its hash index answers first whether there is anything to remove at all.
+
+        Args:
+            removeList (list): The list of matching elements.
+            selfValue (list): The list you remove value from. Usually ``self.value``
+
+        Raises:
+            TypeError: if self is a shared leaf, see ``internLeaf()``
+
+        Returns:
+            int: the number of removed elements
+        '''
+        self._checkMutable()
+        removeKeys = {structuralKey(removeValue) for removeValue in removeList}
+        owner = self._owner(selfValue)
+        index = None
+        if owner is not None:
+            counts = owner._membership()
+            removeKeys = {key for key in removeKeys if key in counts}
+            index = owner._index
+        if not removeKeys:
+            if _sink is not nullSink:
+                _sink('remove', {'compared': 0, 'removed': 0})
+            return 0
+        kept = [
+            element for element in selfValue
+            if structuralKey(element) not in removeKeys
+        ]
+        removed = len(selfValue) - len(kept)
+        if _sink is not nullSink:
+            _sink('remove', {'compared': len(selfValue), 'removed': removed})
+        selfValue[:] = kept
+        if index is not None:
+            for key in removeKeys:
+                index[1].pop(key, None)
+            index[2] = len(selfValue)
+        self._touch(selfValue)
+        return removed
+
+    def remove(self, *l):
+        ''' remove elements from self.value by matching.
+
+        Create the exactly same single you want to delete and pass it(them) in.
+        Normally this method needs to be overwrited by subclass. It only looks inside current instance's value, not recursive. There is no need for a recursive one anyway.
+
+        Args:
+            *l: a single element, a bunch of element seperated by comma, or a list of elements, or any combination. Element is what you match with.
+
+        Returns:
+            int: the number of removed elements
+        '''
+        removeList = list(flatten(l))
+        return self._remove(removeList, self.value)
+
+    def removeMany(self, values):
+        '''Remove every element that matches any of values, like a set difference. The order of what is left is kept.
+
+        Takes the same values as ``remove()`` and does the whole removal in one pass.
+
+        Args:
+            values (list): the elements to match with
+
+        Returns:
+            int: the number of removed elements
+        '''
+        return self.remove(values)
+
+    def clear(self):
+        '''Remove everything in a Single'''
+        self._checkMutable()
+        self.value = []
+        self.invalidate()
+
+    def _checkMutable(self):
+        '''Raise TypeError if self is a shared leaf, which is used by other jobs too. See ``internLeaf()``.'''
+        if self._parents is _noParents:
+            raise TypeError(
+                'shared {} can not be changed, put in another one instead'.
+                format(self.__class__.__name__))
+
+
+@registerEmitter(Single)
+def emitSingle(node, selfTag, selfValue, write, pad):
+    '''Emitter of Single, see ``Single.streamMe()``.'''
+    if len(selfValue) == 0:
+        return
+    # if value have only one element and it is not another single
+    # print differently
+    elif len(selfValue) == 1 and not selfValue[0].__class__.__mro__[-2] is Single:
+        write(
+            indentLines('<{tag}>{value}</{tag}>\n'.format(
+                tag=selfTag, value=escapeText(selfValue[0])), pad))
+    else:
+        write(indentLines('<{tag}>\n'.format(tag=selfTag), pad))
+        emitElements(selfValue, write, pad + '    ', parent=node)
+        write(indentLines('</{tag}>\n'.format(tag=selfTag), pad))
+
+
+class BoolSingle(Single):
+    '''A type of Single that only have a single tag that usually indicate true of false.
+
+    Example::
+
+        </true>
+        <false>
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, boolValue):
+        '''init
+
+        Args:
+            bollValue (str): The boolean value of the single. It can be either ``'true'`` or ``'false'``
+        '''
+        self.value = [boolValue]
+
+    def printMe(self, selfTag='', selfValue='true'):
+        text = '<{value}/>\n'.format(value=selfValue[0])
+        return text
+
+
+@registerEmitter(BoolSingle)
+def emitBoolSingle(node, selfTag, selfValue, write, pad):
+    '''Emitter of BoolSingle'''
+    write(indentLines('<{value}/>\n'.format(value=selfValue[0]), pad))
+
+
+class TypedSingle(Single):
+    '''A little sugar so that you don't need to type the tag every time creating a specific single.
+    This class is meant to be inheritated by specific type single classes such as arraySingle and StringSingle. The class name of subclass will become the tag. For example::
+
+        ArraySingle.tag -> 'array'
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, *value):
+        '''init
+
+        set self.tag to classname. e.g.::
+
+            ArraySingle.tag -> 'array'
+
+        Args:
+            *value: the elements you want to put into single's value(list), can be one element or several seperate by comma, or put into a list or combination of those. *value will be flattend to a single one deminision list. In subclasses' init, raw data should be converted to single if needed according to specific subclass.'''
+        # one tag string per class, not one per single
+        tag = sys.intern(self.__class__.__name__.replace('Single', '').lower())
+        super().__init__(tag, value)
+
+
+class StringSingle(TypedSingle):
+    '''Single with default tag as 'string'.'''
+    __slots__ = ()
+
+
+class ArraySingle(TypedSingle):
+    '''Single with default tag as 'array'.'''
+    __slots__ = ()
+
+
+class DictSingle(TypedSingle):
+    '''Single with default tag as 'dict'.'''
+    __slots__ = ()
+
+
+class IntegerSingle(TypedSingle):
+    '''Single with default tag as 'integer'.'''
+    __slots__ = ()
+
+
+class RealSingle(TypedSingle):
+    '''Single with default tag as 'real'.'''
+    __slots__ = ()
+
+
+class DateSingle(TypedSingle):
+    '''Single with default tag as 'date'. The value is the date as plist text, e.g. '2017-10-01T11:20:16Z'.'''
+    __slots__ = ()
+
+
+class DataSingle(TypedSingle):
+    '''Single with default tag as 'data'. The value is the base64 text.'''
+    __slots__ = ()
+
+
+# (class, type of value, value) -> shared leaf, see internLeaf()
+_leaves = weakref.WeakValueDictionary()
+
+
+def internLeaf(cls, value):
+    '''Return the shared leaf of a class and a value, e.g. ``internLeaf(StringSingle, '/bin/sh')``.
+
+    Config classes build their strings, integers and bools with this,
+    so a thousand jobs with the same Program share one StringSingle, and its text is rendered once for all of them.
+    A shared leaf can't be changed: ``add()``, ``remove()`` and ``clear()`` raise TypeError,
+    and methods like ``changeTo()`` put in another leaf instead of changing the old one.
+    Leaves are only kept while something uses them.
+
+    Args:
+        cls (class): BoolSingle, StringSingle, IntegerSingle or another leaf class
+        value: the value of the leaf, ``'true'`` or ``'false'`` for BoolSingle
+
+    Returns:
+        Single: the shared leaf
+    '''
+    # 1 and '1' print the same, but are different leaves
+    key = (cls, value.__class__, value)
+    try:
+        leaf = _leaves.get(key)
+    except TypeError:
+        # unhashable values get a leaf of their own
+        return cls(value)
+    if leaf is None:
+        leaf = cls(value)
+        leaf._parents = _noParents
+        _leaves[key] = leaf
+    return leaf
+
+
+class Pair(Single):
+    '''A data type that have a key and it's value.
+    For example::
+
+        <key>some_key</key> # some_key is the key
+        <array> # array is the value
+            <string>something</string>
+        </array>
+    '''
+    __slots__ = ('key', )
+
+    def __init__(self, key='', *value):
+        '''init
+
+        Args:
+            key (str): the key
+            *value: the value to be stored
+        '''
+        if key == '':
+            self.key = self.__class__.__name__
+        else:
+            self.key = key
+        if len(value) != 0:
+            self.value = list(flatten(value)).copy()
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build a pair from a value read from a plist.
+
+        Config classes override this to build themselves, this one builds a generic pair
+        whose value is made by ``nodeFromValue()``.
+
+        Args:
+            value: str, int, float, bool, list, dict, datetime or bytes, as returned by ``loadPlist()``
+            key (str): the key. Default to the class name.
+
+        Raises:
+            TypeError: if the value doesn't fit the class
+
+        Returns:
+            Pair: the pair
+        '''
+        return Pair(key or cls.__name__, nodeFromValue(value))
+
+    def parse(self):
+        '''parse the pair in plist format.
+        A wrapper of printMe().
+
+        Returns:
+            str: the parsed text
+           '''
+        return self.printMe(self.key, self.value)
+
+    def printMe(self, selfKey, selfValue):
+        '''Parse the single and its value and return the parsed str.
+
+        Args:
+           selfTag (str): The tag. Normally just ``self.tag``
+           selfValue (list): a list of value elements(single, subclasses, str, int). Normally just ``self.value``
+
+        Returns:
+            str: A parsed text
+        '''
+        buffer = []
+        emitPair(self, selfKey, selfValue, buffer.append, '')
+        return ''.join(buffer)
+
+
+@registerEmitter(Pair)
+def emitPair(node, selfKey, selfValue, write, pad):
+    '''Emitter of Pair: the key, then its values on the same level.'''
+    if len(selfValue) == 0:
+        return
+    write(
+        indentLines('<key>{keyName}</key>\n'.format(
+            keyName=escapeText(selfKey)), pad))
+    # elements that are neither single nor pair are not printed
+    emitElements(selfValue, write, pad, others=False, parent=node)
+
+
+class SingleStringPair(Pair):
+    '''Pair that conntains only a string in its value.
+
+    Since there is only a single element in value. ``add()`` and ``remove()`` is not needed.
+    Instead there is a ``changTo()`` method.
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, string):
+        '''init
+
+        Args:
+            string (str): The string you want the value element to be
+        '''
+        super().__init__()
+        self.changeTo(string)
+
+    def changeTo(self, newString):
+        '''This method change the value element of the Pair.
+
+        Args:
+            newString (str): The string you want to change to
+        '''
+        self.value = [internLeaf(StringSingle, newString)]
+        self.invalidate()
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from a str read from a plist. See ``Pair.fromValue()``.'''
+        if not isinstance(value, str):
+            raise TypeError('{} expects a string'.format(cls.__name__))
+        pair = cls(value)
+        if key:
+            pair.key = key
+        return pair
+
+
+class SingleIntegerPair(Pair):
+    '''The Pair that contains only a integer.
+
+    Since there is only a single element in value. ``add()`` and ``remove()`` is not needed.
+    Instead there is a ``changTo()`` method.
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, integer):
+        super().__init__()
+        self.changeTo(integer)
+
+    def changeTo(self, newInt):
+        '''This method change the value element of the Pair.
+
+        Args:
+            newInt (int): The integer you want to change to
+        '''
+        self.value = [internLeaf(IntegerSingle, newInt)]
+        self.invalidate()
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from an int read from a plist. See ``Pair.fromValue()``.'''
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError('{} expects an integer'.format(cls.__name__))
+        pair = cls(value)
+        if key:
+            pair.key = key
+        return pair
+
+
+class OuterOFInnerPair(Pair):
+    '''A "double layer" Pair.
+    e.g.: array of string, dict of pair, array of bool
+    Outer can be: ArraySingle, DictSingle
+    Inner can be: Pair, StringSingle, IntegerSingle, BoolPair
+    '''
+
+    __slots__ = ('l', 'Outer', 'Inner')
+
+    def __init__(self, Outer, Inner, *l):
+        '''init
+
+        Args:
+            Outer (class): One of the possible outer classes.
+            Inner (class): One of the possible inner classes.
+            *l: To be processed and set to value
+        '''
+        super().__init__()
+        self.value = [Outer()]
+        self.l = self.value[0].value
+        self.Outer = Outer
+        self.Inner = Inner
+        self.add(l)
+
+    def _inner(self, a):
+        '''Build an Inner from a, strings and integers are shared leaves(see ``internLeaf()``).'''
+        if self.Inner in (StringSingle, IntegerSingle):
+            return internLeaf(self.Inner, a)
+        return self.Inner(a)
+
+    def add(self, *l):
+        '''add inner to outer
+
+        Args:
+            *l: element that is passed into Inner init
+        '''
+        for a in flatten(l):
+            self._add([self._inner(a)], self.l)
+
+    def remove(self, *l):
+        '''remove inner from outer
+
+        Args:
+            *l element that is passes into Inner init
+
+        Returns:
+            int: the number of removed elements
+        '''
+        return self._remove([self._inner(a) for a in flatten(l)], self.l)
+
+    def contains(self, a):
+        '''Check whether Inner(a) is in outer. See ``Single.contains()``.
+
+        Args:
+            a: element that is passed into Inner init
+        '''
+        return structuralKey(self._inner(a)) in self.value[0]._membership()
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from a value read from a plist. See ``Pair.fromValue()``.
+
+        A list of strings if Inner is StringSingle, a dict of bools if Inner is BoolPair.
+        '''
+        pair = cls()
+        if pair.Inner is BoolPair:
+            if not isinstance(value, dict) or not all(
+                    isinstance(flag, bool) for flag in value.values()):
+                raise TypeError('{} expects a dict of bools'.format(
+                    cls.__name__))
+            inners = []
+            for name, flag in value.items():
+                inner = BoolPair(name)
+                if not flag:
+                    inner.setToFalse()
+                inners.append(inner)
+        else:
+            if not isinstance(value, list) or not all(
+                    isinstance(a, str) for a in value):
+                raise TypeError('{} expects a list of strings'.format(
+                    cls.__name__))
+            inners = [pair._inner(a) for a in value]
+        pair._add(inners, pair.l)
+        if key:
+            pair.key = key
+        return pair
+
+
+class BoolPair(Pair):
+    '''A special type of pair that contains it's key and only one tag, usually </true> or </false>.'''
+
+    __slots__ = ()
+
+    def __init__(self, key=''):
+        '''init
+
+        set value to true
+
+        Args:
+        key (str): either 'true' or 'false'
+        '''
+        super().__init__(key)
+        self.setToTrue()
+
+    def setToTrue(self):
+        '''This method sets the value of key true.'''
+        self.value = [internLeaf(BoolSingle, 'true')]
+        self.invalidate()
+
+    def setToFalse(self):
+        '''Might be needed, set value to false.'''
+        self.value = [internLeaf(BoolSingle, 'false')]
+        self.invalidate()
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from a bool read from a plist. See ``Pair.fromValue()``.'''
+        if not isinstance(value, bool):
+            raise TypeError('{} expects a bool'.format(cls.__name__))
+        pair = cls()
+        if not value:
+            pair.setToFalse()
+        if key:
+            pair.key = key
+        return pair
+
+    def add(self):
+        pass
+
+    def remove(self):
+        pass
+
+    def _add(self):
+        pass
+
+    def _remove(self):
+        pass
+
+
+class SingleDictPair(Pair):
+    '''Pair that contains one DictSingle(which contains pairs) in its value.'''
+
+    __slots__ = ('d', )
+    # the keys a subclass allows, None allows any
+    keyWord = None
+
+    def __init__(self, dic):
+        '''init
+
+        Args:
+            dic (dict): key and value
+        '''
+        super().__init__()
+        self.value = [DictSingle()]
+        self.d = self.value[0].value
+        self.add(dic)
+
+    def add(self, dic):
+        '''adds a dict as pair
+
+        Values are built by ``nodeFromValue()``, so an int is an <integer> as in the plist and ``Job.fromDict()``.
+
+        Args:
+            dic (dict): key and value
+        '''
+        allowed = allowedKeys(self.__class__)
+        for kw in dic:
+            if allowed is not None:
+                checkKey(kw, allowed)
+            self._add([Pair(kw, nodeFromValue(dic[kw]))], self.d)
+
+    def remove(self, dic):
+        '''remove the pair by passing a identical dict
+
+        Args:
+            dic (dict): key and value
+        '''
+        return self._remove([Pair(kw, nodeFromValue(dic[kw])) for kw in dic],
+                            self.d)
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from a dict read from a plist. See ``Pair.fromValue()``.
+
+        Values keep the type they have in the plist, keys are not checked.
+        '''
+        if not isinstance(value, dict):
+            raise TypeError('{} expects a dict'.format(cls.__name__))
+        pair = cls({})
+        pair._add([Pair(k, nodeFromValue(v)) for k, v in value.items()],
+                  pair.d)
+        if key:
+            pair.key = key
+        return pair
+
+
+# Plain values, as plistlib and loadPlist() give them
+
+
+def nodeFromValue(value):
+    '''Build the single for a value read from a plist, without any config class.
+
+    Example::
+
+        nodeFromValue({'PATH': '/bin'}) # DictSingle(Pair('PATH', StringSingle('/bin')))
+
+    Args:
+        value: str, int, float, bool, list, dict, datetime or bytes. A single is returned as it is.
+
+    Raises:
+        TypeError: if the value can't be in a plist
+
+    Returns:
+        Single: a BoolSingle, or TypedSingle and its subclasses
+    '''
+    if isinstance(value, Single):
+        return value
+    # bool check comes first for bool is a subclass of int
+    elif isinstance(value, bool):
+        return internLeaf(BoolSingle, 'true' if value else 'false')
+    elif isinstance(value, int):
+        return internLeaf(IntegerSingle, value)
+    elif isinstance(value, float):
+        return RealSingle(repr(value))
+    elif isinstance(value, str):
+        return internLeaf(StringSingle, value)
+    elif isinstance(value, dict):
+        return DictSingle([Pair(k, nodeFromValue(v)) for k, v in value.items()])
+    elif isinstance(value, (list, tuple)):
+        return ArraySingle([nodeFromValue(v) for v in value])
+    elif isinstance(value, (bytes, bytearray)):
+        return DataSingle(
+            binascii.b2a_base64(value, newline=False).decode('ascii'))
+    # a datetime comes from a module that is already imported, no need to import it before
+    datetime = sys.modules.get('datetime')
+    if datetime is not None and isinstance(value, datetime.datetime):
+        return DateSingle(value.strftime('%Y-%m-%dT%H:%M:%SZ'))
+    raise TypeError('{!r} can not be in a plist'.format(value))
+
+
+def valueFromNode(node):
+    '''The opposite of ``nodeFromValue()``: the plain value of a single, as ``loadPlist()`` would return it.
+
+    Example::
+
+        valueFromNode(DictSingle(Pair('PATH', StringSingle('/bin')))) # {'PATH': '/bin'}
+
+    Args:
+        node (Single): a BoolSingle, or TypedSingle and its subclasses. Job counts as a dict.
+
+    Raises:
+        TypeError: if the single can't be a plist value
+
+    Returns:
+        str, int, float, bool, list, dict, datetime or bytes
+    '''
+    if isinstance(node, BoolSingle):
+        return node.value[0] == 'true'
+    if not isinstance(node, Single) or isinstance(node, Pair):
+        raise TypeError('{!r} can not be a plist value'.format(node))
+    tag = node.tag
+    if tag == 'dict':
+        result = {}
+        for pair in node.value:
+            if not isinstance(pair, Pair):
+                raise TypeError('{!r} in a dict is not a pair'.format(pair))
+            # pairs without a value are not printed either
+            if not pair.value:
+                continue
+            if len(pair.value) > 1:
+                raise TypeError('{} has more than one value'.format(pair.key))
+            result[pair.key] = valueFromNode(pair.value[0])
+        return result
+    if tag == 'array':
+        return [valueFromNode(element) for element in node.value]
+    if len(node.value) != 1:
+        raise TypeError('<{}> needs exactly one value'.format(tag))
+    value = node.value[0]
+    if tag == 'string':
+        return str(value)
+    if tag == 'integer':
+        return int(value)
+    if tag == 'real':
+        return float(value)
+    if tag == 'date':
+        import datetime
+        return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+    if tag == 'data':
+        return binascii.a2b_base64(value)
+    raise TypeError('<{}> can not be a plist value'.format(tag))
@@ -0,0 +1,453 @@
+'''Writing a lot of jobs to their files at once, atomically, and making a directory match a set of jobs.'''
+import os
+import stat
+import tempfile
+import time
+from pathlib import Path
+
+from . import core
+from .core import blake2b, nullSink
+
+
+class WriteReport():
+    '''What ``writeAll()`` did.
+
+    Properties:
+        written (list): paths that were written
+        skipped (list): paths whose file already had the same content
+        failed (list): (path, exception) of jobs that could not be rendered or written
+        renderTime (float): seconds spent rendering, summed over workers
+        writeTime (float): seconds spent comparing and writing files, summed over workers
+        syncTime (float): seconds spent syncing directories
+        totalTime (float): wall clock seconds of the whole batch
+    '''
+
+    def __init__(self):
+        self.written = []
+        self.skipped = []
+        self.failed = []
+        self.renderTime = 0.0
+        self.writeTime = 0.0
+        self.syncTime = 0.0
+        self.totalTime = 0.0
+
+    def counts(self):
+        '''Returns:
+            dict: number of written, skipped and failed files
+        '''
+        return {
+            'written': len(self.written),
+            'skipped': len(self.skipped),
+            'failed': len(self.failed)
+        }
+
+    def __repr__(self):
+        return '<WriteReport written={written} skipped={skipped} failed={failed} in {time:.3f}s>'.format(
+            time=self.totalTime, **self.counts())
+
+
+def writeAtomic(path, data, mode=None, sync=True):
+    '''Write bytes to a file through a temporary file and ``os.replace()``.
+
+    The temporary file is created in the same directory, so the replace is atomic:
+    a reader (or a crash) sees either the old file or the new one, never a truncated one.
+    The directory itself is not synced, see ``syncDirectory()``.
+
+    Args:
+        path (str): the file to write
+        data (bytes): the new content
+        mode (int): permission bits of the new file. Default to the mode of the old file, or 0o644.
+        sync (bool): whether to fsync the temporary file before replacing
+    '''
+    path = Path(path)
+    if mode is None:
+        try:
+            mode = stat.S_IMODE(os.stat(path).st_mode)
+        except FileNotFoundError:
+            mode = 0o644
+    fd, tmpPath = tempfile.mkstemp(
+        dir=str(path.parent), prefix='.' + path.name + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+        os.chmod(tmpPath, mode)
+        os.replace(tmpPath, str(path))
+    except BaseException:
+        try:
+            os.unlink(tmpPath)
+        except OSError:
+            pass
+        raise
+
+
+def syncDirectory(directory):
+    '''fsync a directory so that renames inside it are on disk. Does nothing where directories can't be opened(Windows).
+
+    Args:
+        directory (str): the directory
+    '''
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _renderJob(job):
+    '''The bytes ``writeAll()`` writes for a job.'''
+    return job.parse().encode('utf-8')
+
+
+def _storeJob(path, data, sync):
+    '''Write the rendered bytes of a job, unless its file already has them.
+
+    Returns:
+        bool: True if the file was written, False if it was skipped
+    '''
+    start = time.perf_counter()
+    try:
+        same = os.stat(path).st_size == len(data) and \
+            Path(path).read_bytes() == data
+    except FileNotFoundError:
+        same = False
+    if not same:
+        writeAtomic(path, data, sync=sync)
+    if core._sink is not nullSink:
+        core._sink('write', {
+            'job': path,
+            'ns': int((time.perf_counter() - start) * 1e9),
+            'bytes': 0 if same else len(data),
+            'skipped': 1 if same else 0
+        })
+    return not same
+
+
+def _writeJob(job, sync, withDigest=False):
+    '''Render and write one job for ``writeAll()``. Runs in a worker.
+
+    Returns:
+        tuple: (status, path, renderTime, writeTime, error, digest), status is 'written', 'skipped' or 'failed',
+        digest is ``manifest.digestOf()`` the bytes if withDigest is True, else None
+    '''
+    path = job.me
+    renderTime = writeTime = 0.0
+    try:
+        start = time.perf_counter()
+        data = _renderJob(job)
+        renderTime = time.perf_counter() - start
+        start = time.perf_counter()
+        written = _storeJob(path, data, sync)
+        writeTime = time.perf_counter() - start
+        digest = None
+        if withDigest:
+            from .manifest import digestOf
+            digest = digestOf(data)
+        return ('written' if written else 'skipped', path, renderTime,
+                writeTime, None, digest)
+    except Exception as error:
+        return 'failed', path, renderTime, writeTime, error, None
+
+
+def writeAll(jobs, workers=None, processes=False, sync=True, manifest=None):
+    '''Write a lot of jobs to their plists at once.
+
+    Jobs are rendered and written on a thread pool (or a process pool).
+    Every file is written atomically with ``writeAtomic()``,
+    files that already have the same bytes are not touched,
+    and every directory is synced once at the end of the batch instead of once per file.
+    A job that fails doesn't stop the others, it is reported in ``WriteReport.failed``.
+
+    Example::
+
+        report = writeAll(jobs, workers=8)
+        print(report.counts(), report.totalTime)
+
+    Args:
+        jobs (list): the jobs to write
+        workers (int): number of workers, default to what ``concurrent.futures`` picks
+        processes (bool): use a process pool instead of threads. Jobs are pickled to the workers.
+        sync (bool): whether to fsync the files and their directories
+        manifest (RenderManifest): jobs it has as unchanged are skipped without being rendered or written,
+            and what is written is recorded in it, see ``launchdman.manifest``
+
+    Returns:
+        WriteReport: counts and timings of the batch
+    '''
+    # the pools bring in threading and logging, only pay for them here
+    import concurrent.futures
+    report = WriteReport()
+    start = time.perf_counter()
+    jobs = list(jobs)
+    if manifest is not None:
+        unchanged, jobs = manifest.unchanged(jobs)
+        report.skipped.extend(job.me for job in unchanged)
+    if processes:
+        Executor = concurrent.futures.ProcessPoolExecutor
+    else:
+        Executor = concurrent.futures.ThreadPoolExecutor
+    directories = set()
+    records = []
+    with Executor(max_workers=workers) as executor:
+        results = executor.map(_writeJob, jobs, [sync] * len(jobs),
+                               [manifest is not None] * len(jobs))
+        for job, (status, path, renderTime, writeTime, error,
+                  digest) in zip(jobs, results):
+            report.renderTime += renderTime
+            report.writeTime += writeTime
+            if status == 'written':
+                report.written.append(path)
+                directories.add(Path(path).parent)
+            elif status == 'skipped':
+                report.skipped.append(path)
+            else:
+                report.failed.append((path, error))
+            if digest is not None:
+                records.append((path, job.fingerprint(), digest))
+    if sync:
+        syncStart = time.perf_counter()
+        for directory in directories:
+            syncDirectory(directory)
+        report.syncTime = time.perf_counter() - syncStart
+    if records:
+        manifest.record(records)
+    report.totalTime = time.perf_counter() - start
+    return report
+
+
+# Reconciling a directory
+
+
+class ReconcileState():
+    '''What ``reconcile()`` knows about the plists of a directory from the last time it looked.
+
+    For every file it keeps its mtime and size, the digest of its content and the fingerprint of the job written to it.
+    As long as the stat and the job didn't change, the file is not read and the job is not rendered.
+    Keep one around between calls, or ``save()`` it and ``load()`` it in the next process.
+
+    Properties:
+        records (dict): file name -> (mtime_ns, size, digest hex, fingerprint hex)
+    '''
+
+    def __init__(self, records=None):
+        self.records = dict(records) if records is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        '''Read a state saved by ``save()``. A missing file gives an empty state.'''
+        import json
+        try:
+            with open(path) as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        return cls({name: tuple(record) for name, record in records.items()})
+
+    def save(self, path):
+        '''Write the state to a JSON file, atomically. Don't put it in the directory it describes.'''
+        import json
+        writeAtomic(path, json.dumps(self.records).encode('utf-8'), sync=False)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        return '<ReconcileState {} files>'.format(len(self.records))
+
+
+# directory -> the ReconcileState reconcile() uses when it's not given one
+_states = {}
+
+
+class ReconcilePlan():
+    '''What ``reconcile()`` is going to change in a directory. Nothing is changed until ``apply()``.
+
+    Properties:
+        directory (str): the directory
+        added (list): plists of jobs that have no file yet
+        updated (list): plists whose content is different from their job
+        deleted (list): plists that no job has anymore, only with prune, see ``reconcile()``
+        unchanged (int): how many plists already match their job
+    '''
+
+    def __init__(self, directory, state, sync):
+        self.directory = directory
+        self.added = []
+        self.updated = []
+        self.deleted = []
+        self.unchanged = 0
+        self.applied = False
+        self._state = state
+        self._sync = sync
+        # file name -> (data, digest, fingerprint) of the files to write
+        self._writes = {}
+
+    def __bool__(self):
+        return bool(self.added or self.updated or self.deleted)
+
+    def counts(self):
+        '''Returns:
+            dict: number of added, updated, deleted and unchanged plists
+        '''
+        return {
+            'added': len(self.added),
+            'updated': len(self.updated),
+            'deleted': len(self.deleted),
+            'unchanged': self.unchanged
+        }
+
+    def apply(self):
+        '''Make the changes: write added and updated plists with ``writeAtomic()`` and delete the others.
+
+        The plan is not checked again, so apply it soon after ``reconcile()``. It can only be applied once.
+
+        Returns:
+            ReconcilePlan: self
+        '''
+        if self.applied:
+            raise RuntimeError('the plan of {} was applied already'.format(
+                self.directory))
+        self.applied = True
+        records = self._state.records
+        for name, (data, digest, fingerprint) in self._writes.items():
+            path = os.path.join(self.directory, name)
+            if core._sink is not nullSink:
+                start = time.perf_counter_ns()
+            writeAtomic(path, data, sync=self._sync)
+            if core._sink is not nullSink:
+                core._sink('write', {
+                    'job': path,
+                    'ns': time.perf_counter_ns() - start,
+                    'bytes': len(data)
+                })
+            info = os.stat(path)
+            records[name] = (info.st_mtime_ns, info.st_size, digest,
+                             fingerprint)
+        for path in self.deleted:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            records.pop(os.path.basename(path), None)
+        self._writes.clear()
+        if self._sync and self:
+            syncDirectory(self.directory)
+        return self
+
+    def __repr__(self):
+        return '<ReconcilePlan {directory} added={added} updated={updated} deleted={deleted} unchanged={unchanged}>'.format(
+            directory=self.directory, **self.counts())
+
+
+def _render(job, format):
+    if format == 'binary':
+        return job.toBinary()
+    elif format == 'xml':
+        return job.parse().encode('utf-8')
+    raise ValueError('unknown plist format {!r}'.format(format))
+
+
+def _digest(data):
+    return blake2b(data, digest_size=16).hexdigest()
+
+
+def reconcile(directory, jobs, state=None, format='xml', prune=False,
+              sync=True):
+    '''Plan how to make the plists of a directory match a set of jobs.
+
+    Every job goes to the file with the name of its ``Job.me`` in directory.
+    One stat pass over the directory finds the files that changed since the last reconcile(see ``ReconcileState``),
+    only those are read and hashed, and only jobs whose fingerprint changed are rendered.
+    So after the first call, the work grows with the number of changes, not with the number of plists.
+    A job is compared by its fingerprint, so a dict with its keys in another order is not a change.
+
+    Nothing is changed until you apply the plan::
+
+        plan = reconcile('~/Library/LaunchAgents', jobs)
+        print(plan.counts())
+        plan.apply()
+
+    Other plists in the directory are left alone. With `prune`, the ones that were a job's last time
+    (that state has a record of) and that no job has anymore are deleted, plists of other programs never are.
+    So to prune, keep the state between runs(see ``ReconcileState.save()``).
+
+    Args:
+        directory (str): the directory, e.g. ~/Library/LaunchAgents
+        jobs (list): the jobs that should be in it
+        state (ReconcileState): what is known about the directory, default to one kept for the directory in this process
+        format (str): 'xml', or 'binary', as in ``Job.write()``
+        prune (bool): delete the plists of jobs that are gone, see above
+        sync (bool): whether ``apply()`` fsyncs the files and the directory
+
+    Returns:
+        ReconcilePlan: the changes, see ``ReconcilePlan.apply()``
+    '''
+    directory = os.path.abspath(os.path.expanduser(str(directory)))
+    if state is None:
+        state = _states.get(directory)
+        if state is None:
+            state = _states[directory] = ReconcileState()
+    records = state.records
+    plan = ReconcilePlan(directory, state, sync)
+
+    stats = {}
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith('.plist') and entry.is_file():
+                stats[entry.name] = entry.stat()
+
+    seen = set()
+    for job in jobs:
+        name = os.path.basename(job.me)
+        if name in seen:
+            raise ValueError('two jobs go to {}'.format(name))
+        seen.add(name)
+        fingerprint = '{}:{}'.format(job.fingerprint().hex(), format)
+        info = stats.pop(name, None)
+        if info is None:
+            data = _render(job, format)
+            plan.added.append(os.path.join(directory, name))
+            plan._writes[name] = (data, _digest(data), fingerprint)
+            continue
+        record = records.get(name)
+        statSame = record is not None and record[:2] == (info.st_mtime_ns,
+                                                         info.st_size)
+        if statSame and record[3] == fingerprint:
+            plan.unchanged += 1
+            continue
+        data = _render(job, format)
+        digest = _digest(data)
+        path = os.path.join(directory, name)
+        if statSame:
+            fileDigest = record[2]
+        elif info.st_size != len(data):
+            fileDigest = None
+        else:
+            # the only case that reads the file: it changed(or is new to the state) and has the right size
+            with open(path, 'rb') as f:
+                fileDigest = _digest(f.read())
+        if fileDigest == digest:
+            plan.unchanged += 1
+            records[name] = (info.st_mtime_ns, info.st_size, digest,
+                             fingerprint)
+        else:
+            plan.updated.append(path)
+            plan._writes[name] = (data, digest, fingerprint)
+    if prune:
+        # only what we wrote or matched before, the other plists belong to somebody else
+        plan.deleted.extend(
+            os.path.join(directory, name) for name in sorted(stats)
+            if name in records)
+    if len(records) > len(seen) + len(stats):
+        # files that are gone from the directory without us
+        for name in [name for name in records
+                     if name not in seen and name not in stats]:
+            del records[name]
+    return plan
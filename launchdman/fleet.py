@@ -0,0 +1,421 @@
+'''The start load of a fleet of jobs, and staggering their start times.'''
+import array
+import datetime
+import hashlib
+import heapq
+import math
+import sys
+import time
+
+from .calendar import StartCalendarInterval, StartInterval, _minuteBits
+from .keys import Label
+
+
+# slots are counted in 32-bit lanes of a big int, so a whole day is added up in one addition
+_laneBits = 32
+_horizons = {'day': 1, 'week': 7, 'year': 365}
+
+
+def _spread(bits, lanesPerMinute, count=1):
+    '''Turn a minutes-of-the-day bitset into a packed int with `count` in the lane of every set minute.'''
+    packed = 0
+    while bits:
+        low = bits & -bits
+        packed |= 1 << ((low.bit_length() - 1) * lanesPerMinute * _laneBits)
+        bits ^= low
+    return packed * count
+
+
+def _intervalPattern(interval, step, period, lanes):
+    '''Packed starts per slot of a StartInterval that started at slot 0, for at least `lanes` slots.
+
+    The starts repeat every `period` slots(lcm(interval, step) seconds), that much is built by hand and then doubled.
+    '''
+    pattern = 0
+    for second in range(0, period * step, interval):
+        pattern += 1 << (second // step * _laneBits)
+    length = period
+    while length < lanes:
+        pattern |= pattern << (length * _laneBits)
+        length *= 2
+    return pattern
+
+
+class FleetLoad():
+    '''How many jobs start in every slot (minute by default) of a time range, see ``analyzeFleet()``.
+
+    Times are wall clock times and DST is not applied.
+
+    Properties:
+        start (datetime.datetime): the beginning of slot 0
+        step (int): seconds per slot
+        counts (array.array): starts per slot
+        jobs (int): number of jobs with a schedule
+    '''
+
+    def __init__(self, start, step, counts, schedules):
+        self.start = start
+        self.step = step
+        self.counts = counts
+        self.jobs = len(schedules)
+        self._schedules = schedules
+
+    def peak(self):
+        '''Returns:
+            int: the most starts in one slot
+        '''
+        return max(self.counts) if self.counts else 0
+
+    def timeOf(self, slot):
+        '''Returns:
+            datetime.datetime: the beginning of `slot`
+        '''
+        return self.start + datetime.timedelta(seconds=slot * self.step)
+
+    def worst(self, k=10):
+        '''Find the busiest slots.
+
+        Args:
+            k (int): how many slots
+
+        Returns:
+            list: (datetime, starts) of the `k` busiest slots, busiest first
+        '''
+        perDay = 86400 // self.step
+        days = range(0, len(self.counts), perDay)
+        # the k busiest slots are in the k days with the busiest slots
+        busyDays = heapq.nlargest(
+            k, days, key=lambda day: max(self.counts[day:day + perDay]))
+        slots = [
+            slot for day in busyDays
+            for slot in range(day, min(day + perDay, len(self.counts)))
+        ]
+        slots = heapq.nlargest(k, slots, key=self.counts.__getitem__)
+        return [(self.timeOf(slot), self.counts[slot]) for slot in slots]
+
+    def labelsAt(self, when):
+        '''Find out who starts in a slot.
+
+        Args:
+            when (datetime.datetime or int): a time, or a slot number
+
+        Returns:
+            list: Labels of the jobs starting in that slot, '' for jobs without a Label
+        '''
+        if isinstance(when, datetime.datetime):
+            slot = int((when - self.start).total_seconds() // self.step)
+        else:
+            slot = when
+        offset = slot * self.step
+        moment = self.timeOf(slot)
+        labels = []
+        for label, tables, intervals in self._schedules:
+            # calendar starts are at second 0
+            starts = moment.second == 0 and any(
+                table.minutesOf(moment.date()) >>
+                (moment.hour * 60 + moment.minute) & 1 for table in tables)
+            # the first start of an interval is one interval after slot 0
+            starts = starts or any(
+                max(-(-offset // interval), 1) * interval < offset + self.step
+                for interval in intervals)
+            if starts:
+                labels.append(label)
+        return labels
+
+    def __repr__(self):
+        return '<FleetLoad {jobs} jobs, {slots} slots of {step}s from {start}, peak {peak}>'.format(
+            jobs=self.jobs,
+            slots=len(self.counts),
+            step=self.step,
+            start=self.start,
+            peak=self.peak())
+
+
+def _jobSchedules(job):
+    '''(label, [CalendarSchedule], [interval seconds]) of a job'''
+    label = ''
+    tables = []
+    intervals = []
+    for config in job.value:
+        if isinstance(config, Label):
+            label = config.value[0].value[0]
+        elif isinstance(config, StartCalendarInterval):
+            tables.append(config.compile())
+        elif isinstance(config, StartInterval) and config.value:
+            interval = config.value[0].value[0]
+            if interval > 0:
+                intervals.append(interval)
+    return label, tables, intervals
+
+
+def analyzeFleet(jobs, start=None, horizon='day', step=60):
+    '''Count how many jobs start in every minute(or second) of a day, a week or a year.
+
+    Every StartCalendarInterval and StartInterval of every job is counted, a StartInterval as
+    if the job was loaded at `start`. Calendar schedules are counted per kind of day instead of per day:
+    a job that only looks at Weekday is looked at 7 times, not 365 times, and jobs that fire at the same
+    minutes are counted together. Counts are kept in lanes of a big int, so a day
+    of all the jobs is summed up with a few additions instead of a loop over minutes.
+
+    Example::
+
+        load = analyzeFleet(jobs, horizon='year')
+        load.peak()
+        for when, starts in load.worst(5):
+            print(when, starts, load.labelsAt(when))
+
+    Args:
+        jobs (list): Jobs
+        start (datetime.date): the first day, default to today
+        horizon (str or int): 'day', 'week', 'year' or a number of days
+        step (int): seconds per slot, 60 or a divisor of 60
+
+    Returns:
+        FleetLoad: starts per slot
+    '''
+    if 60 % step:
+        raise ValueError('step has to divide 60, got {}'.format(step))
+    days = _horizons.get(horizon, horizon)
+    if start is None:
+        start = datetime.date.today()
+    if isinstance(start, datetime.datetime):
+        start = start.date()
+    dates = [start + datetime.timedelta(days=i) for i in range(days)]
+    lanesPerMinute = 60 // step
+    perDay = 86400 // step
+
+    # what a date looks like to a job that only looks at some fields
+    project = {
+        'Month': lambda date: date.month,
+        'Day': lambda date: date.day,
+        'Weekday': lambda date: date.weekday()
+    }
+    # fields -> {projection -> a date with that projection}
+    samples = {}
+    # (fields, projection) -> {minutes -> jobs}
+    minutes = {}
+    # interval -> jobs
+    intervals = {}
+    schedules = []
+    for job in jobs:
+        label, tables, jobIntervals = _jobSchedules(job)
+        if not tables and not jobIntervals:
+            continue
+        schedules.append((label, tables, jobIntervals))
+        for interval in jobIntervals:
+            intervals[interval] = intervals.get(interval, 0) + 1
+        for table in tables:
+            fields = table.dateFields()
+            if fields not in samples:
+                samples[fields] = {}
+                for date in dates:
+                    samples[fields].setdefault(
+                        tuple(project[f](date) for f in fields), date)
+            for projection, date in samples[fields].items():
+                bits = table.minutesOf(date)
+                if bits:
+                    counter = minutes.setdefault((fields, projection), {})
+                    counter[bits] = counter.get(bits, 0) + 1
+
+    packed = {
+        key: sum(
+            _spread(bits, lanesPerMinute, count)
+            for bits, count in counter.items())
+        for key, counter in minutes.items()
+    }
+    patterns = {}
+    late = {}
+    for interval, count in intervals.items():
+        if interval <= 3600:
+            period = interval * step // math.gcd(interval, step) // step
+            patterns[interval] = (period, count * _intervalPattern(
+                interval, step, period, period + perDay))
+        else:
+            late[interval] = count
+
+    dayMask = (1 << (perDay * _laneBits)) - 1
+    chunks = []
+    for i, date in enumerate(dates):
+        day = 0
+        for fields in samples:
+            day += packed.get(
+                (fields, tuple(project[f](date) for f in fields)), 0)
+        for period, pattern in patterns.values():
+            day += (pattern >> (i * perDay % period * _laneBits)) & dayMask
+        chunks.append(
+            day.to_bytes(perDay * _laneBits // 8, sys.byteorder))
+    counts = array.array('I')
+    counts.frombytes(b''.join(chunks))
+
+    # an interval doesn't start at load time
+    for interval, count in intervals.items():
+        if interval <= 3600 and counts:
+            counts[0] -= count
+    # long intervals start rarely enough to count one by one
+    for interval, count in late.items():
+        for second in range(interval, days * 86400, interval):
+            counts[second // step] += count
+    return FleetLoad(
+        datetime.datetime.combine(start, datetime.time()), step, counts,
+        schedules)
+
+
+def _stableHash(label):
+    '''a hash of a Label that is the same in every process, unlike hash()'''
+    return int.from_bytes(
+        hashlib.blake2b(label.encode(), digest_size=8).digest(), 'big')
+
+
+def _shiftEntry(entry, delta, hours):
+    '''move a calendar entry `delta` minutes, within the hour or, with `hours`, within the day'''
+    if 'Minute' not in entry:
+        return dict(entry)
+    entry = dict(entry)
+    if hours and 'Hour' in entry:
+        time = (entry['Hour'] * 60 + entry['Minute'] + delta) % 1440
+        entry['Hour'], entry['Minute'] = divmod(time, 60)
+    else:
+        entry['Minute'] = (entry['Minute'] + delta) % 60
+    return entry
+
+
+def _entryMinutes(entry):
+    '''minutes of the day an entry fires at, date fields ignored'''
+    bits = _minuteBits(entry.get('Hour'), entry.get('Minute'))
+    minutes = []
+    while bits:
+        low = bits & -bits
+        minutes.append(low.bit_length() - 1)
+        bits ^= low
+    return minutes
+
+
+def staggerFleet(jobs, windows=None, hours=False, horizon='week'):
+    '''Spread the start times of a lot of jobs, so they don't all start in the same minute.
+
+    The Minute(and with `hours`, the Hour) of every StartCalendarInterval entry of a job is moved
+    by the same amount, so a job keeps its shape: {'Minute': 0} and {'Minute': 30} become
+    {'Minute': 7} and {'Minute': 37}. Jobs are placed one by one, each in the least busy place
+    of its window. The order and the first place tried come from a hash of the Label(the path for jobs without one),
+    so running it again gives the same plan, and jobs that already have a good place keep it:
+    only new jobs move.
+
+    StartInterval jobs are counted but not moved, when they run depends on when they are loaded,
+    not on the plist. Date fields are ignored when planning, every entry counts as daily.
+
+    Example::
+
+        report = staggerFleet(jobs, windows={'com.backup': (0, 15)})
+        # {'peak': (2000, 12), 'moved': ['com.a', ...]}
+        writeAll(jobs)
+
+    Args:
+        jobs (list): Jobs, changed in place
+        windows (dict): Label -> (first, end) allowed values of the first entry's Minute, end excluded.
+            With `hours` and an Hour in that entry, minutes of the day instead, e.g. (120, 300) for 2:00 to 5:00.
+            Default to anywhere.
+        hours (bool): also move the Hour
+        horizon (str or int): the range the peak is measured over, see ``analyzeFleet()``
+
+    Returns:
+        dict: the peak of ``analyzeFleet()`` before and after, and the Labels of the jobs that moved
+    '''
+    windows = windows or {}
+    start = datetime.date.today()
+    before = analyzeFleet(jobs, start, horizon).peak()
+
+    fixed = [0] * 1440
+    movable = []
+    for index, job in enumerate(jobs):
+        label = ''
+        schedules = []
+        for config in job.value:
+            if isinstance(config, Label):
+                label = config.value[0].value[0]
+            elif isinstance(config, StartCalendarInterval):
+                schedules.append(config)
+            elif isinstance(config, StartInterval) and config.value:
+                interval = config.value[0].value[0]
+                for second in range(interval, 86400, max(interval, 1)):
+                    fixed[second // 60] += 1
+        entries = [e for schedule in schedules for e in schedule.entries()]
+        anchor = next((e for e in entries if 'Minute' in e), None)
+        # minutes that move with the day, and minutes that move within their hour
+        daily = []
+        hourly = []
+        for entry in entries:
+            if 'Minute' not in entry:
+                # every minute doesn't move
+                for minute in _entryMinutes(entry):
+                    fixed[minute] += 1
+            elif hours and 'Hour' in entry:
+                daily.extend(_entryMinutes(entry))
+            else:
+                hourly.extend(_entryMinutes(entry))
+        if anchor is None:
+            continue
+        if hours and 'Hour' in anchor:
+            current = anchor['Hour'] * 60 + anchor['Minute']
+            first, end = windows.get(label, (0, 1440))
+        else:
+            current = anchor['Minute']
+            first, end = windows.get(label, (0, 60))
+        # jobs are told apart by their place in jobs, two of them can have the same Label or none.
+        # A job without a Label is hashed by its path instead
+        movable.append((_stableHash(label or str(job.me)), label, index,
+                        schedules, daily, hourly, current, first, end))
+    movable.sort(key=lambda m: m[:3])
+
+    def minutesAt(daily, hourly, delta):
+        return [(m + delta) % 1440 for m in daily
+                ] + [m - m % 60 + (m + delta) % 60 for m in hourly]
+
+    def place(jobList, load):
+        '''put every job in the least busy place of its window'''
+        plan = {}
+        for seed, label, index, schedules, daily, hourly, current, first, end in jobList:
+            size = end - first
+            best = None
+            lowest = min(load)
+            for i in range(size):
+                target = first + (seed + i) % size
+                minutes = minutesAt(daily, hourly, target - current)
+                cost = max((load[m] for m in minutes), default=0)
+                if best is None or cost < best[0]:
+                    best = (cost, target, minutes)
+                    if cost <= lowest:
+                        break
+            for minute in best[2]:
+                load[minute] += 1
+            plan[index] = best[1]
+        return plan
+
+    # how busy it gets with nobody keeping their place
+    load = list(fixed)
+    place(movable, load)
+    level = max(load)
+
+    # keep the jobs that are in their window, as long as it doesn't get busier than that
+    load = list(fixed)
+    kept = set()
+    for seed, label, index, schedules, daily, hourly, current, first, end in movable:
+        minutes = minutesAt(daily, hourly, 0)
+        if first <= current < end and all(load[m] < level for m in minutes):
+            for minute in minutes:
+                load[minute] += 1
+            kept.add(index)
+    plan = place([m for m in movable if m[2] not in kept], load)
+
+    moved = []
+    for seed, label, index, schedules, daily, hourly, current, first, end in movable:
+        target = plan.get(index, current)
+        if target == current:
+            continue
+        for schedule in schedules:
+            old = schedule.entries()
+            schedule.remove(old)
+            schedule.add(
+                [_shiftEntry(entry, target - current, hours) for entry in old])
+        moved.append(label)
+    after = analyzeFleet(jobs, start, horizon).peak()
+    return {'peak': (before, after), 'moved': moved}
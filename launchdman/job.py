@@ -0,0 +1,442 @@
+'''Job, the node of a whole plist, and the difference between two jobs.'''
+import os
+import time
+from pathlib import Path
+
+from . import core
+from .core import (emitElements, indentLines, nullSink, Pair, registerEmitter,
+                   Single, structuralKey, valueFromNode, _renderCacheCounts)
+from .calendar import StartCalendarInterval
+from .keys import configBuilders, configFromValue, QueueDirecotries, WatchPaths
+from .plist import BinaryPlistWriter, loadPlist
+
+
+class Job(Single):
+    '''Each Job is correspond to a plist.'''
+
+    __slots__ = ('me', )
+
+    def __init__(self, path):
+        '''init
+
+        Args:
+            path (str): The absolute path of the plist
+        '''
+        self.me = Path(path)
+        self.tag = 'dict'
+        self.value = []
+
+    @classmethod
+    def read(cls, path):
+        '''Load a job from an existing plist.
+
+        Known keys become their config classes(``Label``, ``ProgramArguments``, ``StartCalendarInterval``, ``KeepAliveDepends``...),
+        other keys become generic pairs, see ``configFromValue()``.
+
+        Example::
+
+            job = Job.read('~/Library/LaunchAgents/com.job.user.plist')
+
+        Args:
+            path (str): The path of the plist, XML or binary
+
+        Raises:
+            ValueError: if the file is not a valid plist
+
+        Returns:
+            Job: the job, with ``me`` set to path
+        '''
+        with open(os.path.expanduser(str(path)), 'rb') as f:
+            return cls.fromValue(path, loadPlist(f))
+
+    @classmethod
+    def fromBytes(cls, data, path=''):
+        '''Load a job from the bytes of a plist. See ``read()``.
+
+        Args:
+            data (bytes): the content of a plist
+            path (str): The path of the job
+
+        Returns:
+            Job: the job
+        '''
+        return cls.fromValue(path, loadPlist(data))
+
+    @classmethod
+    def fromValue(cls, path, value):
+        '''Build a job from the top level dict of a plist. Same as ``fromDict()``.
+
+        Args:
+            path (str): The path of the job
+            value (dict): the dict, as returned by ``loadPlist()``
+
+        Returns:
+            Job: the job
+        '''
+        return cls.fromDict(path, value)
+
+    @classmethod
+    def fromDict(cls, path, mapping):
+        '''Build a job from a plist-style dict, e.g. a job definition loaded from JSON or YAML.
+
+        Known keys are built straight into their config classes through the ``configBuilders`` table,
+        without running their constructors, ``flatten()`` and ``add()``, so it is a lot faster than adding the configs one by one.
+        The job is the same as ``Job.fromValue()`` gives: unknown keys, and known keys whose value doesn't fit, become generic pairs.
+
+        Example::
+
+            job = Job.fromDict('~/Library/LaunchAgents/com.job.plist', {
+                'Label': 'com.job',
+                'ProgramArguments': ['/usr/local/bin/job', '-v'],
+                'StartCalendarInterval': [{'Hour': 3, 'Minute': 0}]
+            })
+
+        Args:
+            path (str): The path of the job
+            mapping (dict): key -> value, values as returned by ``loadPlist()``
+
+        Raises:
+            ValueError: if mapping is not a dict
+
+        Returns:
+            Job: the job
+        '''
+        if not isinstance(mapping, dict):
+            raise ValueError('a launchd plist must contain a dict')
+        if core._sink is not nullSink:
+            start = time.perf_counter_ns()
+        job = cls(path)
+        value = job.value
+        builders = configBuilders
+        for key, v in mapping.items():
+            entry = builders.get(key)
+            if entry is not None:
+                try:
+                    value.append(entry[0](entry[1], v, key))
+                    continue
+                except (TypeError, ValueError, AttributeError):
+                    pass
+            value.append(configFromValue(key, v))
+        if core._sink is not nullSink:
+            core._sink('build', {
+                'job': job.me,
+                'ns': time.perf_counter_ns() - start,
+                'keys': len(mapping)
+            })
+        return job
+
+    def toDict(self):
+        '''The job as a plist-style dict, the opposite of ``fromDict()``. See ``valueFromNode()``.
+
+        Returns:
+            dict: key -> str, int, float, bool, list, dict, datetime or bytes
+        '''
+        return valueFromNode(self)
+
+    def write(self, format='xml'):
+        '''Write the job to the corresponding plist.
+
+        Args:
+            format (str): 'xml', or 'binary' for a bplist00 file, see ``toBinary()``
+        '''
+        if core._sink is not nullSink:
+            start = time.perf_counter_ns()
+        if format == 'binary':
+            with open(self.me, 'wb') as f:
+                f.write(self.toBinary())
+                size = f.tell()
+        elif format == 'xml':
+            with open(self.me, 'w') as f:
+                self.writeTo(f)
+                size = f.tell()
+        else:
+            raise ValueError('unknown plist format {!r}'.format(format))
+        if core._sink is not nullSink:
+            core._sink('write', {
+                'job': self.me,
+                'ns': time.perf_counter_ns() - start,
+                'bytes': size
+            })
+
+    async def awrite(self, format='xml', executor=None):
+        '''Write the job to the corresponding plist without blocking the event loop.
+
+        The job is rendered and written in executor, see ``launchdman.aio``. Example::
+
+            await job.awrite()
+
+        Args:
+            format (str): 'xml' or 'binary', like ``write()``
+            executor (concurrent.futures.Executor): where it runs, default to the loop's default executor
+        '''
+        from . import aio
+        await aio.awrite(self, format, executor)
+
+    def toBinary(self):
+        '''Encode the job as a binary plist(bplist00), the format launchd and plistlib read as well as XML.
+
+        Repeated strings and numbers are stored once. See ``BinaryPlistWriter``.
+
+        Returns:
+            bytes: the binary plist
+        '''
+        return BinaryPlistWriter().encode(self)
+
+    def writeTo(self, stream):
+        '''Write the job in plist format to any writable text stream.
+
+        The text is produced by ``iterChunks()``, so the whole plist never has to sit in memory.
+
+        Args:
+            stream: anything with a ``write(str)`` method, e.g. an open file or ``io.StringIO``
+        '''
+        if core._sink is not nullSink:
+            self._renderTimed(stream.write)
+            return
+        write = stream.write
+        for chunk in self.iterChunks():
+            write(chunk)
+
+    def _renderTimed(self, write):
+        '''Render the job into write and send the render event, see ``addSink()``.'''
+        hits, misses = _renderCacheCounts
+        chars = 0
+        start = time.perf_counter_ns()
+        for chunk in self._chunks(self.tag, self.value, ''):
+            chars += len(chunk)
+            write(chunk)
+        core._sink('render', {
+            'job': self.me,
+            'ns': time.perf_counter_ns() - start,
+            'chars': chars,
+            'rendered': _renderCacheCounts[1] - misses,
+            'reused': _renderCacheCounts[0] - hits
+        })
+
+    def iterChunks(self):
+        '''Generate the plist text of the job chunk by chunk.
+
+        Joining the chunks gives exactly what ``printMe(self.tag, self.value)`` returns.
+        There is one chunk for the header, one for every config and one for the footer.
+
+        Returns:
+            A generator of str.
+        '''
+        return self._chunks(self.tag, self.value, '')
+
+    def _chunks(self, selfTag, selfValue, pad):
+        '''The generator behind ``iterChunks()`` and the job emitter.'''
+        if len(selfValue) == 0:
+            return
+        yield indentLines(
+            '<?xml version="1.0" encoding="UTF-8"?>\n<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">\n<plist version="1.0">\n<{tag}>\n'.
+            format(tag=selfTag), pad)
+        innerPad = pad + '    '
+        buffer = []
+        for element in selfValue:
+            emitElements((element, ), buffer.append, innerPad, parent=self)
+            yield ''.join(buffer)
+            buffer.clear()
+        yield indentLines('</{tag}>\n</plist>'.format(tag=selfTag), pad)
+
+    def diff(self, other):
+        '''Compare this job with another one, pair by pair.
+
+        Pairs with the same fingerprint(see ``Single.fingerprint()``) are not looked into,
+        and fingerprints are cached, so comparing two big jobs that differ in one key costs about one lookup per key.
+        Use ``keys()`` of the result to decide whether a job has to be reloaded.
+
+        Example::
+
+            patch = old.diff(new)
+            if patch.keys() & {'Program', 'ProgramArguments', 'StartCalendarInterval'}:
+                ...
+            old.apply(patch)
+
+        Args:
+            other (Job): the new job
+
+        Returns:
+            JobPatch: what changed from self to other
+        '''
+        patch = JobPatch()
+        if self.fingerprint() == other.fingerprint():
+            return patch
+        mine = _pairsByKey(self)
+        theirs = _pairsByKey(other)
+        for key, new in theirs.items():
+            old = mine.get(key)
+            if old is None:
+                patch.added[key] = new
+            elif old.fingerprint() != new.fingerprint():
+                if _unorderedArray(old, new):
+                    added, removed = diffEntries(old, new)
+                    if not added and not removed:
+                        continue
+                    patch.entries[key] = (added, removed)
+                patch.changed[key] = (old, new)
+        for key, old in mine.items():
+            if key not in theirs:
+                patch.removed[key] = old
+        return patch
+
+    def apply(self, patch):
+        '''Apply a patch made by ``diff()`` to this job.
+
+        Removed pairs are removed, added pairs are added. A changed pair is replaced by the new one,
+        except for the pairs with entry by entry changes: only those entries are removed and added,
+        the rest of the pair(and its render cache) stays as it is.
+        The pairs of the patch are put into the job as they are, like ``add()`` does.
+
+        Args:
+            patch (JobPatch): the patch
+
+        Returns:
+            Job: self
+        '''
+        mine = _pairsByKey(self)
+        dropped = set(patch.removed)
+        replaced = {}
+        for key, (old, new) in patch.changed.items():
+            pair = mine.get(key)
+            if key in patch.entries and pair is not None and _unorderedArray(
+                    pair, new):
+                self._patchEntries(pair, *patch.entries[key])
+            else:
+                replaced[key] = new
+        if dropped or replaced:
+            value = []
+            for element in self.value:
+                key = element.key if isinstance(element, Pair) else None
+                if key in dropped:
+                    continue
+                value.append(replaced.pop(key, element))
+            # changed pairs that this job doesn't have are added
+            value += replaced.values()
+            self.value[:] = value
+            self.invalidate()
+        self._add([
+            pair for key, pair in patch.added.items() if key not in dropped
+        ], self.value)
+        return self
+
+    def _patchEntries(self, pair, added, removed):
+        '''Remove one entry of pair for every entry in removed, then add the added ones. See ``apply()``.'''
+        left = {}
+        for entry in removed:
+            key = structuralKey(entry)
+            left[key] = left.get(key, 0) + 1
+        kept = []
+        for entry in pair.l:
+            key = structuralKey(entry) if left else None
+            if left.get(key):
+                left[key] -= 1
+                continue
+            kept.append(entry)
+        pair.l[:] = kept + list(added)
+        pair.value[0].invalidate()
+
+    def printMe(self, selfTag, selfValue):
+        '''Parse the job into plist format.
+
+        Args:
+            selfTag (str): The tag. Usually ``self.tag``
+            selfValue (list): The value list. Usually ``self.value``'''
+        if core._sink is not nullSink and selfValue is self.value:
+            buffer = []
+            self._renderTimed(buffer.append)
+            return ''.join(buffer)
+        return ''.join(self._chunks(selfTag, selfValue, ''))
+
+
+@registerEmitter(Job)
+def emitJob(node, selfTag, selfValue, write, pad):
+    '''Emitter of Job, see ``Job.iterChunks()``.'''
+    for chunk in node._chunks(selfTag, selfValue, pad):
+        write(chunk)
+
+
+class JobPatch():
+    '''The difference between two jobs, made by ``Job.diff()`` and applied by ``Job.apply()``.
+
+    Pairs are matched by their key. A pair that is in both jobs but doesn't have the same fingerprint is changed.
+    For StartCalendarInterval, WatchPaths and QueueDirecotries the order of the entries doesn't matter to launchd,
+    so their change is also given entry by entry, and a pair whose entries were only reordered is not changed.
+
+    Properties:
+        added (dict): key -> pair, pairs that are only in the new job
+        removed (dict): key -> pair, pairs that are only in the old job
+        changed (dict): key -> (old pair, new pair)
+        entries (dict): key -> (added entries, removed entries), for the changed pairs whose entries can be patched one by one
+    '''
+
+    def __init__(self):
+        self.added = {}
+        self.removed = {}
+        self.changed = {}
+        self.entries = {}
+
+    def keys(self):
+        '''Returns:
+            set: the keys of every added, removed and changed pair
+        '''
+        return set(self.added) | set(self.removed) | set(self.changed)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return '<JobPatch added={} removed={} changed={}>'.format(
+            sorted(self.added), sorted(self.removed), sorted(self.changed))
+
+
+def _pairsByKey(job):
+    '''key -> pair of the pairs in a job. If a key is there twice, the last one counts, as in launchd.'''
+    return {
+        element.key: element
+        for element in job.value if isinstance(element, Pair)
+    }
+
+
+def _unorderedArray(old, new):
+    '''Whether old and new are the same kind of pair whose entries can be diffed and patched one by one.'''
+    return old.__class__ is new.__class__ and isinstance(
+        old, (StartCalendarInterval, WatchPaths, QueueDirecotries))
+
+
+def diffEntries(old, new):
+    '''Compare the entries of two pairs that hold an array, like two StartCalendarIntervals, ignoring their order.
+
+    Entries are compared by structure, through the membership index of both arrays.
+
+    Args:
+        old (Pair): StartCalendarInterval, WatchPaths or QueueDirecotries
+        new (Pair): a pair of the same class
+
+    Returns:
+        tuple: (entries only in new, entries only in old), both lists
+    '''
+    oldCounts = old.value[0]._membership()
+    newCounts = new.value[0]._membership()
+    added = []
+    # how many of every entry are still to be reported
+    extra = {}
+    for entry in new.l:
+        key = structuralKey(entry)
+        left = extra.get(key)
+        if left is None:
+            left = newCounts[key] - oldCounts.get(key, 0)
+        if left > 0:
+            added.append(entry)
+        extra[key] = left - 1
+    removed = []
+    extra = {}
+    for entry in old.l:
+        key = structuralKey(entry)
+        left = extra.get(key)
+        if left is None:
+            left = oldCounts[key] - newCounts.get(key, 0)
+        if left > 0:
+            removed.append(entry)
+        extra[key] = left - 1
+    return added, removed
@@ -0,0 +1,718 @@
+'''The config classes, one per launchd key, and the tables that build them from plist values.'''
+from .core import (ArraySingle, BoolPair, BoolSingle, DictSingle,
+                   IntegerSingle, internLeaf, nodeFromValue, OuterOFInnerPair,
+                   Pair, SingleDictPair, SingleIntegerPair, SingleStringPair,
+                   StringSingle)
+from .calendar import checkCalendarEntry, StartCalendarInterval, StartInterval
+
+
+class Label(SingleStringPair):
+    '''Label config
+
+    Example::
+
+        config = Label('some-label')
+        config.changeTo('some-other-label')
+
+    '''
+    __slots__ = ()
+
+
+class Program(SingleStringPair):
+    '''Program config
+
+    Example::
+
+        config = Program('/path/to/program')
+        config.changeTo('/new/path/to/program')
+
+    '''
+    __slots__ = ()
+
+
+class ProgramArguments(OuterOFInnerPair):
+    '''ProgramArguments config
+
+    Example::
+
+        config = ProgramArguments(['-r', '--outfile', '-m'])
+        config = ProgramArguments('-r')
+        config = ProgramArguments('-r', '-m', '--file')
+        config.remove('-r')
+        config.add('--kill')
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, *l):
+        '''init
+
+        Args
+            *l: argument(s) you want to pass
+        '''
+        super().__init__(ArraySingle, StringSingle, l)
+
+
+class EnvironmentVariables(Pair):
+    '''EnvironmentVariables config
+
+    Example::
+
+        config = EnvironmentVariables('/bin:/usr/bin:/usr/local/bin')
+        config.changeTo('some-other-env')
+
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, path):
+        '''init
+
+        Args:
+            path (str): the environment
+        '''
+        super().__init__()
+        self.changeTo(path)
+
+    def changeTo(self, path):
+        '''change value
+
+        Args:
+            path (str): the new environment path
+        '''
+        dictionary = DictSingle(Pair('PATH', internLeaf(StringSingle, path)))
+        self.value = [dictionary]
+        self.invalidate()
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from a dict read from a plist. See ``Pair.fromValue()``.
+
+        All the variables are kept, not only PATH.
+        '''
+        if not isinstance(value, dict):
+            raise TypeError('{} expects a dict'.format(cls.__name__))
+        pair = cls(value.get('PATH', ''))
+        pair.value = [nodeFromValue(value)]
+        if key:
+            pair.key = key
+        return pair
+
+
+class StandardInPath(SingleStringPair):
+    '''StandardInPath config
+
+    Example::
+
+        config = StandardInPath('/tmp/in')
+        config.changeTo('some/other/path')
+
+    '''
+    __slots__ = ()
+
+
+class StandardOutPath(SingleStringPair):
+    '''StandardOutPath config
+
+    Example::
+
+        config = StandardOutPath('/tmp/out')
+        config.changeTo('some/other/path')
+
+    '''
+    __slots__ = ()
+
+
+class StandardErrorPath(SingleStringPair):
+    '''StandardErrorPath config
+
+    Example::
+
+        config = StandardErrorPath('/tmp/error')
+        config.changeTo('some/other/path')
+
+    '''
+    __slots__ = ()
+
+
+class WorkingDirectory(SingleStringPair):
+    '''WorkingDirectory config
+
+    Example::
+
+        config = WorkingDirectory('/home')
+        config.changeTo('some/other/path')
+
+    '''
+    __slots__ = ()
+
+
+class SoftResourceLimit(SingleDictPair):
+    '''SoftResourceLimit config
+
+    Example::
+
+        config = SoftResourceLimit({'CPU': 2, 'FileSize': 1024})
+        config.add({'NumberOfFiles': 10})
+        config.remove({'CPU': 2})
+
+    Avaliable keys are: CPU, FileSize, NumberOfFiles, Core, Data, MemoryLock, NumberOfProcesses, ResidentSetSize, Stack.
+
+    '''
+    __slots__ = ()
+    keyWord = [
+        'CPU', 'FileSize', 'NumberOfFiles', 'Core', 'Data', 'MemoryLock',
+        'NumberOfProcesses', 'ResidentSetSize', 'Stack'
+    ]
+
+
+class HardResourceLimit(SingleDictPair):
+    '''HardResourceLimit config
+
+    Example::
+
+        config = HardResourceLimit({'CPU': 2, 'FileSize': 1024})
+        config.add({'NumberOfFiles': 10})
+        config.remove({'CPU': 2})
+
+    Avaliable keys are: CPU, FileSize, NumberOfFiles, Core, Data, MemoryLock, NumberOfProcesses, ResidentSetSize, Stack.
+
+    '''
+    __slots__ = ()
+    keyWord = [
+        'CPU', 'FileSize', 'NumberOfFiles', 'Core', 'Data', 'MemoryLock',
+        'NumberOfProcesses', 'ResidentSetSize', 'Stack'
+    ]
+
+
+class RunAtLoad(BoolPair):
+    '''RunAtLoad config
+
+    Example::
+
+        config = RunAtLoad()
+    '''
+    __slots__ = ()
+
+
+class StartOnMount(BoolPair):
+    '''StartOnMount config
+
+    Example::
+
+        config = StartOnMount()
+    '''
+    __slots__ = ()
+
+
+class WatchPaths(OuterOFInnerPair):
+    '''WatchPaths config
+
+    Example::
+
+        config = WatchPaths(['/path1', '/path2', '/path3'])
+        config = WatchPaths('/path2')
+        config = WatchPaths('/path1', '/path2', '/path3')
+        config.remove('/path1')
+        config.add('/path1')
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, *l):
+        '''init
+
+        Args
+            *l: path you want to watch
+        '''
+        super().__init__(ArraySingle, StringSingle, l)
+
+
+class QueueDirecotries(OuterOFInnerPair):
+    '''QueueDirectories config
+
+    Example::
+
+        config = QueueDirectories(['/path1', '/path2', '/path3'])
+        config = QueueDirectories('/path2')
+        config = QueueDirectories('/path1', '/path2', '/path3')
+        config.remove('/path1')
+        config.add('/path1')
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, *l):
+        '''init
+
+        Args
+            *l: path you want to watch
+        '''
+        super().__init__(ArraySingle, StringSingle, l)
+        # the class name is misspelled, the key launchd reads is not
+        self.key = 'QueueDirectories'
+
+
+# Keep Alive class in two branch classes and a factory function
+class KeepAliveAlways(BoolPair):
+    '''KeepAlive option'''
+
+    __slots__ = ()
+
+    def __init__(self):
+        self.key = 'KeepAlive'
+        self.setToTrue()
+
+
+class KeepAliveDepends(OuterOFInnerPair):
+    __slots__ = ()
+
+    def __init__(self, *key):
+        super().__init__(DictSingle, BoolPair, *key)
+        self.key = 'KeepAlive'
+
+    def addKey(self, key, *value):
+        self._add([key(*value)], self.l)
+
+    def removeKey(self, key, *value):
+        self._remove([key(*value)], self.l)
+
+    @classmethod
+    def fromValue(cls, value, key=None):
+        '''Build the pair from a dict read from a plist. See ``Pair.fromValue()``.
+
+        Known options(SuccessfulExit, Crashed, OtherJobEnabled, ...) are built with their classes, others are kept as generic pairs.
+        '''
+        if not isinstance(value, dict):
+            raise TypeError('{} expects a dict'.format(cls.__name__))
+        pair = cls()
+        pair._add([
+            configFromValue(name, option, keepAliveOptions)
+            for name, option in value.items()
+        ], pair.l)
+        return pair
+
+
+def KeepAlive(branch='always', *key):
+    '''KeepAlive config
+
+    Example::
+
+        config = KeepAlive('always') # keepAlive no matter what
+        config2 = KeepAlive('depends', SuccessfulExit())
+        config2.addKey(Crashed())
+        config2.removeKey(Crashed())
+        config2.addKey(OtherJobEnabled('some-job'))
+
+    You can also use ``KeepAliveAlways()`` or ``KeepAliveDepends()``, ``KeepAlive()`` is just a helper function that returns either one of the two classes.
+
+    Args:
+        branch (str): indicates which version of ``KeepAlive`` you want, can be either 'always' or 'depends'.
+        *key (str): If there is any key to be passed to depend version of ``KeepAlive``, put it in ``key``. Possible keys are ``SuccessfulExit()``, ``Crashed()``, ``OtherJobEnabled()``, ``AfterInitialDemand()`` and ``PathState()``.
+
+
+    Raises:
+        KeyError: if branch is not one of 'always' and 'depends'
+
+    Returns:
+        class: the actual class. Either ``KeepAliveAlways`` or ``KeepAliveDepends``.
+    '''
+    if branch == 'always':
+        return KeepAliveAlways()
+    elif branch == 'depends':
+        return KeepAliveDepends(key)
+    else:
+        raise KeyError('branch only accept either \'always\' or \'depends\'')
+
+
+def keepAliveFromValue(value, key=None):
+    '''Build ``KeepAliveAlways`` from a bool or ``KeepAliveDepends`` from a dict read from a plist. See ``Pair.fromValue()``.'''
+    if isinstance(value, bool):
+        pair = KeepAliveAlways()
+        if not value:
+            pair.setToFalse()
+        return pair
+    return KeepAliveDepends.fromValue(value)
+
+
+class SuccessfulExit(BoolPair):
+    '''SuccessfulExit option for KeepAlive'''
+    __slots__ = ()
+
+
+class Crashed(BoolPair):
+    '''Crashed option for KeepAlive'''
+    __slots__ = ()
+
+
+class OtherJobEnabled(OuterOFInnerPair):
+    '''OtherJobEnabled option for KeepAlive
+
+    Example::
+
+        OtherJobEnabled('some-job')
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, *key):
+        '''init
+
+        Args
+            *l: job you want to refer to
+        '''
+        super().__init__(DictSingle, BoolPair, *key)
+
+
+class AfterInitialDemand(OuterOFInnerPair):
+    '''AfterInitialDemand option for KeepAlive'''
+
+    __slots__ = ()
+
+    def __init__(self, *key):
+        '''init
+
+        Args
+            *l: job you want to refer to
+        '''
+        super().__init__(DictSingle, BoolPair, *key)
+
+
+# MARK: add after initial demand
+class PathState(OuterOFInnerPair):
+    '''PathState option for KeepAlive'''
+
+    __slots__ = ()
+
+    def __init__(self, *key):
+        '''init
+
+        Args
+            *l: path you want to refer to
+        '''
+        super().__init__(DictSingle, BoolPair, *key)
+
+
+# KeepAlive ends
+
+
+class UserName(SingleStringPair):
+    '''UserName config
+
+    Example::
+
+        config = UserName('some-user')
+        config.changeTo('some-other-user')
+    '''
+    __slots__ = ()
+
+
+class GroupName(SingleStringPair):
+    '''GroupName config
+
+    Example::
+
+        config = GroupName('some-group')
+        config.changeTo('some-other-group')
+    '''
+    __slots__ = ()
+
+
+class InitGroups(SingleStringPair):
+    '''Label InitGroups
+
+    Example::
+
+        config = InitGroups('some-group')
+        config.changeTo('some-other-group')
+    '''
+    __slots__ = ()
+
+
+class Umask(SingleIntegerPair):
+    '''Umask config
+
+    Example::
+
+        config = Label(0)
+        config.changeTo(1)
+    '''
+    __slots__ = ()
+
+
+class RootDirecotry(SingleStringPair):
+    '''RootDirecotry config
+
+    Example::
+
+        config = RootDirecotry('some-dir')
+        config.changeTo('some-other-dir')
+    '''
+    __slots__ = ()
+
+    def __init__(self, string):
+        super().__init__(string)
+        self.key = 'RootDirectory'
+
+
+class AbandonProcessGroup(BoolPair):
+    '''AbandonProcessGroup config
+
+    Example::
+
+        config = AbandonProcessGroup()
+    '''
+    __slots__ = ()
+
+
+class ExitTimeOut(SingleIntegerPair):
+    '''ExitTimeOut config
+
+    Example::
+
+        config = Label(30)
+        config.changeTo(60)
+    '''
+    __slots__ = ()
+
+
+class Timeout(SingleIntegerPair):
+    '''Timeout config
+
+    Example::
+
+        config = Timeout(30)
+        config.changeTo(60)
+    '''
+    __slots__ = ()
+
+
+class ThrottleInverval(SingleIntegerPair):
+    '''ThrottleInverval config
+
+    Example::
+
+        config = Label(5)
+        config.changeTo(10)
+        KeepAlive('always', ThrottleInverval(5))
+
+    '''
+    __slots__ = ()
+
+    def __init__(self, integer):
+        super().__init__(integer)
+        self.key = 'ThrottleInterval'
+
+
+class LegacyTimers(BoolPair):
+    '''LegacyTimers config
+
+    Example::
+
+        config = LegacyTimers()
+    '''
+    __slots__ = ()
+
+
+class Nice(SingleIntegerPair):
+    '''Nice config
+
+    Example::
+
+        config = Nice(-5)
+        config.changeTo(20)
+    '''
+    __slots__ = ()
+
+
+# plist key -> function that builds the config from a value, see Pair.fromValue()
+configReaders = {
+    cls.__name__: cls.fromValue
+    for cls in (Label, Program, ProgramArguments, EnvironmentVariables,
+                StandardInPath, StandardOutPath, StandardErrorPath,
+                WorkingDirectory, SoftResourceLimit, HardResourceLimit,
+                RunAtLoad, StartInterval, StartCalendarInterval, StartOnMount,
+                WatchPaths, UserName, GroupName, InitGroups, Umask,
+                AbandonProcessGroup, ExitTimeOut, Timeout, LegacyTimers, Nice)
+}
+configReaders['KeepAlive'] = keepAliveFromValue
+# the classes with a typo in their names are found by the real key
+configReaders['QueueDirectories'] = QueueDirecotries.fromValue
+configReaders['RootDirectory'] = RootDirecotry.fromValue
+configReaders['ThrottleInterval'] = ThrottleInverval.fromValue
+
+# options inside a KeepAlive dict
+keepAliveOptions = {
+    cls.__name__: cls.fromValue
+    for cls in (SuccessfulExit, Crashed, OtherJobEnabled, AfterInitialDemand,
+                PathState)
+}
+
+
+def configFromValue(key, value, readers=configReaders):
+    '''Build the config for a key and value read from a plist.
+
+    Known keys are built with their config class(``Label``, ``ProgramArguments``, ``StartCalendarInterval``...).
+    Unknown keys, and known keys whose value doesn't fit the class(wrong type, a bad calendar key or value out of range),
+    become generic pairs, so that any plist can be read. ``launchdman.schema.validate()`` reports them.
+
+    Args:
+        key (str): the key
+        value: the value as returned by ``loadPlist()``
+        readers (dict): key -> reader table. Default to ``configReaders``.
+
+    Returns:
+        Pair: the config
+    '''
+    reader = readers.get(key)
+    if reader is not None:
+        try:
+            return reader(value, key)
+        except (TypeError, ValueError, AttributeError):
+            pass
+    return Pair.fromValue(value, key)
+
+
+# Bulk construction
+#
+# The builders make the same trees as the fromValue() of their classes,
+# but set the slots directly instead of going through __init__(), flatten() and add().
+
+
+def _newSingle(cls, tag, value):
+    '''A single of cls with tag and value, without calling __init__().'''
+    node = cls.__new__(cls)
+    node.tag = tag
+    node.value = value
+    return node
+
+
+def _newPair(cls, key, value):
+    '''A pair of cls with key and value, without calling __init__().'''
+    pair = cls.__new__(cls)
+    pair.key = key
+    pair.value = value
+    return pair
+
+
+def _buildString(cls, value, key):
+    if not isinstance(value, str):
+        raise TypeError('{} expects a string'.format(cls.__name__))
+    return _newPair(cls, key, [internLeaf(StringSingle, value)])
+
+
+def _buildInteger(cls, value, key):
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise TypeError('{} expects an integer'.format(cls.__name__))
+    return _newPair(cls, key, [internLeaf(IntegerSingle, value)])
+
+
+def _buildBool(cls, value, key):
+    if not isinstance(value, bool):
+        raise TypeError('{} expects a bool'.format(cls.__name__))
+    return _newPair(cls, key,
+                    [internLeaf(BoolSingle, 'true' if value else 'false')])
+
+
+def _buildInterval(cls, value, key):
+    pair = _buildInteger(cls, value, key)
+    # as every(value).second
+    pair.baseNumber = value
+    pair.magnification = 1
+    return pair
+
+
+def _buildStrings(cls, value, key):
+    if not isinstance(value, list) or not all(
+            isinstance(a, str) for a in value):
+        raise TypeError('{} expects a list of strings'.format(cls.__name__))
+    outer = _newSingle(ArraySingle, 'array',
+                     [internLeaf(StringSingle, a) for a in value])
+    pair = _newPair(cls, key, [outer])
+    pair.l = outer.value
+    pair.Outer = ArraySingle
+    pair.Inner = StringSingle
+    return pair
+
+
+def _buildCalendar(cls, value, key):
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list):
+        raise TypeError('{} expects dicts of integers'.format(cls.__name__))
+    entries = []
+    for d in value:
+        if not isinstance(d, dict):
+            raise TypeError('{} expects dicts of integers'.format(
+                cls.__name__))
+        pairs = []
+        for k, v in d.items():
+            if not isinstance(v, int) or isinstance(v, bool):
+                raise TypeError('{} expects dicts of integers'.format(
+                    cls.__name__))
+            pairs.append(_newPair(Pair, k, [internLeaf(IntegerSingle, v)]))
+        # the same check as StartCalendarInterval.add(), so both ways of reading a plist agree
+        checkCalendarEntry(d)
+        entries.append(_newSingle(DictSingle, 'dict', pairs))
+    outer = _newSingle(ArraySingle, 'array', entries)
+    pair = _newPair(cls, key, [outer])
+    pair.l = outer.value
+    return pair
+
+
+def _buildDict(cls, value, key):
+    if not isinstance(value, dict):
+        raise TypeError('{} expects a dict'.format(cls.__name__))
+    outer = _newSingle(DictSingle, 'dict', [
+        _newPair(Pair, k, [nodeFromValue(v)]) for k, v in value.items()
+    ])
+    pair = _newPair(cls, key, [outer])
+    pair.d = outer.value
+    return pair
+
+
+def _buildEnvironment(cls, value, key):
+    if not isinstance(value, dict):
+        raise TypeError('{} expects a dict'.format(cls.__name__))
+    return _newPair(cls, key, [nodeFromValue(value)])
+
+
+def _buildKeepAlive(cls, value, key):
+    # a dict is KeepAliveDepends, see keepAliveFromValue()
+    if isinstance(value, bool):
+        return _buildBool(KeepAliveAlways, value, 'KeepAlive')
+    return keepAliveFromValue(value, key)
+
+
+def _builderOf(cls):
+    '''The builder of a config class, or None if it has to be built by its fromValue().'''
+    if issubclass(cls, SingleStringPair):
+        return _buildString
+    if issubclass(cls, StartInterval):
+        return _buildInterval
+    if issubclass(cls, SingleIntegerPair):
+        return _buildInteger
+    if issubclass(cls, BoolPair):
+        return _buildBool
+    if issubclass(cls, StartCalendarInterval):
+        return _buildCalendar
+    if issubclass(cls, SingleDictPair):
+        return _buildDict
+    if issubclass(cls, EnvironmentVariables):
+        return _buildEnvironment
+    if issubclass(cls, OuterOFInnerPair):
+        prototype = cls()
+        if prototype.Outer is ArraySingle and prototype.Inner is StringSingle:
+            return _buildStrings
+    return None
+
+
+# plist key -> (builder, config class), see Job.fromDict(). Made from configReaders,
+# keys whose reader is not a config class are read by configFromValue()
+configBuilders = {'KeepAlive': (_buildKeepAlive, KeepAliveAlways)}
+for _key, _reader in configReaders.items():
+    _cls = getattr(_reader, '__self__', None)
+    _builder = _builderOf(_cls) if isinstance(_cls, type) else None
+    if _builder is not None:
+        configBuilders[_key] = (_builder, _cls)
+del _key, _reader, _cls, _builder
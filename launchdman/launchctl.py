@@ -0,0 +1,395 @@
+'''Running launchctl for a lot of jobs with as few processes as possible.
+
+Operations are queued on a ``LaunchctlRunner`` and run together by ``run()``::
+
+    runner = LaunchctlRunner()
+    runner.bootout(oldJobs)
+    runner.bootstrap(newJobs)
+    runner.kickstart(newJobs, kill=True)
+    report = runner.run()
+
+launchctl itself is called through a backend, a callable that takes the arguments(without ``launchctl``)
+and gives back (returncode, stdout, stderr). ``SubprocessBackend`` runs the real one(or any script that acts like it),
+``RecordingBackend`` only remembers the calls, for tests.
+'''
+import os
+import subprocess
+import time
+
+from . import core
+from .core import nullSink
+from .keys import Label
+
+# operations run phase by phase, so that a service is booted out before it's bootstrapped again,
+# and bootstrapped before it's kickstarted
+_phases = ('bootout', 'bootstrap', 'kickstart')
+
+# verb -> (return codes, messages) of launchctl saying there was nothing to do:
+# the service was loaded already(bootstrap) or wasn't loaded(bootout). Those operations count as done
+_nothingToDo = {
+    'bootstrap': ((17, 37), ('already loaded', 'already bootstrapped',
+                             'File exists', 'Operation already in progress')),
+    'bootout': ((3, 113), ('Could not find', 'No such process', 'not loaded')),
+}
+
+
+def _isNothingToDo(verb, returncode, stderr):
+    codes, messages = _nothingToDo.get(verb, ((), ()))
+    return returncode in codes or any(message in stderr
+                                      for message in messages)
+
+
+def _namedFailures(stderr, paths):
+    '''The plists of a batch that launchctl complained about, from lines like "<path>: <message>".
+
+    Returns:
+        dict: path -> message
+    '''
+    named = {}
+    for line in stderr.splitlines():
+        path, sep, message = line.partition(': ')
+        if sep and path in paths:
+            named[path] = message
+    return named
+
+
+def defaultDomain():
+    '''The domain of the current user: 'system' for root, 'gui/<uid>' for everybody else.'''
+    uid = os.getuid()
+    return 'system' if uid == 0 else 'gui/{}'.format(uid)
+
+
+def _labelOf(job):
+    for config in job.value:
+        if isinstance(config, Label):
+            return config.value[0].value[0]
+    raise ValueError('job {} has no Label'.format(job.me))
+
+
+def _target(item):
+    '''(label, path) of a Job, a Label or a label string. path is None if there is no plist.'''
+    if isinstance(item, str):
+        return item, None
+    if isinstance(item, Label):
+        return item.value[0].value[0], None
+    return _labelOf(item), str(item.me)
+
+
+def _targets(items):
+    '''Flatten lists of targets, like ``Job.add()`` does with configs.'''
+    for item in items:
+        if isinstance(item, (list, tuple)):
+            yield from _targets(item)
+        else:
+            yield item
+
+
+class SubprocessBackend():
+    '''Run launchctl as a subprocess.
+
+    Example::
+
+        # record calls with a fake launchctl on a machine without launchd
+        runner = LaunchctlRunner(SubprocessBackend('./fake-launchctl'))
+
+    Args:
+        executable (str): the launchctl to run
+        timeout (float): seconds an invocation may take, None for no limit
+    '''
+
+    def __init__(self, executable='launchctl', timeout=60):
+        self.executable = executable
+        self.timeout = timeout
+
+    def __call__(self, args):
+        try:
+            done = subprocess.run(
+                [self.executable] + list(args),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=self.timeout,
+                universal_newlines=True)
+        except subprocess.TimeoutExpired:
+            return -1, '', 'timed out after {}s'.format(self.timeout)
+        return done.returncode, done.stdout, done.stderr
+
+
+class RecordingBackend():
+    '''A backend that doesn't run anything, it only records the calls.
+
+    Properties:
+        calls (list): the arguments of every call, in the order they were made
+
+    Args:
+        fail (callable): called with the arguments, returns the return code to give. Default to 0 for everything.
+    '''
+
+    def __init__(self, fail=None):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, args):
+        # list.append is atomic, the runner calls it from several threads
+        self.calls.append(list(args))
+        returncode = self.fail(args) if self.fail is not None else 0
+        return returncode, '', '' if returncode == 0 else 'failed'
+
+
+class LaunchctlReport():
+    '''What ``LaunchctlRunner.run()`` did.
+
+    Properties:
+        succeeded (list): (verb, domain, label) of operations that worked
+        failed (list): (verb, domain, label, returncode, stderr) of operations that still failed after the retries
+        invocations (int): how many times launchctl was called, retries included
+        totalTime (float): wall clock seconds of the whole run
+    '''
+
+    def __init__(self):
+        self.succeeded = []
+        self.failed = []
+        self.invocations = 0
+        self.totalTime = 0.0
+
+    def counts(self):
+        '''Returns:
+            dict: number of succeeded and failed operations, and of invocations
+        '''
+        return {
+            'succeeded': len(self.succeeded),
+            'failed': len(self.failed),
+            'invocations': self.invocations
+        }
+
+    def __repr__(self):
+        return '<LaunchctlReport succeeded={succeeded} failed={failed} invocations={invocations} in {time:.3f}s>'.format(
+            time=self.totalTime, **self.counts())
+
+
+class LaunchctlRunner():
+    '''Queue launchctl operations on jobs, and run them in batches.
+
+    ``bootstrap`` and ``bootout`` of jobs take a list of plists, so all of them in the same domain
+    go into one invocation(up to batchSize plists). ``kickstart`` and ``bootout`` of a bare Label
+    take one service each, those are only run at the same time.
+    Batches of the same phase(bootout, bootstrap, then kickstart) run concurrently on workers threads.
+
+    bootstrap and bootout are not idempotent, so a batch that fails is not run again as a whole.
+    The plists launchctl names in its errors("<path>: <message>") are run again one at a time,
+    or every plist of the batch if it names none. launchctl answering that a service is loaded already(bootstrap)
+    or isn't loaded(bootout) counts as success, so the plists the batch did load or unload are not reported as failed.
+    An operation run on its own is retried with exponential backoff: backoff, 2 * backoff, 4 * backoff, ... seconds,
+    and reported as failed if it still fails.
+
+    Args:
+        backend (callable): runs launchctl, default to ``SubprocessBackend()``
+        domain (str): default domain target, e.g. 'gui/501' or 'system'. Default to ``defaultDomain()``
+        workers (int): how many invocations run at once
+        retries (int): how many times a failed invocation is retried
+        backoff (float): seconds before the first retry
+        batchSize (int): most plists in one invocation
+    '''
+
+    def __init__(self,
+                 backend=None,
+                 domain=None,
+                 workers=4,
+                 retries=2,
+                 backoff=0.1,
+                 batchSize=100):
+        self.backend = backend if backend is not None else SubprocessBackend()
+        self.domain = domain if domain is not None else defaultDomain()
+        self.workers = workers
+        self.retries = retries
+        self.backoff = backoff
+        self.batchSize = batchSize
+        # (verb, domain, label, path, options) in the order they were queued, without repeats
+        self._operations = {}
+
+    def _queue(self, verb, targets, domain, options=()):
+        domain = domain if domain is not None else self.domain
+        for item in _targets(targets):
+            label, path = _target(item)
+            if verb == 'bootstrap' and path is None:
+                raise ValueError(
+                    'bootstrap needs the plist, give the Job of {!r}'.format(
+                        label))
+            operation = (verb, domain, label, path, tuple(options))
+            self._operations[operation] = None
+        return self
+
+    def bootstrap(self, *jobs, domain=None):
+        '''Queue loading jobs into a domain.
+
+        Args:
+            jobs: Jobs, or lists of them
+            domain (str): domain target, default to the runner's
+
+        Returns:
+            LaunchctlRunner: the runner, so calls can be chained
+        '''
+        return self._queue('bootstrap', jobs, domain)
+
+    def bootout(self, *targets, domain=None):
+        '''Queue unloading jobs from a domain.
+
+        Args:
+            targets: Jobs, Labels or label strings, or lists of them. Jobs are booted out by their plist, the others by their service target.
+            domain (str): domain target, default to the runner's
+
+        Returns:
+            LaunchctlRunner: the runner, so calls can be chained
+        '''
+        return self._queue('bootout', targets, domain)
+
+    def kickstart(self, *targets, domain=None, kill=False):
+        '''Queue starting jobs right away.
+
+        Args:
+            targets: Jobs, Labels or label strings, or lists of them
+            domain (str): domain target, default to the runner's
+            kill (bool): kill a running instance first(``kickstart -k``)
+
+        Returns:
+            LaunchctlRunner: the runner, so calls can be chained
+        '''
+        return self._queue('kickstart', targets, domain, ('-k', ) if kill else ())
+
+    def pending(self):
+        '''Returns:
+            list: (verb, domain, label) of the queued operations
+        '''
+        return [operation[:3] for operation in self._operations]
+
+    def clear(self):
+        '''Forget the queued operations.'''
+        self._operations.clear()
+
+    def batches(self):
+        '''The invocations ``run()`` would make, phase by phase.
+
+        Returns:
+            list: for every phase, a list of (args, operations)
+        '''
+        phases = []
+        for phase in _phases:
+            grouped = {}
+            singles = []
+            for operation in self._operations:
+                verb, domain, label, path, options = operation
+                if verb != phase:
+                    continue
+                if path is not None and verb in ('bootstrap', 'bootout'):
+                    grouped.setdefault(domain, []).append(operation)
+                else:
+                    singles.append(operation)
+            batches = []
+            for domain, operations in grouped.items():
+                for start in range(0, len(operations), self.batchSize):
+                    chunk = operations[start:start + self.batchSize]
+                    batches.append(([phase, domain] + [op[3] for op in chunk],
+                                    chunk))
+            for operation in singles:
+                batches.append((self._singleArgs(operation), [operation]))
+            if batches:
+                phases.append(batches)
+        return phases
+
+    def _singleArgs(self, operation):
+        verb, domain, label, path, options = operation
+        if verb in ('bootstrap', 'bootout') and path is not None:
+            return [verb, domain, path]
+        return [verb] + list(options) + ['{}/{}'.format(domain, label)]
+
+    def _invoke(self, args, report, attempt=0):
+        '''Call the backend once. Returns (returncode, stderr).'''
+        if core._sink is not nullSink:
+            start = time.perf_counter_ns()
+        try:
+            returncode, _, stderr = self.backend(args)
+        except OSError as error:
+            returncode, stderr = -1, str(error)
+        report.invocations += 1
+        if core._sink is not nullSink:
+            core._sink('launchctl', {
+                'verb': args[0],
+                'ns': time.perf_counter_ns() - start,
+                'attempt': attempt,
+                'failed': 1 if returncode else 0
+            })
+        return returncode, stderr or ''
+
+    def _call(self, args, report):
+        '''Call the backend for one operation, retrying with backoff.
+
+        An answer that there was nothing to do(see ``_nothingToDo``) counts as success, it's not retried.
+
+        Returns:
+            (returncode, stderr) of the last try, returncode is 0 for success
+        '''
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2**(attempt - 1))
+            returncode, stderr = self._invoke(args, report, attempt)
+            if returncode == 0 or _isNothingToDo(args[0], returncode, stderr):
+                return 0, stderr
+        return returncode, stderr
+
+    def _runBatch(self, args, operations, report):
+        if len(operations) == 1:
+            returncode, stderr = self._call(args, report)
+            if returncode == 0:
+                report.succeeded.append(operations[0][:3])
+            else:
+                report.failed.append(operations[0][:3] + (returncode, stderr))
+            return report
+        # bootstrap and bootout are not idempotent, a batch is run once and never again as a whole
+        returncode, stderr = self._invoke(args, report)
+        if returncode == 0:
+            report.succeeded.extend(op[:3] for op in operations)
+            return report
+        named = _namedFailures(stderr, {op[3] for op in operations})
+        for operation in operations:
+            message = named.get(operation[3])
+            if message is None and named:
+                # launchctl named the plists that failed, and not this one
+                report.succeeded.append(operation[:3])
+            elif message is not None and _isNothingToDo(
+                    operation[0], None, message):
+                report.succeeded.append(operation[:3])
+            else:
+                # it failed, or we can't tell: run it on its own, "nothing to do" counts as done
+                self._runBatch(self._singleArgs(operation), [operation],
+                               report)
+        return report
+
+    def run(self):
+        '''Run the queued operations and clear the queue.
+
+        Returns:
+            LaunchctlReport: what worked and what didn't
+        '''
+        report = LaunchctlReport()
+        start = time.perf_counter()
+        phases = self.batches()
+        self.clear()
+        if phases:
+            # the pool brings in threading and logging, only pay for it here
+            import concurrent.futures
+            with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers) as executor:
+                for batches in phases:
+                    # every batch gets its own report, they are added up here on one thread
+                    futures = [
+                        executor.submit(self._runBatch, args, operations,
+                                        LaunchctlReport())
+                        for args, operations in batches
+                    ]
+                    for future in futures:
+                        done = future.result()
+                        report.succeeded.extend(done.succeeded)
+                        report.failed.extend(done.failed)
+                        report.invocations += done.invocations
+        report.totalTime = time.perf_counter() - start
+        return report
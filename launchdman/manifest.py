@@ -0,0 +1,282 @@
+'''An on-disk record of what was written for every job, so unchanged jobs are neither rendered nor written again.
+
+The manifest is a sqlite database. For every plist it keeps the fingerprint of the job(see ``Single.fingerprint()``),
+the digest of the bytes written, and the size and mtime of the file right after.
+A job whose fingerprint is the same and whose file still has that size and mtime is a hit::
+
+    with RenderManifest('~/.cache/launchdman.sqlite') as manifest:
+        report = writeAll(jobs, manifest=manifest)
+        print(manifest.stats())
+'''
+import os
+import sqlite3
+import threading
+import time
+
+from .core import blake2b
+
+_schema = '''
+CREATE TABLE IF NOT EXISTS manifest (
+    path TEXT PRIMARY KEY,
+    fingerprint BLOB NOT NULL,
+    digest BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    written REAL NOT NULL
+) WITHOUT ROWID
+'''
+
+# most variables in one statement on old sqlite builds
+_chunk = 900
+
+
+def digestOf(data):
+    '''The digest ``RenderManifest`` keeps of the bytes of a plist.
+
+    Args:
+        data (bytes): the plist
+
+    Returns:
+        bytes: a 16 bytes blake2b digest
+    '''
+    return blake2b(data, digest_size=16).digest()
+
+
+class RenderManifest():
+    '''A sqlite manifest of the plists written by ``writeAll()``.
+
+    Several threads and processes can use the same file: it is in WAL mode, writes are short transactions,
+    and a writer waits up to timeout seconds for another one instead of failing.
+    It compacts itself when it's closed: rows of plists that are gone are dropped,
+    and when more than a quarter of the file is free pages, they are given back to the file system.
+
+    Properties:
+        path (str): the database file
+        hits (int): jobs that were found unchanged since the manifest was opened
+        misses (int): jobs that had to be rendered
+
+    Args:
+        path (str): the database file, created if it doesn't exist. ':memory:' works too, for one process.
+        timeout (float): seconds to wait for another writer
+    '''
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path if path == ':memory:' else os.path.expanduser(
+            str(path))
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = None
+        # whether something was recorded since it was opened, only then close() compacts
+        self._dirty = False
+
+    def _connect(self):
+        if self._db is None:
+            db = sqlite3.connect(self.path, timeout=self.timeout,
+                                 isolation_level=None,
+                                 check_same_thread=False)
+            # incremental auto_vacuum only takes effect on a new database, before the first table
+            db.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            db.execute('PRAGMA journal_mode = WAL')
+            # in WAL mode NORMAL only syncs at checkpoints, a crash can lose the last records but not corrupt the file,
+            # and a lost record only means the job is rendered again
+            db.execute('PRAGMA synchronous = NORMAL')
+            db.execute(_schema)
+            self._db = db
+        return self._db
+
+    def lookup(self, paths):
+        '''Read the records of some plists.
+
+        Args:
+            paths (list): plist paths
+
+        Returns:
+            dict: path -> (fingerprint, digest, size, mtime_ns) of the paths that have a record
+        '''
+        paths = [str(path) for path in paths]
+        records = {}
+        with self._lock:
+            db = self._connect()
+            for start in range(0, len(paths), _chunk):
+                chunk = paths[start:start + _chunk]
+                rows = db.execute(
+                    'SELECT path, fingerprint, digest, size, mtime FROM manifest WHERE path IN ({})'.format(
+                        ','.join('?' * len(chunk))), chunk)
+                for path, fingerprint, digest, size, mtime in rows:
+                    records[path] = (fingerprint, digest, size, mtime)
+        return records
+
+    def unchanged(self, jobs):
+        '''Split jobs into the ones whose plist is already what they render to, and the others.
+
+        A job is unchanged if its fingerprint is the one recorded for its plist,
+        and the plist still has the recorded size and mtime. Only the plist is stat'ed, it's not read.
+        If only the mtime moved(someone touched it), the plist is read and compared with the recorded digest instead,
+        which still saves rendering the job.
+        Every job counts as a hit or a miss.
+
+        Args:
+            jobs (list): the jobs
+
+        Returns:
+            list: the unchanged jobs
+            list: the other jobs
+        '''
+        jobs = list(jobs)
+        records = self.lookup(job.me for job in jobs)
+        same = []
+        other = []
+        touched = []
+        for job in jobs:
+            record = records.get(str(job.me))
+            if record is not None and record[0] == job.fingerprint():
+                try:
+                    info = os.stat(job.me)
+                except FileNotFoundError:
+                    info = None
+                if info is not None and info.st_size == record[2]:
+                    if info.st_mtime_ns == record[3]:
+                        same.append(job)
+                        continue
+                    with open(job.me, 'rb') as f:
+                        if digestOf(f.read()) == record[1]:
+                            same.append(job)
+                            touched.append((job.me, record[0], record[1]))
+                            continue
+            other.append(job)
+        if touched:
+            self.record(touched)
+        with self._lock:
+            self.hits += len(same)
+            self.misses += len(other)
+        return same, other
+
+    def record(self, entries):
+        '''Remember what was written, in one transaction.
+
+        Args:
+            entries (list): (path, fingerprint, digest) of the plists, see ``digestOf()``.
+                The file is stat'ed here, so call it right after writing.
+        '''
+        rows = []
+        now = time.time()
+        for path, fingerprint, digest in entries:
+            path = str(path)
+            try:
+                info = os.stat(path)
+            except FileNotFoundError:
+                continue
+            rows.append((path, fingerprint, digest, info.st_size,
+                         info.st_mtime_ns, now))
+        if not rows:
+            return
+        with self._lock:
+            db = self._connect()
+            # IMMEDIATE takes the write lock up front, so two writers wait for each other instead of failing mid-way
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                db.executemany(
+                    'INSERT OR REPLACE INTO manifest VALUES (?, ?, ?, ?, ?, ?)',
+                    rows)
+                db.execute('COMMIT')
+            except BaseException:
+                # don't leave the connection in a transaction, every BEGIN after would fail
+                db.execute('ROLLBACK')
+                raise
+            self._dirty = True
+
+    def forget(self, paths):
+        '''Drop the records of some plists, so their jobs are rendered and written next time.'''
+        paths = [(str(path), ) for path in paths]
+        with self._lock:
+            db = self._connect()
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                db.executemany('DELETE FROM manifest WHERE path = ?', paths)
+                db.execute('COMMIT')
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            self._dirty = True
+
+    def stats(self):
+        '''Returns:
+            dict: hits and misses since the manifest was opened, hitRate, the number of records, and the size of the file in pages
+        '''
+        with self._lock:
+            db = self._connect()
+            rows = db.execute('SELECT count(*) FROM manifest').fetchone()[0]
+            pages = db.execute('PRAGMA page_count').fetchone()[0]
+            free = db.execute('PRAGMA freelist_count').fetchone()[0]
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': self.hits / total if total else 0.0,
+                'records': rows,
+                'pages': pages,
+                'freePages': free
+            }
+
+    def compact(self):
+        '''Drop the records of plists that don't exist anymore, and shrink the file if a quarter of it is free.
+
+        Returns:
+            int: the number of records dropped
+        '''
+        with self._lock:
+            db = self._connect()
+            paths = [row[0] for row in db.execute('SELECT path FROM manifest')]
+        gone = [path for path in paths if not os.path.exists(path)]
+        if gone:
+            self.forget(gone)
+        with self._lock:
+            db = self._connect()
+            pages = db.execute('PRAGMA page_count').fetchone()[0]
+            free = db.execute('PRAGMA freelist_count').fetchone()[0]
+            if free * 4 > pages:
+                db.execute('PRAGMA incremental_vacuum')
+            # fold the WAL back into the database so it doesn't keep growing
+            db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return len(gone)
+
+    def close(self, compact=True):
+        '''Close the manifest. It's opened again when it's used.
+
+        If something was recorded since it was opened, it is compacted first(see ``compact()``).
+        '''
+        if self._db is None:
+            return
+        if compact and self._dirty:
+            try:
+                self.compact()
+            except sqlite3.OperationalError:
+                # another process holds the lock, it can compact next time
+                pass
+        with self._lock:
+            self._db.close()
+            self._db = None
+            self._dirty = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __getstate__(self):
+        # a connection can't be pickled, a copy in another process opens its own
+        state = self.__dict__.copy()
+        state['_db'] = None
+        state['_lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return '<RenderManifest {} hits={} misses={}>'.format(
+            self.path, self.hits, self.misses)
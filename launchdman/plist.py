@@ -0,0 +1,466 @@
+'''Reading and writing plist formats: the XML reader, binary plists and ``loadPlist()``.'''
+import binascii
+import datetime
+import mmap
+import os
+import struct
+from xml.parsers import expat
+
+from .core import BoolSingle, Pair, Single
+
+
+# dates in binary plists are seconds since 2001-01-01
+_plistEpoch = datetime.datetime(2001, 1, 1)
+_refFormats = {1: 'B', 2: 'H', 4: 'L', 8: 'Q'}
+
+
+def _packInt(value):
+    '''an integer object of a binary plist'''
+    if value < 0:
+        return b'\x13' + value.to_bytes(8, 'big', signed=True)
+    elif value < 1 << 8:
+        return b'\x10' + value.to_bytes(1, 'big')
+    elif value < 1 << 16:
+        return b'\x11' + value.to_bytes(2, 'big')
+    elif value < 1 << 32:
+        return b'\x12' + value.to_bytes(4, 'big')
+    elif value < 1 << 63:
+        return b'\x13' + value.to_bytes(8, 'big')
+    elif value < 1 << 64:
+        return b'\x14' + value.to_bytes(16, 'big', signed=True)
+    raise OverflowError('{} is too big for a plist'.format(value))
+
+
+def _marker(kind, length):
+    '''the type byte of an object with a length, the length follows as an integer if it doesn't fit'''
+    if length < 15:
+        return bytes((kind | length, ))
+    return bytes((kind | 0xF, )) + _packInt(length)
+
+
+class BinaryPlistWriter():
+    '''Encoder of binary plists(bplist00), straight from the tree of singles.
+
+    Objects get their number in the order they are met, containers before their contents.
+    Strings, numbers, dates and data that show up more than once are written once and shared,
+    which is most of the saving for jobs with a lot of repeated keys.
+
+    Example::
+
+        BinaryPlistWriter().encode(job) # b'bplist00...'
+    '''
+
+    def __init__(self):
+        # bytes of a scalar, or (type byte, refs) of a container
+        self.objects = []
+        # (type, value) -> object number of scalars
+        self.shared = {}
+
+    def encode(self, node):
+        '''Encode a single(usually a Job) and all its contents.
+
+        Args:
+            node (Single): the top object
+
+        Raises:
+            TypeError: if a value can't be in a plist
+
+        Returns:
+            bytes: the binary plist
+        '''
+        self.objects = []
+        self.shared = {}
+        self.add(node)
+        count = len(self.objects)
+        refSize = 1 if count < 1 << 8 else 2 if count < 1 << 16 else 4
+        refFormat = _refFormats[refSize]
+        chunks = [b'bplist00']
+        offsets = []
+        position = 8
+        for obj in self.objects:
+            if not isinstance(obj, bytes):
+                kind, refs, length = obj
+                obj = _marker(kind, length) + struct.pack(
+                    '>{}{}'.format(len(refs), refFormat), *refs)
+            offsets.append(position)
+            chunks.append(obj)
+            position += len(obj)
+        offsetSize = next(size for size in (1, 2, 4, 8)
+                          if position < 1 << (8 * size))
+        chunks.append(
+            struct.pack('>{}{}'.format(count, _refFormats[offsetSize]),
+                        *offsets))
+        chunks.append(
+            struct.pack('>6xBBQQQ', offsetSize, refSize, count, 0, position))
+        return b''.join(chunks)
+
+    def scalar(self, key, encode):
+        '''number of a shared object, `encode` makes its bytes the first time'''
+        index = self.shared.get(key)
+        if index is None:
+            index = self.shared[key] = len(self.objects)
+            self.objects.append(encode())
+        return index
+
+    def string(self, text):
+        '''number of a string object'''
+        return self.scalar(('string', text), lambda: self.packString(text))
+
+    @staticmethod
+    def packString(text):
+        try:
+            data = text.encode('ascii')
+            return _marker(0x50, len(data)) + data
+        except UnicodeEncodeError:
+            data = text.encode('utf-16be')
+            return _marker(0x60, len(data) // 2) + data
+
+    def add(self, node):
+        '''Give a single and its contents object numbers.
+
+        Returns:
+            int: the object number of the single
+        '''
+        if isinstance(node, BoolSingle):
+            value = node.value[0] == 'true'
+            return self.scalar(('bool', value),
+                               lambda: b'\x09' if value else b'\x08')
+        if not isinstance(node, Single) or isinstance(node, Pair):
+            raise TypeError('{!r} can not be a plist value'.format(node))
+        tag = node.tag
+        if tag == 'dict':
+            index = len(self.objects)
+            self.objects.append(None)
+            keys = []
+            values = []
+            for pair in node.value:
+                if not isinstance(pair, Pair):
+                    raise TypeError('{!r} in a dict is not a pair'.format(pair))
+                # pairs without a value are not printed either
+                if not pair.value:
+                    continue
+                if len(pair.value) > 1:
+                    raise TypeError('{} has more than one value'.format(
+                        pair.key))
+                keys.append(self.string(pair.key))
+                values.append(self.add(pair.value[0]))
+            self.objects[index] = (0xD0, keys + values, len(keys))
+            return index
+        if tag == 'array':
+            index = len(self.objects)
+            self.objects.append(None)
+            refs = [self.add(element) for element in node.value]
+            self.objects[index] = (0xA0, refs, len(refs))
+            return index
+        if len(node.value) != 1:
+            raise TypeError('<{}> needs exactly one value'.format(tag))
+        value = node.value[0]
+        if tag == 'string':
+            return self.string(str(value))
+        if tag == 'integer':
+            value = int(value)
+            return self.scalar(('integer', value), lambda: _packInt(value))
+        if tag == 'real':
+            value = float(value)
+            return self.scalar(('real', value),
+                               lambda: b'\x23' + struct.pack('>d', value))
+        if tag == 'date':
+            seconds = (datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ')
+                       - _plistEpoch).total_seconds()
+            return self.scalar(('date', seconds),
+                               lambda: b'\x33' + struct.pack('>d', seconds))
+        if tag == 'data':
+            data = binascii.a2b_base64(value)
+            return self.scalar(('data', data),
+                               lambda: _marker(0x40, len(data)) + data)
+        raise TypeError('<{}> can not be in a binary plist'.format(tag))
+
+
+class BinaryPlistReader():
+    '''Decoder of binary plists(bplist00) over a memoryview of bytes or an mmap of the file.
+
+    Only the trailer is read up front. The offset of an object is looked up in the offset table
+    when the object is needed, and every object is decoded once, so a shared string costs nothing the
+    second time. Nothing is copied but the objects themselves.
+
+    Example::
+
+        BinaryPlistReader(data).decode() # {'Label': 'job', ...}
+
+    Args:
+        buffer: bytes, bytearray, mmap or anything else with the buffer protocol
+
+    Raises:
+        ValueError: if it is not a binary plist
+    '''
+
+    # files this big are mapped instead of read by loadPlist()
+    mmapSize = 1 << 16
+
+    def __init__(self, buffer):
+        self.view = memoryview(buffer).cast('B')
+        if len(self.view) < 40 or self.view[:8] != b'bplist00':
+            raise ValueError('not a binary plist')
+        (self.offsetSize, self.refSize, self.count, self.top,
+         self.tableOffset) = struct.unpack_from('>6xBBQQQ', self.view,
+                                                len(self.view) - 32)
+        if self.offsetSize not in _refFormats or self.refSize not in _refFormats or \
+                self.top >= self.count or \
+                self.tableOffset + self.count * self.offsetSize > len(self.view) - 32:
+            raise ValueError('invalid binary plist trailer')
+        self.refFormat = _refFormats[self.refSize]
+        self.unpackOffset = struct.Struct('>' +
+                                          _refFormats[self.offsetSize]).unpack_from
+        # object number -> value
+        self.objects = {}
+        # containers being decoded, to catch a container that contains itself
+        self.decoding = set()
+
+    def close(self):
+        '''Let go of the buffer, so an mmap can be closed.'''
+        self.view.release()
+
+    def decode(self, ref=None):
+        '''Decode an object, and whatever it contains.
+
+        Args:
+            ref (int): the object number, default to the top object
+
+        Raises:
+            ValueError: if the plist is broken
+
+        Returns:
+            str, int, float, bool, list, dict, datetime or bytes
+        '''
+        if ref is None:
+            ref = self.top
+        try:
+            return self.objects[ref]
+        except KeyError:
+            pass
+        if ref >= self.count:
+            raise ValueError('invalid object reference {}'.format(ref))
+        offset = self.unpackOffset(self.view,
+                                   self.tableOffset + ref * self.offsetSize)[0]
+        try:
+            value = self.objects[ref] = self.decodeAt(offset, ref)
+        except (IndexError, struct.error, UnicodeDecodeError, TypeError,
+                OverflowError) as error:
+            raise ValueError('invalid binary plist object at {}: {}'.format(
+                offset, error)) from error
+        return value
+
+    def length(self, offset, info):
+        '''length of an object and where its content starts'''
+        if info != 0xF:
+            return info, offset + 1
+        size = 1 << (self.view[offset + 1] & 0xF)
+        start = offset + 2
+        return int.from_bytes(self.view[start:start + size], 'big'), start + size
+
+    def refs(self, start, count):
+        return struct.unpack_from('>{}{}'.format(count, self.refFormat),
+                                  self.view, start)
+
+    def decodeAt(self, offset, ref):
+        '''decode object `ref`, which is at `offset`'''
+        view = self.view
+        marker = view[offset]
+        kind, info = marker >> 4, marker & 0xF
+        if marker == 0x08:
+            return False
+        elif marker == 0x09:
+            return True
+        elif kind == 0x1:
+            size = 1 << info
+            return int.from_bytes(view[offset + 1:offset + 1 + size], 'big',
+                                  signed=size >= 8)
+        elif marker == 0x22:
+            return struct.unpack_from('>f', view, offset + 1)[0]
+        elif marker == 0x23:
+            return struct.unpack_from('>d', view, offset + 1)[0]
+        elif marker == 0x33:
+            seconds = struct.unpack_from('>d', view, offset + 1)[0]
+            return _plistEpoch + datetime.timedelta(seconds=seconds)
+        elif kind == 0x4:
+            length, start = self.length(offset, info)
+            return bytes(view[start:start + length])
+        elif kind == 0x5:
+            length, start = self.length(offset, info)
+            return str(view[start:start + length], 'ascii')
+        elif kind == 0x6:
+            length, start = self.length(offset, info)
+            return str(view[start:start + 2 * length], 'utf-16be')
+        elif kind == 0xA or kind == 0xD:
+            if ref in self.decoding:
+                raise ValueError('object {} contains itself'.format(ref))
+            self.decoding.add(ref)
+            length, start = self.length(offset, info)
+            decode = self.decode
+            if kind == 0xA:
+                value = [decode(r) for r in self.refs(start, length)]
+            else:
+                refs = self.refs(start, 2 * length)
+                value = {
+                    decode(k): decode(v)
+                    for k, v in zip(refs[:length], refs[length:])
+                }
+            self.decoding.discard(ref)
+            return value
+        raise ValueError('unsupported object type 0x{:02x}'.format(marker))
+
+
+def _loadBinary(buffer):
+    reader = BinaryPlistReader(buffer)
+    try:
+        return reader.decode()
+    finally:
+        reader.close()
+
+
+# XML plists
+
+
+class PlistParser():
+    '''Streaming parser for XML plists.
+
+    Elements are handled as expat reports them, the same events ``iterparse()`` is built on,
+    so no element tree is ever built: values go straight into the dicts and lists being filled.
+    Entity declarations are refused, like ``plistlib`` does.
+
+    Example::
+
+        PlistParser().parse(open('job.plist', 'rb')) # {'Label': 'job', ...}
+    '''
+
+    def __init__(self):
+        self.stack = []
+        self.root = None
+        self.currentKey = None
+        self.data = []
+
+    def parse(self, source):
+        '''Parse a plist.
+
+        Args:
+            source: bytes, or a file opened in binary mode
+
+        Raises:
+            ValueError: if the plist is not valid
+
+        Returns:
+            the top level value, normally a dict
+        '''
+        parser = expat.ParserCreate()
+        parser.buffer_text = True
+        parser.StartElementHandler = self.handleBegin
+        parser.EndElementHandler = self.handleEnd
+        parser.CharacterDataHandler = self.data.append
+        parser.EntityDeclHandler = self.handleEntityDecl
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                parser.Parse(bytes(source), True)
+            else:
+                parser.ParseFile(source)
+        except expat.ExpatError as error:
+            raise ValueError('invalid plist: {}'.format(error)) from error
+        return self.root
+
+    def handleEntityDecl(self, entityName, *args):
+        raise ValueError('entity declarations are not supported in plists')
+
+    def addObject(self, value):
+        if self.currentKey is not None:
+            self.stack[-1][self.currentKey] = value
+            self.currentKey = None
+        elif not self.stack:
+            self.root = value
+        else:
+            container = self.stack[-1]
+            if not isinstance(container, list):
+                raise ValueError('missing key in dict')
+            container.append(value)
+
+    def handleBegin(self, element, attributes):
+        self.data.clear()
+        if element == 'dict':
+            d = {}
+            self.addObject(d)
+            self.stack.append(d)
+        elif element == 'array':
+            l = []
+            self.addObject(l)
+            self.stack.append(l)
+
+    def handleEnd(self, element):
+        text = ''.join(self.data)
+        self.data.clear()
+        if element == 'key':
+            if self.currentKey is not None or not self.stack or not isinstance(
+                    self.stack[-1], dict):
+                raise ValueError('unexpected key "{}"'.format(text))
+            self.currentKey = text
+        elif element == 'string':
+            self.addObject(text)
+        elif element == 'integer':
+            text = text.strip()
+            if text[:2].lower() == '0x' or text[:3].lower() == '-0x':
+                self.addObject(int(text, 16))
+            else:
+                self.addObject(int(text))
+        elif element in ('dict', 'array'):
+            if self.currentKey is not None:
+                raise ValueError('missing value for key "{}"'.format(
+                    self.currentKey))
+            self.stack.pop()
+        elif element == 'true':
+            self.addObject(True)
+        elif element == 'false':
+            self.addObject(False)
+        elif element == 'real':
+            self.addObject(float(text))
+        elif element == 'date':
+            self.addObject(
+                datetime.datetime.strptime(text.strip(),
+                                           '%Y-%m-%dT%H:%M:%SZ'))
+        elif element == 'data':
+            self.addObject(binascii.a2b_base64(text))
+        elif element != 'plist':
+            raise ValueError('unknown element "{}"'.format(element))
+
+
+def loadPlist(source):
+    '''Read a plist into Python values, like ``plistlib.load()``.
+
+    XML plists go through ``PlistParser``, binary ones(bplist00) through ``BinaryPlistReader``.
+    A big binary file is mapped into memory instead of read.
+
+    Args:
+        source: bytes, or a file opened in binary mode
+
+    Raises:
+        ValueError: if the plist is not valid
+
+    Returns:
+        the top level value, normally a dict
+    '''
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        if bytes(source[:8]) == b'bplist00':
+            return _loadBinary(source)
+        return PlistParser().parse(source)
+    if hasattr(source, 'peek'):
+        head = source.peek(8)[:8]
+    else:
+        source = source.read()
+        return loadPlist(source)
+    if head != b'bplist00':
+        return PlistParser().parse(source)
+    try:
+        fileno = source.fileno()
+        size = os.fstat(fileno).st_size
+    except (AttributeError, OSError):
+        return _loadBinary(source.read())
+    if size < BinaryPlistReader.mmapSize:
+        return _loadBinary(source.read())
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapped:
+        return _loadBinary(mapped)
@@ -0,0 +1,190 @@
+'''Checking jobs before launchd sees them.
+
+The rules of a config class are compiled the first time a job with that class is checked:
+allowed keys become frozensets, integer ranges become bounds, and calendar values a set of allowed (key, value).
+After that a check is a few set and dict lookups per config(one per value for calendars), cheap enough to run before every write::
+
+    errors = validateMany(jobs)
+    for path, key, message in errors:
+        print(path, key, message)
+'''
+from .calendar import _calendarPairs, StartCalendarInterval, StartInterval
+from .core import (allowedKeys, BoolPair, Pair, SingleDictPair,
+                   SingleIntegerPair, SingleStringPair, valueFromNode)
+from .keys import (configReaders, ExitTimeOut, Nice, ThrottleInverval, Timeout,
+                   Umask)
+
+# integer configs -> (lowest, highest) values launchd takes, None for no limit
+integerRanges = {
+    Nice: (-20, 20),
+    Umask: (0, 0o777),
+    ExitTimeOut: (0, None),
+    Timeout: (0, None),
+    ThrottleInverval: (0, None),
+    StartInterval: (1, None),
+}
+
+# a job needs a Label, and one of these
+programKeys = frozenset(['Program', 'ProgramArguments'])
+
+# config class -> its compiled rule, a function(config) that returns a list of messages, or None if there is nothing to check
+_rules = {}
+
+
+def _checkCalendar(config):
+    '''Check every value of a StartCalendarInterval, with one lookup per value in the precompiled set of allowed (key, value).'''
+    allowed = _calendarPairs
+    wrong = set()
+    for entry in config.l:
+        for pair in entry.value:
+            value = pair.value[0].value[0]
+            if value.__class__ is not int or (pair.key, value) not in allowed:
+                wrong.add((pair.key, value))
+    messages = []
+    for key, value in wrong:
+        if key not in StartCalendarInterval.keyWord:
+            messages.append('"{}" is not a valid calendar key'.format(key))
+        elif value.__class__ is not int:
+            messages.append('{} must be an integer, not {!r}'.format(key, value))
+        else:
+            messages.append('{} {} is out of range'.format(key, value))
+    return sorted(set(messages))
+
+
+def _dictRule(keys):
+    def check(config):
+        messages = []
+        for pair in config.d:
+            if pair.key not in keys:
+                messages.append('"{}" is not a valid key'.format(pair.key))
+            else:
+                # the plain value, so an empty <array/> or <dict/> is reported, not indexed
+                try:
+                    value = valueFromNode(
+                        pair.value[0]) if len(pair.value) == 1 else None
+                except (TypeError, ValueError):
+                    value = None
+                if value.__class__ is not int or value < 0:
+                    messages.append('{} must be an integer >= 0, not {!r}'.format(
+                        pair.key, value))
+        return messages
+
+    return check
+
+
+def _rangeRule(lowest, highest):
+    def check(config):
+        value = config.value[0].value[0] if config.value else None
+        if value.__class__ is not int:
+            return ['must be an integer, not {!r}'.format(value)]
+        if lowest is not None and value < lowest or highest is not None and value > highest:
+            return ['{} is out of range, it goes from {} to {}'.format(
+                value, lowest, 'any' if highest is None else highest)]
+        return []
+
+    return check
+
+
+def _checkString(config):
+    value = config.value[0].value[0] if config.value else None
+    if not isinstance(value, str) or not value:
+        return ['must be a non-empty string, not {!r}'.format(value)]
+    return []
+
+
+def _checkBool(config):
+    if config.value and config.value[0].value[0] in ('true', 'false'):
+        return []
+    return ['must be true or false']
+
+
+def _compile(cls):
+    '''Make the rule of a config class, see ``ruleOf()``.'''
+    if issubclass(cls, StartCalendarInterval):
+        return _checkCalendar
+    for klass in cls.__mro__:
+        if klass in integerRanges:
+            return _rangeRule(*integerRanges[klass])
+    if issubclass(cls, SingleDictPair):
+        keys = allowedKeys(cls)
+        return _dictRule(keys) if keys is not None else None
+    if issubclass(cls, SingleStringPair) and cls is not SingleStringPair:
+        return _checkString
+    if issubclass(cls, SingleIntegerPair) and cls is not SingleIntegerPair:
+        return _rangeRule(None, None)
+    if issubclass(cls, BoolPair) and cls is not BoolPair:
+        return _checkBool
+    return None
+
+
+def ruleOf(cls):
+    '''The rule of a config class, compiled the first time it's asked for.
+
+    Args:
+        cls (type): the config class
+
+    Returns:
+        a function that takes a config and returns a list of messages, or None if the class has no rule
+    '''
+    try:
+        return _rules[cls]
+    except KeyError:
+        rule = _rules[cls] = _compile(cls)
+        return rule
+
+
+def validate(job):
+    '''Check one job.
+
+    Args:
+        job (Job): the job
+
+    Returns:
+        list: (key, message) of every problem, empty if there is none
+    '''
+    problems = []
+    keys = set()
+    for config in job.value:
+        key = getattr(config, 'key', None)
+        if key in keys:
+            problems.append((key, 'is set more than once'))
+        keys.add(key)
+        cls = config.__class__
+        if cls is Pair and key in configReaders:
+            # Job.fromDict() and Job.read() keep a known key with a value of the wrong type as a plain Pair
+            problems.append((key, 'has a value of the wrong type'))
+            continue
+        rule = ruleOf(cls)
+        if rule is not None:
+            problems.extend((key, message) for message in rule(config))
+    if 'Label' not in keys:
+        problems.append(('Label', 'is required'))
+    if keys.isdisjoint(programKeys):
+        problems.append(('Program or ProgramArguments', 'is required'))
+    return problems
+
+
+def validateMany(jobs):
+    '''Check a lot of jobs, and report every problem of every job in one go.
+
+    A job needs a Label and a Program or ProgramArguments, and no key twice.
+    Configs are checked by the rule of their class(see ``ruleOf()``): the keys of resource limits,
+    the range of every calendar value, of Nice, Umask, StartInterval and the timeouts, and that strings are not empty.
+
+    Example::
+
+        errors = validateMany(jobs)
+        if errors:
+            raise SystemExit('\\n'.join('{}: {} {}'.format(*error) for error in errors))
+
+    Args:
+        jobs (list): the jobs
+
+    Returns:
+        list: (path, key, message) of every problem, empty if every job is fine
+    '''
+    errors = []
+    for job in jobs:
+        path = job.me
+        errors.extend((path, key, message) for key, message in validate(job))
+    return errors
@@ -63,4 +63,4 @@ For documentation, check ReadTheDocs_
     author_email='yuan.k.fu@gmail.com',
     license='MIT',
     packages=['launchdman'],
-    python_requires='>=3', )
+    python_requires='>=3.7', )
@@ -0,0 +1,85 @@
+'''Jobs built with the classic API, their plists in data/ were rendered by launchdman 0.1.2.'''
+from launchdman import (AbandonProcessGroup, Crashed, EnvironmentVariables,
+                        ExitTimeOut, GroupName, HardResourceLimit, InitGroups,
+                        Job, KeepAlive, KeepAliveDepends, Label, LegacyTimers,
+                        Nice, Program, ProgramArguments, QueueDirecotries,
+                        RootDirecotry, RunAtLoad, SoftResourceLimit,
+                        StandardErrorPath, StandardInPath, StandardOutPath,
+                        StartCalendarInterval, StartInterval, StartOnMount,
+                        SuccessfulExit, ThrottleInverval, Timeout, Umask,
+                        UserName, WatchPaths, WorkingDirectory)
+
+
+def classicJobs():
+    simple = Job('/tmp/com.test.simple.plist')
+    simple.add(Label('com.test.simple'), Program('/usr/local/bin/job'))
+    simple.add(RunAtLoad())
+    simple.add(StartInterval().every(10).minute)
+
+    full = Job('/tmp/com.test.full.plist')
+    full.add(Label('com.test.full'))
+    full.add(ProgramArguments('/bin/sh', '-c', 'echo hello'))
+    full.add(EnvironmentVariables('/bin:/usr/bin'))
+    full.add(StandardOutPath('/tmp/out.log'), StandardErrorPath('/tmp/err.log'))
+    full.add(WorkingDirectory('/tmp'), UserName('nobody'), Umask(18), Nice(5))
+    keepAlive = KeepAliveDepends()
+    keepAlive.addKey(SuccessfulExit)
+    keepAlive.addKey(Crashed)
+    full.add(keepAlive)
+    full.add(WatchPaths('/etc/hosts', '/etc/passwd'))
+    schedule = StartCalendarInterval()
+    schedule.add({'Hour': 3, 'Minute': 30}, {'Weekday': 1})
+    schedule.add(schedule.genMix(month=(1, 6), day=(1, 15)))
+    full.add(schedule)
+    full.add(StartOnMount(), AbandonProcessGroup())
+
+    # rendered once, then changed, so the cached text has to be dropped
+    changed = Job('/tmp/com.test.changed.plist')
+    changed.add(Label('com.test.changed'), Program('/bin/true'))
+    arguments = ProgramArguments('-a', '-b')
+    changed.add(arguments, KeepAlive('always'))
+    changed.parse()
+    arguments.add('-c')
+    arguments.remove('-a')
+    changed.remove(KeepAlive('always'))
+    changed.add(RunAtLoad())
+    return {'simple': simple, 'full': full, 'changed': changed}
+
+
+def everyConfig():
+    '''plist key -> configs built by hand, one or more per key of configBuilders'''
+    keepAlive = KeepAliveDepends()
+    keepAlive.addKey(SuccessfulExit)
+    keepAlive.addKey(Crashed)
+    schedule = StartCalendarInterval()
+    schedule.add({'Hour': 3, 'Minute': 30}, {'Weekday': 1})
+    return {
+        'KeepAlive': [KeepAlive('always'), keepAlive],
+        'Label': [Label('com.test')],
+        'Program': [Program('/bin/sh')],
+        'ProgramArguments': [ProgramArguments('/bin/sh', '-c', 'a & b < c')],
+        'EnvironmentVariables': [EnvironmentVariables('/bin:/usr/bin')],
+        'StandardInPath': [StandardInPath('/tmp/in')],
+        'StandardOutPath': [StandardOutPath('/tmp/out')],
+        'StandardErrorPath': [StandardErrorPath('/tmp/err')],
+        'WorkingDirectory': [WorkingDirectory('/tmp')],
+        'SoftResourceLimit': [SoftResourceLimit({'CPU': 2, 'FileSize': 1024})],
+        'HardResourceLimit': [HardResourceLimit({'NumberOfFiles': 10})],
+        'RunAtLoad': [RunAtLoad()],
+        'StartInterval': [StartInterval().every(10).minute],
+        'StartCalendarInterval': [schedule],
+        'StartOnMount': [StartOnMount()],
+        'WatchPaths': [WatchPaths('/etc/hosts', '/etc/passwd')],
+        'UserName': [UserName('nobody')],
+        'GroupName': [GroupName('wheel')],
+        'InitGroups': [InitGroups('staff')],
+        'Umask': [Umask(18)],
+        'AbandonProcessGroup': [AbandonProcessGroup()],
+        'ExitTimeOut': [ExitTimeOut(5)],
+        'Timeout': [Timeout(5)],
+        'LegacyTimers': [LegacyTimers()],
+        'Nice': [Nice(5)],
+        'QueueDirectories': [QueueDirecotries('/tmp/queue')],
+        'RootDirectory': [RootDirecotry('/')],
+        'ThrottleInterval': [ThrottleInverval(10)],
+    }
@@ -0,0 +1,91 @@
+import asyncio
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from launchdman import aio, Job
+
+
+def makeJobs(directory, count):
+    return [
+        Job.fromDict(
+            str(directory / 'com.test.{}.plist'.format(i)), {
+                'Label': 'com.test.{}'.format(i),
+                'Program': '/usr/bin/true'
+            }) for i in range(count)
+    ]
+
+
+class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    '''a thread pool that remembers the most calls it ran at once'''
+
+    def __init__(self):
+        super().__init__(max_workers=16)
+        self.running = 0
+        self.most = 0
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+
+        def counted():
+            with self.lock:
+                self.running += 1
+                self.most = max(self.most, self.running)
+            try:
+                time.sleep(0.002)
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.running -= 1
+
+        return super().submit(counted)
+
+
+def test_write_all(tmp_path):
+    jobs = makeJobs(tmp_path, 20)
+    report = asyncio.run(aio.writeAll(jobs, sync=False))
+    assert report.counts() == {'written': 20, 'skipped': 0, 'failed': 0}
+    for job in jobs:
+        assert open(job.me).read() == job.parse()
+    report = asyncio.run(aio.writeAll(jobs, sync=False))
+    assert report.counts() == {'written': 0, 'skipped': 20, 'failed': 0}
+
+
+def test_iter_write_progress_and_failures(tmp_path):
+    jobs = makeJobs(tmp_path, 5)
+    jobs[2].me = str(tmp_path / 'missing' / 'com.test.2.plist')
+
+    async def collect():
+        return [p async for p in aio.iterWrite(jobs, concurrency=2, sync=True)]
+
+    progress = asyncio.run(collect())
+    assert [p.done for p in progress] == [1, 2, 3, 4, 5]
+    assert all(p.total == 5 for p in progress)
+    failed = [p for p in progress if p.status == 'failed']
+    assert [p.path for p in failed] == [jobs[2].me]
+    assert isinstance(failed[0].error, OSError)
+    assert sum(p.status == 'written' for p in progress) == 4
+
+
+def test_concurrency_is_bounded(tmp_path):
+    jobs = makeJobs(tmp_path, 30)
+    executor = CountingExecutor()
+    try:
+        report = asyncio.run(
+            aio.writeAll(jobs, concurrency=3, executor=executor, sync=False))
+    finally:
+        executor.shutdown()
+    assert report.counts()['written'] == 30
+    assert 1 <= executor.most <= 3
+    with pytest.raises(ValueError):
+        asyncio.run(aio.writeAll(jobs, concurrency=0))
+
+
+def test_awrite(tmp_path):
+    job = makeJobs(tmp_path, 1)[0]
+    asyncio.run(job.awrite())
+    assert open(job.me).read() == job.parse()
+    asyncio.run(aio.awrite(job, format='binary'))
+    assert open(job.me, 'rb').read().startswith(b'bplist00')
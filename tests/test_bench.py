@@ -0,0 +1,68 @@
+import json
+
+from launchdman import bench
+
+
+def fakeRun(seconds):
+    def run(quick, repeat, log=None, startupOnly=False):
+        if log is not None:
+            log('running')
+        return bench._report(quick, repeat, {
+            'render/jobs=10': {
+                'seconds': seconds
+            },
+            'startup/import launchdman': {
+                'seconds': seconds,
+                'startup': True
+            }
+        })
+
+    return run
+
+
+def test_compare():
+    baseline = bench._report(True, 1, {
+        'a': {
+            'seconds': 1.0
+        },
+        'b': {
+            'seconds': 1.0
+        },
+        's': {
+            'seconds': 0.01
+        }
+    })
+    report = bench._report(True, 1, {
+        'a': {
+            'seconds': 1.1
+        },
+        'b': {
+            'seconds': 2.0
+        },
+        's': {
+            'seconds': 0.014,
+            'startup': True
+        },
+        'new': {
+            'seconds': 1.0
+        }
+    })
+    rows, regressions = bench.compare(report, baseline)
+    assert [row[0] for row in rows] == ['b', 's', 'a']
+    assert regressions == ['b']
+
+
+def test_quiet_compare(tmp_path, monkeypatch, capsys):
+    baseline = tmp_path / 'baseline.json'
+    monkeypatch.setattr(bench, 'run', fakeRun(1.0))
+    assert bench.main(['-q', '-o', str(baseline)]) == 0
+    monkeypatch.setattr(bench, 'run', fakeRun(3.0))
+    output = tmp_path / 'now.json'
+    status = bench.main(['-q', '--compare', str(baseline), '-o', str(output)])
+    assert status == 1
+    assert capsys.readouterr().err == ''
+    assert json.loads(output.read_text())['regressions'] == [
+        'render/jobs=10', 'startup/import launchdman'
+    ]
+    bench.main(['--compare', str(baseline), '-o', str(output)])
+    assert 'REGRESSION' in capsys.readouterr().err
@@ -0,0 +1,237 @@
+import datetime
+
+import pytest
+
+from launchdman import (compactCalendar, crossCombine, flatten,
+                        iterCrossCombine, Job, Pair, StartCalendarInterval,
+                        StartInterval, validate)
+from launchdman.keys import configFromValue
+
+bad = [
+    [{'Hour': 24}],
+    [{'Week': 2}],
+    [{'Hour': 3}, {'Month': 13}],
+]
+
+
+def test_add_checks_entries():
+    schedule = StartCalendarInterval()
+    with pytest.raises(ValueError):
+        schedule.add({'Hour': 24})
+    with pytest.raises(AttributeError):
+        schedule.add({'Week': 2})
+    with pytest.raises(TypeError):
+        schedule.add({'Hour': '3'})
+    schedule.add({'Weekday': 7, 'Hour': 23, 'Minute': 59})
+    assert schedule.entries() == [{'Weekday': 7, 'Hour': 23, 'Minute': 59}]
+
+
+@pytest.mark.parametrize('value', bad)
+def test_bad_values_read_as_generic_pairs(value):
+    config = configFromValue('StartCalendarInterval', value)
+    assert config.__class__ is Pair
+    job = Job.fromDict('/tmp/com.test.plist', {
+        'Label': 'com.test',
+        'Program': '/bin/sh',
+        'StartCalendarInterval': value
+    })
+    assert job.value[2].__class__ is Pair
+    assert job.toDict()['StartCalendarInterval'] == value
+    assert validate(job) == [('StartCalendarInterval',
+                              'has a value of the wrong type')]
+
+
+def test_good_values_read_the_same_both_ways():
+    value = [{'Hour': 3, 'Minute': 30}, {'Weekday': 1}]
+    config = configFromValue('StartCalendarInterval', value)
+    job = Job.fromDict('/tmp/com.test.plist', {'StartCalendarInterval': value})
+    assert isinstance(config, StartCalendarInterval)
+    assert job.value[0] == config
+
+
+def test_week_is_weekday():
+    schedule = StartCalendarInterval()
+    assert schedule.gen(week=2, hour=3) == {'Weekday': 2, 'Hour': 3}
+    assert schedule.genMix(week=(1, 2)) == [{'Weekday': 1}, {'Weekday': 2}]
+    assert schedule.genInterval(week=(1, 3)) == [{
+        'Weekday': 1
+    }, {
+        'Weekday': 2
+    }]
+    schedule.add(schedule.genMix(week=(1, 2), hour=(3, )))
+    assert len(schedule.entries()) == 2
+
+
+def fires(entries, when):
+    '''whether launchd starts a job with these calendar entries at when, the slow way'''
+    weekday = (when.weekday() + 1) % 7
+    for entry in entries:
+        if entry.get('Month', when.month) != when.month:
+            continue
+        if entry.get('Hour', when.hour) != when.hour or entry.get(
+                'Minute', when.minute) != when.minute:
+            continue
+        day = entry.get('Day')
+        entryWeekday = entry.get('Weekday')
+        if entryWeekday == 7:
+            entryWeekday = 0
+        if day is not None and entryWeekday is not None:
+            # launchd fires when either of them matches
+            if day != when.day and entryWeekday != weekday:
+                continue
+        elif day is not None and day != when.day:
+            continue
+        elif entryWeekday is not None and entryWeekday != weekday:
+            continue
+        return True
+    return False
+
+
+def minutes(start, count):
+    return [start + datetime.timedelta(minutes=i) for i in range(count)]
+
+
+def test_compact():
+    schedule = StartCalendarInterval()
+    schedule.add(schedule.genInterval(hour=(0, 24), minute=(0, 30)))
+    before = schedule.entries()
+    report = schedule.compact()
+    assert report['entries'] == (720, 30)
+    assert report['bytes'][1] < report['bytes'][0]
+    assert schedule.entries() == [{'Minute': m} for m in range(30)]
+    for when in minutes(datetime.datetime(2024, 1, 1), 24 * 60):
+        assert fires(before, when) == fires(schedule.entries(), when)
+
+
+def test_compact_keeps_day_and_weekday():
+    entries = [{'Day': 1, 'Weekday': w, 'Hour': 3, 'Minute': 0} for w in range(7)]
+    entries += [{'Weekday': 7, 'Minute': 5}, {'Weekday': 0, 'Minute': 5}]
+    compacted = compactCalendar(entries)
+    assert {'Weekday': 0, 'Minute': 5} in compacted
+    assert len(compacted) < len(entries)
+    for when in minutes(datetime.datetime(2024, 3, 1), 14 * 24 * 60):
+        assert fires(entries, when) == fires(compacted, when)
+
+
+def test_cross_combine():
+    pools = [[{'Month': m} for m in (1, 2)], [{'Day': d} for d in (1, 2, 3)],
+             [{'Hour': 3}]]
+    expected = [{
+        'Month': m,
+        'Day': d,
+        'Hour': 3
+    } for m in (1, 2) for d in (1, 2, 3)]
+    assert crossCombine(pools) == expected
+    assert list(iterCrossCombine(pools)) == expected
+    assert list(iterCrossCombine(iter(pool) for pool in pools)) == expected
+    assert crossCombine([[{'Minute': 1}, {'Minute': 2}]]) == [{
+        'Minute': 1
+    }, {
+        'Minute': 2
+    }]
+    assert list(iterCrossCombine([[{'Minute': 1}], []])) == []
+
+
+def test_lazy_gen_mix():
+    schedule = StartCalendarInterval()
+    lazy = schedule.genMix(month=tuple(range(1, 13)),
+                           day=tuple(range(1, 29)),
+                           hour=tuple(range(24)),
+                           lazy=True)
+    assert next(lazy) == {'Month': 1, 'Day': 1, 'Hour': 0}
+    assert sum(1 for _ in lazy) == 12 * 28 * 24 - 1
+
+
+def test_flatten():
+    deep = 'x'
+    for _ in range(5000):
+        deep = [deep]
+    assert list(flatten([deep, ['a', ('b', {'c': 1})], 'de'])) == [
+        'x', 'a', 'b', {
+            'c': 1
+        }, 'de'
+    ]
+    # lazy: a generator is only read as far as it's needed
+    seen = []
+
+    def numbers():
+        for i in range(10):
+            seen.append(i)
+            yield i
+
+    values = flatten([numbers()])
+    assert next(values) == 0
+    assert seen == [0]
+
+
+@pytest.mark.parametrize('entries', [
+    [{
+        'Hour': 3,
+        'Minute': 30
+    }],
+    [{
+        'Minute': 15
+    }, {
+        'Minute': 45
+    }],
+    [{
+        'Day': 13,
+        'Weekday': 5,
+        'Hour': 12,
+        'Minute': 0
+    }],
+])
+def test_next_fire_times(entries):
+    schedule = StartCalendarInterval()
+    schedule.add(entries)
+    after = datetime.datetime(2023, 12, 30, 23, 10)
+    got = schedule.nextFireTimes(after, 5)
+    expected = []
+    when = after.replace(second=0) + datetime.timedelta(minutes=1)
+    while len(expected) < 5:
+        if fires(entries, when):
+            expected.append(when)
+        when += datetime.timedelta(minutes=1)
+        if when.year > 2029:
+            break
+    assert got == expected
+
+
+def test_next_fire_times_leap_day():
+    schedule = StartCalendarInterval({'Month': 2, 'Day': 29, 'Hour': 0, 'Minute': 0})
+    got = schedule.nextFireTimes(datetime.datetime(2023, 1, 1), 2)
+    assert got == [
+        datetime.datetime(2024, 2, 29),
+        datetime.datetime(2028, 2, 29)
+    ]
+
+
+def test_next_fire_times_dst():
+    zoneinfo = pytest.importorskip('zoneinfo')
+    try:
+        zone = zoneinfo.ZoneInfo('America/New_York')
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip('no time zone database')
+    schedule = StartCalendarInterval({'Hour': 2, 'Minute': 30})
+    # 2:30 doesn't exist on 2024-03-10, it fires an hour later
+    got = schedule.nextFireTimes(
+        datetime.datetime(2024, 3, 9, 12, 0, tzinfo=zone), 2)
+    assert [(t.day, t.hour, t.minute) for t in got] == [(10, 3, 30),
+                                                        (11, 2, 30)]
+    # 1:30 happens twice on 2024-11-03, it fires once
+    schedule = StartCalendarInterval({'Hour': 1, 'Minute': 30})
+    got = schedule.nextFireTimes(
+        datetime.datetime(2024, 11, 2, 12, 0, tzinfo=zone), 3)
+    assert [(t.day, t.hour) for t in got] == [(3, 1), (4, 1), (5, 1)]
+
+
+def test_start_interval_next_fire_times():
+    interval = StartInterval().every(10).minute
+    start = datetime.datetime(2024, 1, 1, 0, 0)
+    assert interval.nextFireTimes(start, 3) == [
+        start + datetime.timedelta(minutes=10 * k) for k in (1, 2, 3)
+    ]
+    assert interval.nextFireTimes(start + datetime.timedelta(minutes=25), 1,
+                                  start=start) == [
+                                      start + datetime.timedelta(minutes=30)
+                                  ]
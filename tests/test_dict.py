@@ -0,0 +1,85 @@
+import plistlib
+
+import pytest
+
+from classic import classicJobs, everyConfig
+from launchdman import (configBuilders, configFromValue, IntegerSingle, Job,
+                        KeepAliveAlways, KeepAliveDepends, Label, Pair,
+                        ProgramArguments, SoftResourceLimit,
+                        StartCalendarInterval)
+
+
+@pytest.mark.parametrize('name', ['simple', 'full', 'changed'])
+def test_round_trip(name):
+    job = classicJobs()[name]
+    mapping = job.toDict()
+    assert mapping == plistlib.loads(job.parse().encode())
+    again = Job.fromDict(job.me, mapping)
+    assert again.parse() == job.parse()
+    assert again == job
+    assert [c.__class__ for c in again.value] == [c.__class__ for c in job.value]
+
+
+def test_same_as_built_by_hand():
+    configs = everyConfig()
+    assert configs.keys() == configBuilders.keys()
+    for key, built in configs.items():
+        for config in built:
+            job = Job('/tmp/com.test.plist')
+            job.add(config)
+            again = Job.fromDict(job.me, job.toDict())
+            assert again == job, key
+            assert again.parse() == job.parse()
+            assert again.value[0].__class__ is config.__class__
+    # integers on both paths, not just the same plist twice
+    limit = SoftResourceLimit({'CPU': 2})
+    job = Job.fromDict('/tmp/com.test.plist', {'SoftResourceLimit': {'CPU': 2}})
+    assert job.value[0] == limit
+    assert limit.d[0].value[0].__class__ is IntegerSingle
+
+
+def test_same_as_config_from_value():
+    mapping = {
+        'Label': 'com.test',
+        'ProgramArguments': ['/bin/sh', '-c', 'true'],
+        'StartCalendarInterval': [{
+            'Hour': 3,
+            'Minute': 0
+        }],
+        'KeepAlive': {
+            'SuccessfulExit': False
+        },
+        'Nice': 5,
+        'Custom': {
+            'a': [1, 2.5, b'\0']
+        },
+    }
+    job = Job.fromDict('/tmp/com.test.plist', mapping)
+    assert job.toDict() == mapping
+    for config, (key, value) in zip(job.value, mapping.items()):
+        assert config == configFromValue(key, value)
+    assert isinstance(job.value[0], Label)
+    assert isinstance(job.value[1], ProgramArguments)
+    assert isinstance(job.value[2], StartCalendarInterval)
+    assert isinstance(job.value[3], KeepAliveDepends)
+    assert job.value[5].__class__ is Pair
+    job = Job.fromDict('/tmp/com.test.plist', {'KeepAlive': True})
+    assert isinstance(job.value[0], KeepAliveAlways)
+
+
+def test_values_that_dont_fit():
+    job = Job.fromDict('/tmp/com.test.plist', {
+        'Label': 1,
+        'ProgramArguments': 'not a list'
+    })
+    assert [c.__class__ for c in job.value] == [Pair, Pair]
+    assert job.toDict() == {'Label': 1, 'ProgramArguments': 'not a list'}
+    with pytest.raises(ValueError):
+        Job.fromDict('/tmp/com.test.plist', ['Label'])
+
+
+def test_read(tmp_path):
+    job = classicJobs()['full']
+    path = tmp_path / 'com.test.full.plist'
+    path.write_text(job.parse())
+    assert Job.read(str(path)).toDict() == job.toDict()
@@ -0,0 +1,84 @@
+import plistlib
+
+from classic import everyConfig
+from launchdman import configBuilders, Job
+
+
+def makeJob(**changes):
+    mapping = {
+        'Label': 'com.test',
+        'Program': '/bin/sh',
+        'RunAtLoad': True,
+        'StartCalendarInterval': [{
+            'Hour': h,
+            'Minute': 0
+        } for h in range(6)],
+        'WatchPaths': ['/etc/a', '/etc/b'],
+    }
+    mapping.update(changes)
+    return Job.fromValue('/tmp/com.test.plist', {
+        key: value
+        for key, value in mapping.items() if value is not None
+    })
+
+
+def test_same_jobs():
+    patch = makeJob().diff(makeJob())
+    assert not patch
+    assert patch.keys() == set()
+
+
+def test_reordered_entries_are_not_a_change():
+    old = makeJob()
+    new = makeJob(
+        StartCalendarInterval=[{
+            'Minute': 0,
+            'Hour': h
+        } for h in reversed(range(6))],
+        WatchPaths=['/etc/b', '/etc/a'])
+    assert not old.diff(new)
+
+
+def test_diff_and_apply():
+    old = makeJob()
+    new = makeJob(Program='/bin/bash',
+                  RunAtLoad=None,
+                  StartCalendarInterval=[{
+                      'Hour': h,
+                      'Minute': 0
+                  } for h in range(1, 7)],
+                  Nice=5)
+    patch = old.diff(new)
+    assert patch.keys() == {
+        'Program', 'RunAtLoad', 'StartCalendarInterval', 'Nice'
+    }
+    assert sorted(patch.added) == ['Nice']
+    assert sorted(patch.removed) == ['RunAtLoad']
+    added, removed = patch.entries['StartCalendarInterval']
+    schedule = new.value[2]
+    assert added == [schedule.l[-1]]
+    assert removed == [old.value[3].l[0]]
+
+    text = old.parse()
+    old.apply(patch)
+    assert old.parse() != text
+    assert plistlib.loads(old.parse().encode()) == plistlib.loads(
+        new.parse().encode())
+    assert not old.diff(new)
+    assert old == new
+
+
+def test_every_config_reads_back_the_same(tmp_path):
+    configs = everyConfig()
+    assert configs.keys() == configBuilders.keys()
+    for key, built in configs.items():
+        for config in built:
+            job = Job(str(tmp_path / 'com.test.plist'))
+            job.add(config)
+            job.write()
+            # written under the key launchd reads
+            with open(job.me, 'rb') as f:
+                assert list(plistlib.load(f)) == [key]
+            again = Job.read(job.me)
+            assert not job.diff(again), key
+            assert again == job, key
@@ -0,0 +1,64 @@
+import pytest
+
+from launchdman import (BoolSingle, core, dispatch, emitBoolSingle, emitPair,
+                        emitPrintMe, emitSingle, indentLines, Job, Pair,
+                        registerEmitter, Single, singleOrPair, StringSingle)
+
+
+class Shouting(StringSingle):
+    '''prints its value upper case with printMe(), without an emitter'''
+
+    def printMe(self, selfTag, selfValue):
+        return '<{tag}>{value}</{tag}>\n'.format(tag=selfTag,
+                                                 value=selfValue[0].upper())
+
+
+class Whispering(Shouting):
+    pass
+
+
+class Comment(StringSingle):
+    pass
+
+
+@pytest.fixture
+def commentEmitter():
+
+    @registerEmitter(Comment)
+    def emitComment(node, selfTag, selfValue, write, pad):
+        write(indentLines('<!-- {} -->\n'.format(selfValue[0]), pad))
+
+    yield emitComment
+    del core._emitters[Comment]
+    core._dispatch.clear()
+
+
+def test_kinds():
+    assert singleOrPair(StringSingle('a')) == 'Single'
+    assert singleOrPair(Pair('Label', StringSingle('a'))) == 'Pair'
+    assert singleOrPair('a') == 'Neither'
+    assert singleOrPair(1) == 'Neither'
+    assert dispatch(StringSingle) == ('Single', emitSingle)
+    assert dispatch(BoolSingle) == ('Single', emitBoolSingle)
+    assert dispatch(Pair) == ('Pair', emitPair)
+    assert dispatch(int) == ('Neither', None)
+    assert dispatch(Job)[0] == 'Single'
+
+
+def test_print_me_overrides_are_kept():
+    assert dispatch(Shouting)[1] is emitPrintMe
+    assert dispatch(Whispering)[1] is emitPrintMe
+    node = Single('dict', Shouting('abc'))
+    assert node.parse() == '<dict>\n    <shouting>ABC</shouting>\n</dict>\n'
+    chunks = []
+    node.streamMe(node.tag, node.value, chunks.append)
+    assert ''.join(chunks) == node.parse()
+
+
+def test_register_emitter(commentEmitter):
+    assert dispatch(Comment) == ('Single', commentEmitter)
+    node = Single('array', Comment('hi'), StringSingle('there'))
+    assert node.parse() == ('<array>\n    <!-- hi -->\n'
+                            '    <string>there</string>\n</array>\n')
+    # a closer printMe() still wins over an emitter of a base class
+    assert dispatch(Shouting)[1] is emitPrintMe
@@ -0,0 +1,59 @@
+import os
+import stat
+
+from launchdman import Job, Label, Program, writeAll, writeAtomic
+
+
+def makeJobs(directory, count):
+    jobs = []
+    for i in range(count):
+        job = Job(str(directory / 'com.test.{}.plist'.format(i)))
+        job.add(Label('com.test.{}'.format(i)), Program('/usr/bin/true'))
+        jobs.append(job)
+    return jobs
+
+
+def test_write_atomic(tmp_path):
+    path = tmp_path / 'a.plist'
+    writeAtomic(path, b'one')
+    assert path.read_bytes() == b'one'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    os.chmod(path, 0o600)
+    writeAtomic(path, b'two', sync=False)
+    assert path.read_bytes() == b'two'
+    # the mode of the old file is kept
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(tmp_path) == ['a.plist']
+
+
+def test_write_all(tmp_path):
+    jobs = makeJobs(tmp_path, 20)
+    report = writeAll(jobs, workers=4)
+    assert report.counts() == {'written': 20, 'skipped': 0, 'failed': 0}
+    for job in jobs:
+        assert open(job.me).read() == job.parse()
+
+    jobs[3].value[1].changeTo('/usr/bin/false')
+    report = writeAll(jobs, workers=4, sync=False)
+    assert report.written == [jobs[3].me]
+    assert len(report.skipped) == 19
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        os.path.basename(job.me) for job in jobs)
+
+
+def test_write_all_reports_failures(tmp_path):
+    jobs = makeJobs(tmp_path, 3)
+    jobs[1].me = tmp_path / 'missing' / 'com.test.1.plist'
+    report = writeAll(jobs, sync=False)
+    assert report.counts() == {'written': 2, 'skipped': 0, 'failed': 1}
+    path, error = report.failed[0]
+    assert path == jobs[1].me
+    assert isinstance(error, OSError)
+
+
+def test_write_all_processes(tmp_path):
+    jobs = makeJobs(tmp_path, 4)
+    report = writeAll(jobs, workers=2, processes=True, sync=False)
+    assert report.counts()['written'] == 4
+    for job in jobs:
+        assert open(job.me).read() == job.parse()
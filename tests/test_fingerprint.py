@@ -0,0 +1,58 @@
+from launchdman import (DictSingle, IntegerSingle, Job, Label, Nice, Pair,
+                        Program, StringSingle)
+
+
+def makeJob(label='com.test'):
+    job = Job('/tmp/com.test.plist')
+    environment = DictSingle(Pair('A', StringSingle('1')),
+                             Pair('B', StringSingle('2')))
+    job.add(Label(label), Program('/bin/sh'),
+            Pair('Custom', environment))
+    return job
+
+
+def test_equal_jobs():
+    a = makeJob()
+    b = makeJob()
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a.fingerprint() == b.fingerprint()
+    assert len(a.fingerprint()) == 16
+    assert a != makeJob('com.other')
+    assert len({a, b, makeJob('com.other')}) == 2
+
+
+def test_fingerprint_follows_changes():
+    a = makeJob()
+    b = makeJob()
+    before = a.fingerprint()
+    a.value[0].changeTo('com.other')
+    assert a.fingerprint() != before
+    assert a != b
+    assert a == makeJob('com.other')
+    a.value[0].changeTo('com.test')
+    assert a.fingerprint() == before
+
+
+def test_structure_counts():
+    # same leaf values, different keys
+    assert Label('/bin/sh') != Program('/bin/sh')
+    assert Nice(1) != Nice(2)
+    # 1 and '1' print the same, so they are the same value
+    assert Pair('A', StringSingle('1')) == Pair('A', StringSingle(1))
+    assert StringSingle(2).fingerprint() == StringSingle('2').fingerprint()
+    assert StringSingle('2') != IntegerSingle(2)
+
+
+def test_dict_key_order_does_not_matter():
+    a = DictSingle(Pair('A', StringSingle('1')), Pair('B', StringSingle('2')))
+    b = DictSingle(Pair('B', StringSingle('2')), Pair('A', StringSingle('1')))
+    assert a == b
+    assert a.parse() != b.parse()
+
+
+def test_read_back_is_equal():
+    job = makeJob()
+    again = Job.fromBytes(job.parse().encode())
+    assert again == job
+    assert hash(again) == hash(job)
@@ -0,0 +1,110 @@
+import datetime
+
+import pytest
+
+from launchdman import (analyzeFleet, Job, Label, StartCalendarInterval,
+                        StartInterval, staggerFleet)
+
+
+def makeJob(path, label, *configs):
+    job = Job(path)
+    job.add(Label(label), *configs)
+    return job
+
+
+def calendar(*entries):
+    schedule = StartCalendarInterval()
+    schedule.add(*entries)
+    return schedule
+
+
+def minutes(jobs):
+    return [job.value[-1].entries()[0]['Minute'] for job in jobs]
+
+
+def test_stagger_spreads_jobs():
+    jobs = [
+        makeJob('/tmp/com.test.{}.plist'.format(i), 'com.test.{}'.format(i),
+                calendar({'Minute': 0})) for i in range(30)
+    ]
+    report = staggerFleet(jobs)
+    assert report['peak'] == (30, 1)
+    assert len(set(minutes(jobs))) == 30
+    # running it again keeps every job where it is
+    assert staggerFleet(jobs)['moved'] == []
+
+
+def test_stagger_duplicate_and_missing_labels():
+    jobs = [
+        makeJob('/tmp/com.test.same.{}.plist'.format(i), 'com.test.same',
+                calendar({'Minute': 0})) for i in range(10)
+    ]
+    for i in range(10):
+        job = Job('/tmp/com.test.none.{}.plist'.format(i))
+        job.add(calendar({'Minute': 0}))
+        jobs.append(job)
+    report = staggerFleet(jobs)
+    assert report['peak'] == (20, 1)
+    assert len(set(minutes(jobs))) == 20
+    assert analyzeFleet(jobs).peak() == 1
+    assert staggerFleet(jobs)['moved'] == []
+
+
+def test_stagger_keeps_one_of_two_jobs_with_the_same_label():
+    jobs = [
+        makeJob('/tmp/com.test.a.plist', 'com.test', calendar({'Minute': 10})),
+        makeJob('/tmp/com.test.b.plist', 'com.test', calendar({'Minute': 10})),
+    ]
+    report = staggerFleet(jobs)
+    assert report['peak'] == (2, 1)
+    assert len(report['moved']) == 1
+    assert 10 in minutes(jobs)
+    assert len(set(minutes(jobs))) == 2
+
+
+def test_analyze_counts_every_start():
+    jobs = [
+        makeJob('/tmp/com.test.hourly.plist', 'com.test.hourly',
+                calendar({'Minute': 0})),
+        makeJob('/tmp/com.test.monday.plist', 'com.test.monday',
+                calendar({
+                    'Weekday': 1,
+                    'Hour': 3,
+                    'Minute': 30
+                })),
+        makeJob('/tmp/com.test.interval.plist', 'com.test.interval',
+                StartInterval().every(10).minute),
+        makeJob('/tmp/com.test.none.plist', 'com.test.none'),
+    ]
+    # 2024-01-01 is a Monday
+    load = analyzeFleet(jobs, start=datetime.date(2024, 1, 1), horizon='week')
+    assert load.jobs == 3
+    assert len(load.counts) == 7 * 24 * 60
+    for slot, count in enumerate(load.counts):
+        when = load.timeOf(slot)
+        expected = (when.minute == 0) + (slot > 0 and slot % 10 == 0) + (
+            when.weekday() == 0 and (when.hour, when.minute) == (3, 30))
+        assert count == expected, when
+    assert load.peak() == 2
+    monday = datetime.datetime(2024, 1, 1, 3, 30)
+    assert load.labelsAt(monday) == ['com.test.monday', 'com.test.interval']
+    assert load.labelsAt(datetime.datetime(2024, 1, 2, 5, 0)) == [
+        'com.test.hourly', 'com.test.interval'
+    ]
+    assert load.labelsAt(0) == ['com.test.hourly']
+    worst = load.worst(3)
+    assert [starts for _, starts in worst] == [2, 2, 2]
+    assert all(when.minute == 0 and when.hour for when, _ in worst)
+
+
+def test_analyze_by_second():
+    jobs = [
+        makeJob('/tmp/com.test.plist', 'com.test',
+                StartInterval().every(45).second)
+    ]
+    load = analyzeFleet(jobs, start=datetime.date(2024, 1, 1), step=15)
+    assert len(load.counts) == 86400 // 15
+    starts = [i for i, count in enumerate(load.counts[:20]) if count]
+    assert starts == [3, 6, 9, 12, 15, 18]
+    with pytest.raises(ValueError):
+        analyzeFleet(jobs, step=7)
@@ -0,0 +1,129 @@
+import json
+import os
+
+import pytest
+
+from launchdman import Job, LaunchctlRunner, RecordingBackend, SubprocessBackend
+
+fake = os.path.join(os.path.dirname(__file__), os.pardir, 'benchmarks',
+                    'fake-launchctl')
+
+
+def makeJobs(directory, count):
+    jobs = [
+        Job.fromDict(
+            str(directory / 'com.test.{}.plist'.format(i)), {
+                'Label': 'com.test.{}'.format(i),
+                'Program': '/usr/bin/true'
+            }) for i in range(count)
+    ]
+    for job in jobs:
+        job.write()
+    return jobs
+
+
+@pytest.fixture
+def launchd(tmp_path, monkeypatch):
+    '''the fake launchctl with a state file, returns a function that gives the loaded services'''
+    state = tmp_path / 'loaded.json'
+    monkeypatch.setenv('FAKE_LAUNCHCTL_STATE', str(state))
+    monkeypatch.delenv('FAKE_LAUNCHCTL_FAIL', raising=False)
+
+    def loaded(services=None):
+        if services is not None:
+            state.write_text(json.dumps(services))
+        return set(json.loads(state.read_text())) if state.exists() else set()
+
+    return loaded
+
+
+def test_batches():
+    backend = RecordingBackend()
+    jobs = [
+        Job.fromDict('/tmp/com.test.{}.plist'.format(i), {
+            'Label': 'com.test.{}'.format(i)
+        }) for i in range(5)
+    ]
+    runner = LaunchctlRunner(backend, domain='gui/501', batchSize=3)
+    runner.bootout(jobs).bootstrap(jobs).kickstart(jobs[0], kill=True)
+    report = runner.run()
+    assert backend.calls == [
+        ['bootout', 'gui/501'] + [str(job.me) for job in jobs[:3]],
+        ['bootout', 'gui/501'] + [str(job.me) for job in jobs[3:]],
+        ['bootstrap', 'gui/501'] + [str(job.me) for job in jobs[:3]],
+        ['bootstrap', 'gui/501'] + [str(job.me) for job in jobs[3:]],
+        ['kickstart', '-k', 'gui/501/com.test.0'],
+    ]
+    assert report.counts() == {
+        'succeeded': 11,
+        'failed': 0,
+        'invocations': 5
+    }
+    assert runner.pending() == []
+
+
+def test_deploy_with_some_jobs_not_loaded(tmp_path, launchd):
+    jobs = makeJobs(tmp_path, 6)
+    launchd(['gui/501/com.test.0', 'gui/501/com.test.3'])
+    runner = LaunchctlRunner(SubprocessBackend(fake), domain='gui/501',
+                             backoff=0)
+    runner.bootout(jobs).bootstrap(jobs).kickstart(jobs)
+    report = runner.run()
+    assert report.failed == []
+    assert report.counts()['succeeded'] == 18
+    # the bootout batch fails for the jobs that were not loaded, nothing is run again
+    assert report.invocations == 8
+    assert launchd() == {'gui/501/com.test.{}'.format(i) for i in range(6)}
+
+
+def test_bootstrap_with_some_jobs_loaded(tmp_path, launchd):
+    jobs = makeJobs(tmp_path, 4)
+    launchd(['gui/501/com.test.1'])
+    runner = LaunchctlRunner(SubprocessBackend(fake), domain='gui/501',
+                             backoff=0)
+    report = runner.bootstrap(jobs).run()
+    assert report.failed == []
+    assert report.counts()['succeeded'] == 4
+
+
+def test_only_real_failures_are_reported(tmp_path, launchd, monkeypatch):
+    jobs = makeJobs(tmp_path, 4)
+    monkeypatch.setenv('FAKE_LAUNCHCTL_FAIL', 'com.test.2.')
+    runner = LaunchctlRunner(SubprocessBackend(fake), domain='gui/501',
+                             retries=1, backoff=0)
+    report = runner.bootstrap(jobs).run()
+    assert [failure[:3] for failure in report.failed] == [
+        ('bootstrap', 'gui/501', 'com.test.2')
+    ]
+    assert report.counts()['succeeded'] == 3
+    # the batch, then the failed plist on its own twice
+    assert report.invocations == 3
+    assert launchd() == {
+        'gui/501/com.test.{}'.format(i)
+        for i in (0, 1, 3)
+    }
+
+
+def test_batch_that_names_nothing_is_run_again_one_by_one():
+    def backend(args):
+        # a launchctl that only says the batch failed, after loading everything
+        if len(args) > 3:
+            return 5, '', 'Bootstrap failed: 5: Input/output error'
+        return 37, '', 'Bootstrap failed: 37: Operation already in progress'
+
+    jobs = [
+        Job.fromDict('/tmp/com.test.{}.plist'.format(i), {
+            'Label': 'com.test.{}'.format(i)
+        }) for i in range(3)
+    ]
+    report = LaunchctlRunner(backend, domain='gui/501').bootstrap(jobs).run()
+    assert report.failed == []
+    assert report.invocations == 4
+
+
+def test_missing_launchctl(tmp_path):
+    jobs = makeJobs(tmp_path, 1)
+    runner = LaunchctlRunner(SubprocessBackend(str(tmp_path / 'nothing')),
+                             domain='gui/501', retries=0)
+    report = runner.bootstrap(jobs).run()
+    assert report.failed[0][:4] == ('bootstrap', 'gui/501', 'com.test.0', -1)
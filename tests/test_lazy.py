@@ -0,0 +1,43 @@
+import importlib
+import os
+import subprocess
+import sys
+
+import pytest
+
+import launchdman
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loadedAfter(code):
+    '''the launchdman submodules imported by a fresh python after running code'''
+    code += ('\nimport sys\n'
+             'print(*sorted(m for m in sys.modules if m.startswith("launchdman.")))')
+    return subprocess.run([sys.executable, '-c', code],
+                          cwd=root,
+                          check=True,
+                          capture_output=True,
+                          text=True).stdout.split()
+
+
+def test_import_loads_no_submodule():
+    assert loadedAfter('import launchdman') == []
+    # a name only loads what it needs
+    assert loadedAfter('from launchdman import Single') == ['launchdman.core']
+
+
+def test_every_name_resolves():
+    for name in launchdman.__all__:
+        module = importlib.import_module('launchdman.' + launchdman._names[name])
+        assert getattr(launchdman, name) is getattr(module, name), name
+    assert sorted(launchdman._names) == launchdman.__all__
+    assert set(launchdman.__all__) <= set(dir(launchdman))
+
+
+def test_submodules_and_missing_names():
+    assert launchdman.fleet is importlib.import_module('launchdman.fleet')
+    with pytest.raises(AttributeError):
+        launchdman.NoSuchThing
+    with pytest.raises(ImportError):
+        from launchdman import NoSuchThing  # noqa: F401
@@ -0,0 +1,99 @@
+import os
+import pickle
+import sqlite3
+
+import pytest
+
+from launchdman import digestOf, Job, RenderManifest, writeAll
+
+
+def makeJobs(directory, count):
+    return [
+        Job.fromDict(
+            str(directory / 'com.test.{}.plist'.format(i)), {
+                'Label': 'com.test.{}'.format(i),
+                'Program': '/usr/bin/true'
+            }) for i in range(count)
+    ]
+
+
+def test_hits_and_misses(tmp_path):
+    jobs = makeJobs(tmp_path, 4)
+    with RenderManifest(str(tmp_path / 'manifest.sqlite')) as manifest:
+        writeAll(jobs, manifest=manifest, sync=False)
+        assert (manifest.hits, manifest.misses) == (0, 4)
+        report = writeAll(jobs, manifest=manifest, sync=False)
+        assert report.counts()['written'] == 0
+        assert (manifest.hits, manifest.misses) == (4, 4)
+        stats = manifest.stats()
+        assert stats['records'] == 4
+        assert stats['hitRate'] == 0.5
+
+    # a new manifest on the same file knows the jobs
+    manifest = RenderManifest(str(tmp_path / 'manifest.sqlite'))
+    jobs[0].value[1].changeTo('/usr/bin/false')
+    same, other = manifest.unchanged(jobs)
+    assert other == [jobs[0]]
+    assert (manifest.hits, manifest.misses) == (3, 1)
+    manifest.close()
+
+
+def test_changed_and_touched_files(tmp_path):
+    jobs = makeJobs(tmp_path, 3)
+    manifest = RenderManifest(':memory:')
+    writeAll(jobs, manifest=manifest, sync=False)
+    # same content, other mtime: read and compared, still a hit
+    info = os.stat(jobs[0].me)
+    os.utime(jobs[0].me, ns=(info.st_atime_ns, info.st_mtime_ns + 10**9))
+    # other content: a miss
+    with open(jobs[1].me, 'w') as f:
+        f.write('changed')
+    os.remove(jobs[2].me)
+    same, other = manifest.unchanged(jobs)
+    assert same == [jobs[0]]
+    assert other == [jobs[1], jobs[2]]
+    writeAll(jobs, manifest=manifest, sync=False)
+    for job in jobs:
+        assert open(job.me, 'rb').read() == job.parse().encode()
+    record = manifest.lookup([jobs[1].me])[str(jobs[1].me)]
+    assert record[0] == jobs[1].fingerprint()
+    assert record[1] == digestOf(jobs[1].parse().encode())
+
+
+def test_forget_and_compact(tmp_path):
+    jobs = makeJobs(tmp_path, 3)
+    manifest = RenderManifest(str(tmp_path / 'manifest.sqlite'))
+    writeAll(jobs, manifest=manifest, sync=False)
+    manifest.forget([jobs[0].me])
+    assert manifest.unchanged(jobs)[1] == [jobs[0]]
+    os.remove(jobs[1].me)
+    assert manifest.compact() == 1
+    assert manifest.stats()['records'] == 1
+    manifest.close()
+
+
+def test_failed_forget_leaves_no_transaction(tmp_path):
+    jobs = makeJobs(tmp_path, 2)
+    manifest = RenderManifest(str(tmp_path / 'manifest.sqlite'))
+    writeAll(jobs, manifest=manifest, sync=False)
+    db = manifest._connect()
+    db.execute('CREATE TRIGGER noDelete BEFORE DELETE ON manifest '
+               "BEGIN SELECT RAISE(ABORT, 'no'); END")
+    with pytest.raises(sqlite3.IntegrityError):
+        manifest.forget([jobs[0].me])
+    assert not db.in_transaction
+    db.execute('DROP TRIGGER noDelete')
+    manifest.forget([jobs[0].me])
+    manifest.record([(jobs[0].me, jobs[0].fingerprint(), b'')])
+    assert manifest.stats()['records'] == 2
+    manifest.close()
+
+
+def test_pickle(tmp_path):
+    manifest = RenderManifest(str(tmp_path / 'manifest.sqlite'))
+    manifest.stats()
+    copy = pickle.loads(pickle.dumps(manifest))
+    assert copy.path == manifest.path
+    assert copy.stats()['records'] == 0
+    manifest.close()
+    copy.close()
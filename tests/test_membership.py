@@ -0,0 +1,61 @@
+from launchdman import (Job, Label, Program, ProgramArguments, RunAtLoad,
+                        WatchPaths)
+
+
+def makeJob():
+    job = Job('/tmp/com.test.plist')
+    job.add(Label('com.test'), Program('/bin/sh'))
+    return job
+
+
+def test_contains_and_remove():
+    job = makeJob()
+    job.add(RunAtLoad())
+    assert RunAtLoad() in job
+    assert Label('com.test') in job
+    assert Label('other') not in job
+    assert job.remove(RunAtLoad()) == 1
+    assert RunAtLoad() not in job
+    assert job.remove(RunAtLoad()) == 0
+
+
+def test_remove_every_match():
+    arguments = ProgramArguments('-a', '-b', '-a')
+    assert arguments.contains('-a')
+    assert arguments.remove('-a') == 2
+    assert not arguments.contains('-a')
+    assert arguments.contains('-b')
+
+
+def test_child_changed_after_index_is_built():
+    job = makeJob()
+    # builds the index of job
+    assert RunAtLoad() not in job
+    paths = WatchPaths('/a')
+    job.add(paths)
+    paths.add('/b')
+    assert paths in job
+    assert WatchPaths('/a') not in job
+    assert WatchPaths('/a', '/b') in job
+    assert job.remove(paths) == 1
+    assert paths not in job
+
+
+def test_child_changed_before_index_is_built():
+    job = makeJob()
+    paths = WatchPaths('/a')
+    job.add(paths)
+    assert paths in job
+    paths.remove('/a')
+    paths.add('/c')
+    assert WatchPaths('/c') in job
+    assert job.remove(WatchPaths('/c')) == 1
+
+
+def test_value_replaced_directly():
+    job = makeJob()
+    assert Label('com.test') in job
+    job.value = [RunAtLoad()]
+    job.invalidate()
+    assert RunAtLoad() in job
+    assert Label('com.test') not in job
@@ -0,0 +1,136 @@
+import datetime
+import plistlib
+
+from classic import classicJobs
+from launchdman import (Job, Label, loadPlist, Pair, ProgramArguments,
+                        StartCalendarInterval)
+
+special = {
+    'Label': 'com.test.a&b',
+    'ProgramArguments': ['/bin/sh', '-c', 'a && b < c > d'],
+    'EnvironmentVariables': {
+        'A<B': '&amp; stays as text'
+    }
+}
+
+
+def test_xml_escapes_text():
+    job = Job('/tmp/com.test.plist')
+    job.add(Label('a&b'), ProgramArguments('echo', '<a> & <b>'))
+    data = job.parse().encode()
+    assert plistlib.loads(data) == {
+        'Label': 'a&b',
+        'ProgramArguments': ['echo', '<a> & <b>']
+    }
+
+
+def test_xml_round_trip_with_special_characters(tmp_path):
+    path = tmp_path / 'com.test.plist'
+    with open(path, 'wb') as f:
+        plistlib.dump(special, f)
+    job = Job.read(path)
+    assert job.toDict() == special
+    job.write()
+    assert plistlib.loads(path.read_bytes()) == special
+    assert Job.read(path).toDict() == special
+    assert loadPlist(path.read_bytes()) == special
+
+
+values = {
+    'Label': 'com.test.binary',
+    'ProgramArguments': ['/bin/echo', 'héllo', '日本語', ''],
+    'RunAtLoad': True,
+    'Disabled': False,
+    'Nice': -5,
+    'ThrottleInterval': 2**40,
+    'StartCalendarInterval': [{
+        'Hour': h,
+        'Minute': 30
+    } for h in range(20)],
+    'EnvironmentVariables': {
+        'PATH': '/bin:/usr/bin',
+        'LANG': 'C'
+    },
+    'Custom': {
+        'nested': [{
+            'deep': [1, 2, 3]
+        }, 'x' * 100],
+        'real': 1.5,
+        'data': b'\x00\x01binary',
+        'date': datetime.datetime(2024, 3, 10, 2, 30)
+    }
+}
+
+
+def test_xml_from_plistlib_reads_back():
+    data = plistlib.dumps(values)
+    assert loadPlist(data) == values
+    job = Job.fromBytes(data)
+    assert plistlib.loads(job.parse().encode()) == values
+
+
+def test_binary_output_reads_with_plistlib():
+    job = Job.fromBytes(plistlib.dumps(values))
+    data = job.toBinary()
+    assert data.startswith(b'bplist00')
+    assert plistlib.loads(data) == values
+
+
+def test_binary_write(tmp_path):
+    path = tmp_path / 'com.test.plist'
+    job = Job.fromBytes(plistlib.dumps(values), str(path))
+    job.write(format='binary')
+    assert plistlib.loads(path.read_bytes()) == values
+    for job in classicJobs().values():
+        assert plistlib.loads(job.toBinary()) == plistlib.loads(
+            job.parse().encode())
+
+
+def test_binary_from_plistlib_reads_back():
+    data = plistlib.dumps(values, fmt=plistlib.FMT_BINARY)
+    assert loadPlist(data) == values
+    job = Job.fromBytes(data)
+    assert plistlib.loads(job.toBinary()) == values
+    assert plistlib.loads(job.parse().encode()) == values
+
+
+def test_binary_write_and_read(tmp_path):
+    path = tmp_path / 'com.test.plist'
+    job = Job.fromBytes(plistlib.dumps(values), str(path))
+    job.write(format='binary')
+    again = Job.read(str(path))
+    assert again == job
+    assert again.parse() == job.parse()
+
+
+def test_known_keys_become_config_classes():
+    job = Job.fromBytes(plistlib.dumps(values))
+    classes = {config.key: config.__class__ for config in job.value}
+    assert classes['Label'] is Label
+    assert classes['ProgramArguments'] is ProgramArguments
+    assert classes['StartCalendarInterval'] is StartCalendarInterval
+    assert classes['Custom'] is Pair
+    assert classes['Disabled'] is Pair
+
+
+def test_read_classic_jobs(tmp_path):
+    for name, job in classicJobs().items():
+        path = tmp_path / (name + '.plist')
+        path.write_text(job.parse())
+        again = Job.read(str(path))
+        assert again.parse() == job.parse()
+        assert loadPlist(path.read_bytes()) == plistlib.loads(path.read_bytes())
+
+
+def test_xml_comments_and_cdata():
+    data = b'''<?xml version="1.0" encoding="UTF-8"?>
+<plist version="1.0">
+<!-- a comment -->
+<dict>
+    <key>Label</key>
+    <string><![CDATA[a < b]]></string>
+    <key>Program</key>
+    <string>/bin/sh &amp; more</string>
+</dict>
+</plist>'''
+    assert loadPlist(data) == {'Label': 'a < b', 'Program': '/bin/sh & more'}
@@ -0,0 +1,102 @@
+import os
+import plistlib
+
+from launchdman import Job, ReconcileState, reconcile
+
+
+def makeJobs(directory, count):
+    return [
+        Job.fromDict(
+            str(directory / 'com.test.{}.plist'.format(i)), {
+                'Label': 'com.test.{}'.format(i),
+                'Program': '/usr/bin/true'
+            }) for i in range(count)
+    ]
+
+
+def names(paths):
+    return sorted(os.path.basename(path) for path in paths)
+
+
+def test_plan_and_apply(tmp_path):
+    jobs = makeJobs(tmp_path, 3)
+    state = ReconcileState()
+    plan = reconcile(tmp_path, jobs, state=state, sync=False)
+    assert plan.counts() == {
+        'added': 3,
+        'updated': 0,
+        'deleted': 0,
+        'unchanged': 0
+    }
+    assert not os.listdir(tmp_path)
+    plan.apply()
+    for job in jobs:
+        assert open(job.me, 'rb').read() == job.parse().encode()
+
+    plan = reconcile(tmp_path, jobs, state=state, sync=False)
+    assert not plan
+    assert plan.unchanged == 3
+
+    jobs[0].value[1].changeTo('/usr/bin/false')
+    plan = reconcile(tmp_path, jobs, state=state, sync=False)
+    assert names(plan.updated) == ['com.test.0.plist']
+    plan.apply()
+    assert plistlib.loads(open(jobs[0].me, 'rb').read())['Program'] == '/usr/bin/false'
+
+
+def test_file_changed_behind_our_back(tmp_path):
+    jobs = makeJobs(tmp_path, 2)
+    state = ReconcileState()
+    reconcile(tmp_path, jobs, state=state, sync=False).apply()
+    with open(jobs[1].me, 'w') as f:
+        f.write('changed')
+    plan = reconcile(tmp_path, jobs, state=state, sync=False)
+    assert names(plan.updated) == ['com.test.1.plist']
+    # a new state reads the files instead of trusting their stat
+    plan = reconcile(tmp_path, jobs, state=ReconcileState(), sync=False)
+    assert names(plan.updated) == ['com.test.1.plist']
+    assert plan.unchanged == 1
+
+
+def test_other_plists_are_left_alone(tmp_path):
+    other = tmp_path / 'com.other.app.plist'
+    other.write_bytes(plistlib.dumps({'Label': 'com.other.app'}))
+    jobs = makeJobs(tmp_path, 3)
+    state = ReconcileState()
+    reconcile(tmp_path, jobs, state=state, sync=False).apply()
+
+    plan = reconcile(tmp_path, jobs[:2], state=state, sync=False)
+    assert plan.deleted == []
+    plan = reconcile(tmp_path, jobs[:2], state=state, prune=True, sync=False)
+    assert names(plan.deleted) == ['com.test.2.plist']
+    plan.apply()
+    assert sorted(os.listdir(tmp_path)) == [
+        'com.other.app.plist', 'com.test.0.plist', 'com.test.1.plist'
+    ]
+    # a state that never saw the jobs doesn't delete anything
+    plan = reconcile(tmp_path, [], state=ReconcileState(), prune=True,
+                     sync=False)
+    assert plan.deleted == []
+
+
+def test_state_save_and_load(tmp_path):
+    directory = tmp_path / 'agents'
+    directory.mkdir()
+    jobs = makeJobs(directory, 2)
+    state = ReconcileState()
+    reconcile(directory, jobs, state=state, sync=False).apply()
+    state.save(str(tmp_path / 'state.json'))
+    loaded = ReconcileState.load(str(tmp_path / 'state.json'))
+    assert loaded.records == state.records
+    assert not reconcile(directory, jobs, state=loaded, sync=False)
+    plan = reconcile(directory, [], state=loaded, prune=True, sync=False)
+    assert len(plan.deleted) == 2
+
+
+def test_binary(tmp_path):
+    jobs = makeJobs(tmp_path, 2)
+    reconcile(tmp_path, jobs, format='binary', sync=False).apply()
+    for job in jobs:
+        data = open(job.me, 'rb').read()
+        assert data.startswith(b'bplist00')
+        assert plistlib.loads(data) == job.toDict()
@@ -0,0 +1,79 @@
+import io
+import os
+import pickle
+
+import pytest
+
+from classic import classicJobs
+from launchdman import (clearRenderCacheInfo, Job, Label, Program,
+                        ProgramArguments, renderCacheInfo, RunAtLoad,
+                        StringSingle)
+
+data = os.path.join(os.path.dirname(__file__), 'data')
+
+
+def expected(name):
+    with open(os.path.join(data, name + '.plist')) as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('name', ['simple', 'full', 'changed'])
+def test_same_bytes_as_before(name, tmp_path):
+    job = classicJobs()[name]
+    text = expected(name)
+    assert job.parse() == text
+    # again, from the cache
+    assert job.parse() == text
+    assert ''.join(job.iterChunks()) == text
+    stream = io.StringIO()
+    job.writeTo(stream)
+    assert stream.getvalue() == text
+    job.me = tmp_path / 'job.plist'
+    job.write()
+    assert job.me.read_text() == text
+
+
+def test_chunks_are_streamed():
+    job = classicJobs()['full']
+    chunks = job.iterChunks()
+    assert next(chunks).startswith('<?xml')
+    assert len(list(chunks)) > 10
+
+
+def test_cache_only_renders_what_changed():
+    job = Job('/tmp/com.test.plist')
+    arguments = ProgramArguments(*['-{}'.format(i) for i in range(50)])
+    job.add(Label('com.test'), Program('/bin/sh'), arguments)
+    first = job.parse()
+    clearRenderCacheInfo()
+    assert job.parse() == first
+    assert renderCacheInfo()['misses'] == 0
+
+    arguments.add('--last')
+    clearRenderCacheInfo()
+    text = job.parse()
+    assert '<string>--last</string>' in text
+    assert renderCacheInfo()['misses'] < 5
+
+    job.add(RunAtLoad())
+    assert job.parse().endswith(
+        '    <key>RunAtLoad</key>\n    <true/>\n</dict>\n</plist>')
+
+
+def test_invalidate_after_changing_value_directly():
+    job = Job('/tmp/com.test.plist')
+    label = Label('com.test')
+    job.add(label)
+    job.parse()
+    label.value = [StringSingle('com.other')]
+    label.invalidate()
+    assert '<string>com.other</string>' in job.parse()
+
+
+def test_pickles_leave_the_cache_out():
+    job = classicJobs()['full']
+    text = job.parse()
+    copy = pickle.loads(pickle.dumps(job))
+    assert copy.parse() == text
+    copy.value[0].changeTo('com.test.copy')
+    assert job.parse() == text
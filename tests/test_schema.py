@@ -0,0 +1,104 @@
+import pytest
+
+from classic import classicJobs
+from launchdman import (HardResourceLimit, IntegerSingle, Job, Label, Nice,
+                        Program, ruleOf, SoftResourceLimit, StringSingle,
+                        validate, validateMany)
+
+
+def test_classic_jobs_are_fine():
+    assert validateMany(classicJobs().values()) == []
+
+
+def test_messages():
+    job = Job.fromDict(
+        '/tmp/com.test.plist', {
+            'Label': '',
+            'Nice': 30,
+            'Umask': 0o1000,
+            'StartInterval': 0,
+            'RunAtLoad': True,
+            'SoftResourceLimit': {
+                'CPU': -1,
+                'Bogus': 1
+            },
+            'ExitTimeOut': 5,
+        })
+    job.add(Label('com.test'))
+    assert validate(job) == [
+        ('Label', "must be a non-empty string, not ''"),
+        ('Nice', '30 is out of range, it goes from -20 to 20'),
+        ('Umask', '512 is out of range, it goes from 0 to 511'),
+        ('StartInterval', '0 is out of range, it goes from 1 to any'),
+        ('SoftResourceLimit', 'CPU must be an integer >= 0, not -1'),
+        ('SoftResourceLimit', '"Bogus" is not a valid key'),
+        ('Label', 'is set more than once'),
+        ('Program or ProgramArguments', 'is required'),
+    ]
+
+
+@pytest.mark.parametrize('value', [[], {}])
+def test_empty_resource_limit(value):
+    job = Job.fromDict('/tmp/com.test.plist', {
+        'Label': 'com.test',
+        'Program': '/bin/sh',
+        'SoftResourceLimit': {
+            'CPU': value
+        }
+    })
+    assert validate(job) == [
+        ('SoftResourceLimit',
+         'CPU must be an integer >= 0, not {!r}'.format(value)),
+    ]
+
+
+def test_resource_limits_read_back(tmp_path):
+    job = Job(str(tmp_path / 'com.test.plist'))
+    job.add(Label('com.test'), Program('/bin/sh'),
+            SoftResourceLimit({'CPU': 2}), HardResourceLimit({'CPU': 4}))
+    assert '<integer>2</integer>' in job.parse()
+    assert validate(job) == []
+    job.write()
+    again = Job.read(job.me)
+    assert again == job
+    assert validate(again) == []
+    # a string is not a limit, whichever way it comes in
+    job.value[2].d[0].value = [StringSingle('2')]
+    assert validate(job) == [('SoftResourceLimit',
+                              "CPU must be an integer >= 0, not '2'")]
+
+
+def test_calendar_values_changed_by_hand():
+    job = Job.fromDict(
+        '/tmp/com.test.plist', {
+            'Label': 'com.test',
+            'Program': '/bin/sh',
+            'StartCalendarInterval': [{
+                'Hour': 3,
+                'Minute': 0
+            }]
+        })
+    assert validate(job) == []
+    hour, minute = job.value[2].l[0].value
+    hour.value = [IntegerSingle(25)]
+    minute.value = [StringSingle('0')]
+    assert validate(job) == [
+        ('StartCalendarInterval', 'Hour 25 is out of range'),
+        ('StartCalendarInterval', "Minute must be an integer, not '0'"),
+    ]
+
+
+def test_validate_many():
+    good = Job.fromDict('/tmp/com.test.good.plist', {
+        'Label': 'com.test.good',
+        'Program': '/bin/sh'
+    })
+    bad = Job.fromDict('/tmp/com.test.bad.plist', {'Label': 'com.test.bad'})
+    assert validateMany([good, bad, good]) == [
+        (bad.me, 'Program or ProgramArguments', 'is required')
+    ]
+
+
+def test_rules_are_compiled_once():
+    assert ruleOf(Nice) is ruleOf(Nice)
+    assert ruleOf(Job) is None
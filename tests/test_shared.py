@@ -0,0 +1,69 @@
+import pickle
+
+import pytest
+
+from launchdman import (BoolSingle, DictSingle, internLeaf, Job, Label,
+                        Program, RunAtLoad, Single, StringSingle, UserName)
+
+
+def makeJob(label):
+    job = Job('/tmp/{}.plist'.format(label))
+    job.add(Label(label), Program('/bin/sh'), UserName('nobody'), RunAtLoad())
+    return job
+
+
+def test_jobs_share_leaves():
+    a, b = makeJob('com.test.a'), makeJob('com.test.b')
+    for i in (1, 2, 3):
+        assert a.value[i].value[0] is b.value[i].value[0]
+    assert a.value[0].value[0] is not b.value[0].value[0]
+    assert internLeaf(StringSingle, '/bin/sh') is a.value[1].value[0]
+    assert internLeaf(BoolSingle, 'true') is a.value[3].value[0]
+    # 1 and '1' are different leaves
+    assert internLeaf(StringSingle, 1) is not internLeaf(StringSingle, '1')
+    # built by hand, private
+    assert StringSingle('/bin/sh') is not StringSingle('/bin/sh')
+
+
+def test_shared_leaves_can_not_be_changed():
+    leaf = makeJob('com.test').value[1].value[0]
+    with pytest.raises(TypeError):
+        leaf.add('more')
+    with pytest.raises(TypeError):
+        leaf.remove('/bin/sh')
+    with pytest.raises(TypeError):
+        leaf.clear()
+    assert leaf.value == ['/bin/sh']
+    private = StringSingle('x')
+    private.add('y')
+    assert private.value == ['x', 'y']
+
+
+def test_change_to_puts_in_another_leaf():
+    a, b = makeJob('com.test.a'), makeJob('com.test.b')
+    textB = b.parse()
+    a.value[1].changeTo('/bin/bash')
+    a.value[3].setToFalse()
+    assert '<string>/bin/bash</string>' in a.parse()
+    assert '<false/>' in a.parse()
+    assert b.parse() == textB
+    assert b.value[1].value[0].value == ['/bin/sh']
+
+
+def test_shared_leaves_at_other_indentation():
+    job = makeJob('com.test')
+    text = job.parse()
+    assert '\n    <string>/bin/sh</string>\n' in text
+    nested = Single('array', DictSingle(Program('/bin/sh')))
+    assert '\n        <string>/bin/sh</string>\n' in nested.parse()
+    assert job.parse() == text
+    other = makeJob('com.test.b').parse()
+    assert other == text.replace('com.test', 'com.test.b')
+
+
+def test_unpickled_leaves_are_private():
+    job = pickle.loads(pickle.dumps(makeJob('com.test')))
+    leaf = job.value[1].value[0]
+    assert leaf is not internLeaf(StringSingle, '/bin/sh')
+    leaf.add('x')
+    assert leaf.value == ['/bin/sh', 'x']
@@ -0,0 +1,67 @@
+import pytest
+
+from launchdman import (addSink, core, EventStats, Job, nullSink,
+                        ProgramArguments, removeSink, StartCalendarInterval,
+                        writeAll)
+
+
+@pytest.fixture
+def events():
+    seen = []
+
+    def sink(event, fields):
+        seen.append((event, fields))
+
+    addSink(sink)
+    yield seen
+    removeSink(sink)
+    assert core._sink is nullSink
+
+
+def test_events(events, tmp_path, capsys):
+    job = Job.fromDict(str(tmp_path / 'com.test.plist'), {
+        'Label': 'com.test',
+        'Program': '/bin/sh'
+    })
+    job.write()
+    arguments = ProgramArguments('-a', '-b', '-a')
+    arguments.remove('-a')
+    StartCalendarInterval().genMix(hour=(1, 2), minute=(0, 30))
+    names = [event for event, _ in events]
+    assert names == ['build', 'render', 'write', 'remove', 'generate']
+    build, render, write, remove, generate = [fields for _, fields in events]
+    assert build['job'] == job.me and build['keys'] == 2
+    assert render['chars'] == len(job.parse())
+    assert write['bytes'] == len(job.parse().encode())
+    assert (remove['compared'], remove['removed']) == (3, 2)
+    assert generate['entries'] == 4
+    assert all(fields['ns'] >= 0 for fields in (build, render, write))
+    # nothing is printed any more
+    assert capsys.readouterr() == ('', '')
+
+
+def test_event_stats_and_fan_out(events, tmp_path):
+    stats = addSink(EventStats())
+    try:
+        jobs = [
+            Job.fromDict(str(tmp_path / 'com.test.{}.plist'.format(i)),
+                         {'Label': 'com.test.{}'.format(i)}) for i in range(3)
+        ]
+        writeAll(jobs, sync=False)
+    finally:
+        removeSink(stats)
+    assert core._sink is not nullSink
+    assert stats.totals['build'] == {
+        'count': 3,
+        'ns': stats.totals['build']['ns'],
+        'keys': 3
+    }
+    assert stats.totals['write']['count'] == 3
+    assert stats.totals['write']['skipped'] == 0
+    assert sum(1 for event, _ in events if event == 'write') == 3
+
+
+def test_no_sink_no_events():
+    assert core._sink is nullSink
+    with pytest.raises(ValueError):
+        removeSink(nullSink)
@@ -0,0 +1,60 @@
+import copy
+import pickle
+
+from launchdman import (Job, Label, Pair, Program, ProgramArguments, Single,
+                        StartCalendarInterval, StartInterval, StringSingle)
+
+
+def makeJob():
+    job = Job('/tmp/com.test.plist')
+    schedule = StartCalendarInterval()
+    schedule.add(schedule.genInterval(hour=(0, 3), minute=(0, 60, 15)))
+    job.add(Label('com.test'), Program('/bin/sh'),
+            ProgramArguments('-c', 'true'), schedule)
+    return job
+
+
+def test_no_instance_dicts():
+    job = makeJob()
+    nodes = [job]
+    while nodes:
+        node = nodes.pop()
+        assert not hasattr(node, '__dict__'), node.__class__
+        nodes.extend(e for e in node.value if isinstance(e, Single))
+
+
+def test_nodes_have_their_own_value_lists():
+    a, b = Pair(), Pair()
+    a.value.append(StringSingle('a'))
+    assert b.value == []
+    assert StartInterval().value is not StartInterval().value
+
+
+def test_pickle_and_copy_leave_the_caches_out():
+    job = makeJob()
+    text = job.parse()
+    fingerprint = job.fingerprint()
+    for other in (pickle.loads(pickle.dumps(job)), copy.deepcopy(job)):
+        assert other._fragment is None
+        assert other._fingerprint is None
+        assert other.value[0]._parents is None
+        assert other.parse() == text
+        assert other.fingerprint() == fingerprint
+        # the copy is on its own
+        other.value[1].changeTo('/bin/bash')
+        assert job.parse() == text
+    shallow = copy.copy(job)
+    assert shallow._fragment is None
+
+
+def test_sizeof():
+    job = makeJob()
+    bare = job.sizeof(caches=False)
+    job.parse()
+    job.fingerprint()
+    assert job.sizeof() > bare
+    assert job.sizeof(caches=False) == bare
+    detail = job.sizeof(detail=True)
+    assert sum(size for _, size in detail.values()) == job.sizeof()
+    assert detail['Job'][0] == 1
+    assert detail['caches'][1] > 0